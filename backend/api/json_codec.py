@@ -0,0 +1,80 @@
+"""
+The JSON codecs to decode the imported files and encode the exported files.
+
+`orjson` is used if it is installed, and the standard library otherwise.
+The codec can be chosen with the `JSON_CODEC` setting.
+"""
+import json
+from typing import Any, Dict, Type
+
+from django.conf import settings
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None  # type: ignore
+
+AUTO = "auto"
+
+
+class JSONCodec:
+    name = "json"
+    # The extra of the package that installs the library.
+    extra = ""
+
+    @staticmethod
+    def is_available() -> bool:
+        return True
+
+    @staticmethod
+    def loads(s: str) -> Any:
+        return json.loads(s)
+
+    @staticmethod
+    def dumps(obj: Any) -> str:
+        """Encodes the object in compact form, and the values that JSON can't represent as strings."""
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":"), default=str)
+
+
+class OrjsonCodec(JSONCodec):
+    name = "orjson"
+    extra = "orjson"
+
+    @staticmethod
+    def is_available() -> bool:
+        return orjson is not None
+
+    @staticmethod
+    def loads(s: str) -> Any:
+        try:
+            return orjson.loads(s)
+        except orjson.JSONDecodeError:
+            # The standard library accepts NaN and the integers larger than 64 bits,
+            # and reports the errors in the same way as before.
+            return json.loads(s)
+
+    @staticmethod
+    def dumps(obj: Any) -> str:
+        try:
+            return orjson.dumps(obj, default=str).decode()
+        except TypeError:
+            # orjson doesn't encode the integers larger than 64 bits.
+            return JSONCodec.dumps(obj)
+
+
+CODECS: Dict[str, Type[JSONCodec]] = {codec.name: codec for codec in [OrjsonCodec, JSONCodec]}
+
+
+def get_codec(name: str = "") -> Type[JSONCodec]:
+    """Returns the codec of the name, or the fastest available one if the name is `auto`."""
+    name = name or settings.JSON_CODEC
+    if name == AUTO:
+        return next(codec for codec in CODECS.values() if codec.is_available())
+    if name not in CODECS:
+        raise ValueError(f"Unknown JSON codec: {name}. Choose from {', '.join([AUTO, *CODECS])}.")
+    codec = CODECS[name]
+    if not codec.is_available():
+        raise ValueError(
+            f"The JSON codec {name} is not installed. Install it with `pip install doccano[{codec.extra}]`."
+        )
+    return codec
@@ -0,0 +1,49 @@
+import json
+import math
+import unittest
+from unittest.mock import patch
+
+from django.test import SimpleTestCase, override_settings
+
+from api import json_codec
+from api.json_codec import JSONCodec, OrjsonCodec, get_codec
+
+
+class TestGetCodec(SimpleTestCase):
+    @override_settings(JSON_CODEC="auto")
+    def test_auto(self):
+        expected = OrjsonCodec if OrjsonCodec.is_available() else JSONCodec
+        self.assertEqual(get_codec(), expected)
+
+    @override_settings(JSON_CODEC="json")
+    def test_setting(self):
+        self.assertEqual(get_codec(), JSONCodec)
+
+    def test_unknown_codec(self):
+        with self.assertRaises(ValueError):
+            get_codec("unknown")
+
+    def test_codec_not_installed(self):
+        with patch.object(json_codec, "orjson", None):
+            with self.assertRaisesRegex(ValueError, r"doccano\[orjson\]"):
+                get_codec("orjson")
+
+
+@unittest.skipUnless(json_codec.orjson, "orjson is not installed")
+class TestOrjsonCodec(unittest.TestCase):
+    def test_loads(self):
+        line = '{"text": "こんにちは", "label": [[0, 5, "GREETING"]], "meta": {"score": 0.5}}'
+        self.assertEqual(OrjsonCodec.loads(line), json.loads(line))
+
+    def test_loads_values_only_accepted_by_standard_library(self):
+        self.assertTrue(math.isnan(OrjsonCodec.loads("NaN")))
+        self.assertEqual(OrjsonCodec.loads(str(2**70)), 2**70)
+
+    def test_loads_error(self):
+        with self.assertRaises(json.JSONDecodeError) as cm:
+            OrjsonCodec.loads('{"text": }')
+        self.assertEqual(str(cm.exception), "Expecting value: line 1 column 10 (char 9)")
+
+    def test_dumps(self):
+        obj = {"text": "こんにちは", "label": [[0, 5, "GREETING"]]}
+        self.assertEqual(json.loads(OrjsonCodec.dumps(obj)), obj)
@@ -238,6 +238,29 @@ if DEBUG:
 
 # Batch size for importing data
 IMPORT_BATCH_SIZE = env.int("IMPORT_BATCH_SIZE", 1000)
+# Number of processes to parse and validate the uploaded files. Set 1 to import in the calling process.
+IMPORT_WORKERS = env.int("IMPORT_WORKERS", 1)
+# Size in bytes of the segments that the line-oriented files are split into for the workers. Set 0 not to split.
+IMPORT_SEGMENT_SIZE = env.int("IMPORT_SEGMENT_SIZE", 0)
+# Load the labels with COPY instead of INSERT on PostgreSQL.
+IMPORT_LABELS_WITH_COPY = env.bool("IMPORT_LABELS_WITH_COPY", False)
+# JSON library to decode the imported files and encode the exported ones: auto, orjson, or json.
+# auto uses orjson if it is installed.
+JSON_CODEC = env("JSON_CODEC", "auto")
+
+# Search backend of the examples: auto, fts5, trigram, or like. auto uses the index of the database if it exists.
+SEARCH_BACKEND = env("SEARCH_BACKEND", "auto")
+
+# Number of examples read at once when exporting data. Set 0 to build the whole dataset in memory.
+EXPORT_CHUNK_SIZE = env.int("EXPORT_CHUNK_SIZE", 1000)
+# Number of members whose files are built with a single scan of the examples in non-collaborative projects.
+EXPORT_MEMBERS_PER_SCAN = env.int("EXPORT_MEMBERS_PER_SCAN", 8)
+# Compression of the exported zip file. Set EXPORT_ZIP_STORE to skip the compression for fast exports.
+EXPORT_ZIP_STORE = env.bool("EXPORT_ZIP_STORE", False)
+EXPORT_ZIP_COMPRESSLEVEL = env.int("EXPORT_ZIP_COMPRESSLEVEL", None)
+# The compression codec of the exported Parquet files, and the number of rows in a row group.
+EXPORT_PARQUET_COMPRESSION = env("EXPORT_PARQUET_COMPRESSION", "zstd")
+EXPORT_PARQUET_ROW_GROUP_SIZE = env.int("EXPORT_PARQUET_ROW_GROUP_SIZE", 10000)
 
 # Necessary for email verification of new accounts
 EMAIL_USE_TLS = env.bool("EMAIL_USE_TLS", False)
@@ -260,6 +283,8 @@ DJANGO_DRF_FILEPOND_FILE_STORE_PATH = MEDIA_ROOT
 
 # File upload setting
 MAX_UPLOAD_SIZE = env.int("MAX_UPLOAD_SIZE", pow(1024, 3))  # default: 1GB per a file
+# The maximum size of a compressed upload after it is decompressed.
+MAX_DECOMPRESSED_SIZE = env.int("MAX_DECOMPRESSED_SIZE", MAX_UPLOAD_SIZE)
 ENABLE_FILE_TYPE_CHECK = env.bool("ENABLE_FILE_TYPE_CHECK", False)
 
 # Celery settings
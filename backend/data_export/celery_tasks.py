@@ -1,27 +1,31 @@
 import os
 import shutil
+import tempfile
 import uuid
+from contextlib import ExitStack
+from typing import IO, List
 
 from celery import shared_task
 from celery.utils.log import get_task_logger
 from django.conf import settings
 from django.shortcuts import get_object_or_404
 
-from .pipeline.dataset import Dataset
+from .pipeline.archive import ZipArchive
+from .pipeline.dataset import Dataset, MemberDatasets
 from .pipeline.factories import (
     create_comment,
     create_formatter,
     create_labels,
     create_writer,
 )
-from .pipeline.services import ExportApplicationService
+from .pipeline.services import ExportApplicationService, MemberExportApplicationService
 from data_export.models import ExportedExample
 from projects.models import Member, Project
 
 logger = get_task_logger(__name__)
 
 
-def create_collaborative_dataset(project: Project, dirpath: str, confirmed_only: bool, formatters, writer):
+def create_collaborative_dataset(project: Project, archive: ZipArchive, confirmed_only: bool, formatters, writer):
     is_text_project = project.is_text_project
     if confirmed_only:
         examples = ExportedExample.objects.confirmed(project)
@@ -31,41 +35,70 @@ def create_collaborative_dataset(project: Project, dirpath: str, confirmed_only:
     comments = create_comment(examples)
     dataset = Dataset(examples, labels, comments, is_text_project)
 
-    service = ExportApplicationService(dataset, formatters, writer)
+    service = ExportApplicationService(dataset, formatters, writer, chunk_size=settings.EXPORT_CHUNK_SIZE)
 
-    filepath = os.path.join(dirpath, f"all.{writer.extension}")
-    service.export(filepath)
+    with archive.open(f"all.{writer.extension}", binary=writer.binary) as f:
+        service.export_to(f)
 
 
-def create_individual_dataset(project: Project, dirpath: str, confirmed_only: bool, formatters, writer):
-    is_text_project = project.is_text_project
-    members = Member.objects.filter(project=project)
-    for member in members:
-        if confirmed_only:
-            examples = ExportedExample.objects.confirmed(project, user=member.user)
-        else:
-            examples = ExportedExample.objects.filter(project=project)
-        labels = create_labels(project, examples, member.user)
-        comments = create_comment(examples, member.user)
-        dataset = Dataset(examples, labels, comments, is_text_project)
+def create_temporary_file(binary: bool) -> IO:
+    if binary:
+        return tempfile.TemporaryFile(mode="w+b")
+    return tempfile.TemporaryFile(mode="w+", encoding="utf-8", newline="")
+
+
+def export_members(archive: ZipArchive, members: List[Member], service: MemberExportApplicationService, writer):
+    """Build the files of the members with a single scan of the examples.
+    Zip entries can only be written one at a time, so the first member's file is written
+    straight into the archive, and the others are written to temporary files and copied after it.
+    """
+    first, *others = members
+    with ExitStack() as stack:
+        files = {member.user_id: stack.enter_context(create_temporary_file(writer.binary)) for member in others}
+        with archive.open(f"{first.username}.{writer.extension}", binary=writer.binary) as f:
+            service.export_to({first.user_id: f, **files})
+        for member in others:
+            file = files[member.user_id]
+            file.seek(0)
+            with archive.open(f"{member.username}.{writer.extension}", binary=writer.binary) as f:
+                shutil.copyfileobj(file, f)
 
-        service = ExportApplicationService(dataset, formatters, writer)
 
-        filepath = os.path.join(dirpath, f"{member.username}.{writer.extension}")
-        service.export(filepath)
+def create_individual_dataset(project: Project, archive: ZipArchive, confirmed_only: bool, formatters, writer):
+    """Build the files of the members, scanning the examples once for each group of members.
+    The groups have `EXPORT_MEMBERS_PER_SCAN` members, which bounds the temporary files open at once.
+    """
+    members = list(Member.objects.filter(project=project).select_related("user"))
+    examples = ExportedExample.objects.filter(project=project)
+    labels = create_labels(project, examples)
+    comments = create_comment(examples)
+    group_size = max(settings.EXPORT_MEMBERS_PER_SCAN, 1)
+    for i in range(0, len(members), group_size):
+        group = members[i : i + group_size]
+        user_ids = [member.user_id for member in group]
+        datasets = MemberDatasets(examples, labels, comments, user_ids, confirmed_only, project.is_text_project)
+        service = MemberExportApplicationService(datasets, formatters, writer, chunk_size=settings.EXPORT_CHUNK_SIZE)
+        export_members(archive, group, service, writer)
 
 
 @shared_task(autoretry_for=(Exception,), retry_backoff=True, retry_jitter=True)
 def export_dataset(project_id, file_format: str, confirmed_only=False):
     project = get_object_or_404(Project, pk=project_id)
-    dirpath = os.path.join(settings.MEDIA_ROOT, str(uuid.uuid4()))
-    os.makedirs(dirpath, exist_ok=True)
+    os.makedirs(settings.MEDIA_ROOT, exist_ok=True)
+    zip_file = os.path.join(settings.MEDIA_ROOT, f"{uuid.uuid4()}.zip")
     formatters = create_formatter(project, file_format)
-    writer = create_writer(file_format)
-    if project.collaborative_annotation:
-        create_collaborative_dataset(project, dirpath, confirmed_only, formatters, writer)
-    else:
-        create_individual_dataset(project, dirpath, confirmed_only, formatters, writer)
-    zip_file = shutil.make_archive(dirpath, "zip", dirpath)
-    shutil.rmtree(dirpath)
+    writer = create_writer(file_format, project)
+    try:
+        with ZipArchive(
+            zip_file, store=settings.EXPORT_ZIP_STORE, compresslevel=settings.EXPORT_ZIP_COMPRESSLEVEL
+        ) as archive:
+            if project.collaborative_annotation:
+                create_collaborative_dataset(project, archive, confirmed_only, formatters, writer)
+            else:
+                create_individual_dataset(project, archive, confirmed_only, formatters, writer)
+    except Exception:
+        # Each attempt writes a new archive, so remove the partial one before the task is retried.
+        if os.path.exists(zip_file):
+            os.remove(zip_file)
+        raise
     return zip_file
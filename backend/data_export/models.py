@@ -30,6 +30,7 @@ class ExportedExample(Example):
 
 class ExportedLabel(Protocol):
     objects: models.Manager
+    user_id: int
 
     def to_dict(self) -> Dict[str, Any]:
         raise NotImplementedError("Please implement this method in the subclass.")
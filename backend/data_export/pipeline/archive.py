@@ -0,0 +1,32 @@
+import io
+import zipfile
+from contextlib import contextmanager
+from typing import IO, Iterator, Optional
+
+
+class ZipArchive:
+    """Write the exported files straight into a zip archive without a temporary directory."""
+
+    def __init__(self, file, store: bool = False, compresslevel: Optional[int] = None):
+        compression = zipfile.ZIP_STORED if store else zipfile.ZIP_DEFLATED
+        self.zip_file = zipfile.ZipFile(file, mode="w", compression=compression, compresslevel=compresslevel)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        self.zip_file.close()
+
+    @contextmanager
+    def open(self, name: str, binary: bool = False) -> Iterator[IO]:
+        """Open an entry as a text stream, or as a binary stream if `binary` is set.
+        The size is unknown in advance, so zip64 is always enabled."""
+        with self.zip_file.open(name, mode="w", force_zip64=True) as stream:
+            if binary:
+                yield stream
+                return
+            with io.TextIOWrapper(stream, encoding="utf-8", newline="") as f:
+                yield f
@@ -4,6 +4,13 @@ from typing import Dict, List, Type
 
 from projects.models import ProjectType
 
+try:
+    import pyarrow  # noqa: F401
+
+    HAS_PYARROW = True
+except ImportError:  # pragma: no cover
+    HAS_PYARROW = False
+
 EXAMPLE_DIR = Path(__file__).parent.resolve() / "examples"
 
 
@@ -33,6 +40,10 @@ class JSONL(Format):
     name = "JSONL"
 
 
+class Parquet(Format):
+    name = "Parquet"
+
+
 class Options:
     options: Dict[str, List] = defaultdict(list)
 
@@ -95,3 +106,18 @@ Options.register(ProjectType.IMAGE_CAPTIONING, JSONL, IMAGE_CAPTIONING_DIR / "ex
 # Speech to Text
 SPEECH2TEXT_DIR = EXAMPLE_DIR / "speech_to_text"
 Options.register(ProjectType.SPEECH2TEXT, JSONL, SPEECH2TEXT_DIR / "example.jsonl")
+
+# Parquet, which needs pyarrow
+if HAS_PYARROW:
+    Options.register(ProjectType.DOCUMENT_CLASSIFICATION, Parquet, TEXT_CLASSIFICATION_DIR / "example.jsonl")
+    Options.register(ProjectType.SEQUENCE_LABELING, Parquet, SEQUENCE_LABELING_DIR / "example_parquet.jsonl")
+    Options.register(ProjectType.SEQUENCE_LABELING, Parquet, RELATION_EXTRACTION_DIR / "example.jsonl", True)
+    Options.register(ProjectType.SEQ2SEQ, Parquet, SEQ2SEQ_DIR / "example.jsonl")
+    Options.register(
+        ProjectType.INTENT_DETECTION_AND_SLOT_FILLING, Parquet, INTENT_DETECTION_DIR / "example_parquet.jsonl"
+    )
+    Options.register(ProjectType.IMAGE_CLASSIFICATION, Parquet, IMAGE_CLASSIFICATION_DIR / "example.jsonl")
+    Options.register(ProjectType.BOUNDING_BOX, Parquet, BOUNDING_BOX_DIR / "example.jsonl")
+    Options.register(ProjectType.SEGMENTATION, Parquet, SEGMENTATION_DIR / "example.jsonl")
+    Options.register(ProjectType.IMAGE_CAPTIONING, Parquet, IMAGE_CAPTIONING_DIR / "example.jsonl")
+    Options.register(ProjectType.SPEECH2TEXT, Parquet, SPEECH2TEXT_DIR / "example.jsonl")
@@ -1,6 +1,7 @@
 import abc
+import copy
 from collections import defaultdict
-from typing import Dict, List, Tuple
+from typing import Dict, Iterable, List, Optional, Tuple
 
 from django.db.models import QuerySet
 
@@ -13,12 +14,36 @@ class Comments(abc.ABC):
     fields: Tuple[str, ...] = ("example", "user")  # To boost performance
 
     def __init__(self, examples: QuerySet[ExportedExample], user=None):
+        self.examples = examples
+        self.user = user
+        self.comment_groups: Optional[Dict[int, List[ExportedComment]]] = None
+
+    def load(self, example_ids: Optional[Iterable[int]] = None):
+        """Load the comments of the given examples, replacing the ones loaded before.
+        If `example_ids` is omitted, the comments of all the examples are loaded.
+        """
         self.comment_groups = defaultdict(list)
+        examples = self.examples if example_ids is None else example_ids
         comments = self.comment_class.objects.filter(example__in=examples)
-        if user:
-            comments = comments.filter(user=user)
+        if self.user:
+            comments = comments.filter(user=self.user)
         for comment in comments.select_related(*self.fields):
-            self.comment_groups[comment.example.id].append(comment)
+            self.comment_groups[comment.example_id].append(comment)
 
     def find_by(self, example_id: int) -> Dict[str, List[ExportedComment]]:
-        return {self.column: self.comment_groups[example_id]}
+        if self.comment_groups is None:
+            self.load()
+        return {self.column: self.comment_groups[example_id]}  # type: ignore
+
+    def partition_by_user(self, user_ids: Iterable[int]) -> Dict[int, "Comments"]:
+        """Split the loaded comments into the collections of the given users."""
+        partitions = {}
+        for user_id in user_ids:
+            partition = copy.copy(self)
+            partition.comment_groups = defaultdict(list)
+            partitions[user_id] = partition
+        for example_id, comments in (self.comment_groups or {}).items():
+            for comment in comments:
+                if comment.user_id in partitions:
+                    partitions[comment.user_id].comment_groups[example_id].append(comment)  # type: ignore
+        return partitions
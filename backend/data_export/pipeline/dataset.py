@@ -1,11 +1,35 @@
-from typing import Any, Dict, Iterator, List
+from typing import Any, Dict, Iterator, List, Optional, Set
 
 import pandas as pd
 from django.db.models.query import QuerySet
 
 from .comments import Comments
 from .labels import Labels
-from data_export.models import ExportedExample
+from data_export.models import DATA, ExportedExample
+from examples.models import ExampleState
+
+
+def iter_by_pk(examples: QuerySet[ExportedExample], chunk_size: int) -> Iterator[List[ExportedExample]]:
+    """Yield the examples in chunks ordered by primary key, using the last key instead of an offset."""
+    examples = examples.order_by("pk")
+    last_pk = None
+    while True:
+        queryset = examples if last_pk is None else examples.filter(pk__gt=last_pk)
+        chunk = list(queryset[:chunk_size])
+        if not chunk:
+            return
+        yield chunk
+        last_pk = chunk[-1].pk
+
+
+def update_columns(columns: Dict[str, None], meta: Dict[str, Any], labels: List[Labels], comments: List[Comments]):
+    """Add the columns of an example in the order `pd.DataFrame` creates them from records."""
+    if not columns:
+        columns.update(dict.fromkeys(["id", DATA, *meta]))
+        columns.update(dict.fromkeys(label.column for label in labels))
+        columns.update(dict.fromkeys(comment.column for comment in comments))
+    else:
+        columns.update(dict.fromkeys(meta))
 
 
 class Dataset:
@@ -19,12 +43,123 @@ class Dataset:
 
     def __iter__(self) -> Iterator[Dict[str, Any]]:
         for example in self.examples:
-            data = example.to_dict(self.is_text_project)
-            for labels in self.labels:
-                data.update(**labels.find_by(example.id))
-            for comment in self.comments:
-                data.update(**comment.find_by(example.id))
-            yield data
+            yield self.to_record(example)
+
+    def to_record(self, example: ExportedExample) -> Dict[str, Any]:
+        data = example.to_dict(self.is_text_project)
+        for labels in self.labels:
+            data.update(**labels.find_by(example.id))
+        for comment in self.comments:
+            data.update(**comment.find_by(example.id))
+        return data
 
     def to_dataframe(self) -> pd.DataFrame:
         return pd.DataFrame(self)
+
+    def columns(self, chunk_size: int) -> List[str]:
+        """Return the columns in the same order as `to_dataframe` does.
+        Only the meta field is read, so the examples don't have to be loaded at once.
+        """
+        columns: Dict[str, None] = {}
+        metas = self.examples.order_by("pk").values_list("meta", flat=True)
+        for meta in metas.iterator(chunk_size=chunk_size):
+            update_columns(columns, meta, self.labels, self.comments)
+        return list(columns)
+
+    def iter_chunks(self, chunk_size: int) -> Iterator[pd.DataFrame]:
+        """Yield the dataset as data frames of at most `chunk_size` rows.
+        The examples are read by primary key, and their labels and comments are loaded chunk by chunk.
+        """
+        columns = self.columns(chunk_size)
+        for chunk in iter_by_pk(self.examples, chunk_size):
+            example_ids = [example.id for example in chunk]
+            for labels in self.labels:
+                labels.load(example_ids)
+            for comment in self.comments:
+                comment.load(example_ids)
+            yield pd.DataFrame([self.to_record(example) for example in chunk], columns=columns)
+
+
+class MemberDatasets:
+    """Build the datasets of several users with a single scan of the examples.
+    The labels and comments of all the users are loaded once per chunk and partitioned by user,
+    so the number of queries doesn't depend on the number of users.
+    If `confirmed_only` is set, each user only gets the examples the user confirmed.
+    """
+
+    def __init__(
+        self,
+        examples: QuerySet[ExportedExample],
+        labels: List[Labels],
+        comments: List[Comments],
+        user_ids: List[int],
+        confirmed_only=False,
+        is_text_project=True,
+    ):
+        self.examples = examples.exclude(states=None) if confirmed_only else examples
+        self.labels = labels
+        self.comments = comments
+        self.user_ids = user_ids
+        self.confirmed_only = confirmed_only
+        self.is_text_project = is_text_project
+
+    @staticmethod
+    def iter_examples(examples: QuerySet[ExportedExample], chunk_size: int) -> Iterator[List[ExportedExample]]:
+        """Yield the examples in chunks, or in a single chunk if `chunk_size` is 0."""
+        if chunk_size:
+            yield from iter_by_pk(examples, chunk_size)
+        else:
+            yield list(examples.order_by("pk"))
+
+    def confirmed_examples(self, example_ids: List[int]) -> Optional[Dict[int, Set[int]]]:
+        if not self.confirmed_only:
+            return None
+        confirmed: Dict[int, Set[int]] = {user_id: set() for user_id in self.user_ids}
+        states = ExampleState.objects.filter(example__in=example_ids, confirmed_by__in=self.user_ids)
+        for example_id, user_id in states.values_list("example_id", "confirmed_by_id"):
+            confirmed[user_id].add(example_id)
+        return confirmed
+
+    def partition(self, chunk: List[ExportedExample]) -> Dict[int, List[ExportedExample]]:
+        confirmed = self.confirmed_examples([example.id for example in chunk])
+        if confirmed is None:
+            return {user_id: chunk for user_id in self.user_ids}
+        return {
+            user_id: [example for example in chunk if example.id in confirmed[user_id]] for user_id in self.user_ids
+        }
+
+    def columns(self, chunk_size: int) -> Dict[int, List[str]]:
+        """Return the columns of each user's dataset in the same order as `Dataset.to_dataframe` does."""
+        columns: Dict[int, Dict[str, None]] = {user_id: {} for user_id in self.user_ids}
+        for chunk in self.iter_examples(self.examples.only("id", "meta"), chunk_size):
+            for user_id, examples in self.partition(chunk).items():
+                for example in examples:
+                    update_columns(columns[user_id], example.meta, self.labels, self.comments)
+        return {user_id: list(user_columns) for user_id, user_columns in columns.items()}
+
+    def iter_chunks(self, chunk_size: int) -> Iterator[Dict[int, pd.DataFrame]]:
+        """Yield the chunks of the users' datasets as `{user_id: data frame}`.
+        Users who have no examples in a chunk are left out. If `chunk_size` is 0, a single chunk is yielded.
+        """
+        columns = self.columns(chunk_size)
+        for chunk in self.iter_examples(self.examples, chunk_size):
+            example_ids = [example.id for example in chunk]
+            for labels in self.labels:
+                labels.load(example_ids)
+            for comment in self.comments:
+                comment.load(example_ids)
+            label_partitions = [labels.partition_by_user(self.user_ids) for labels in self.labels]
+            comment_partitions = [comment.partition_by_user(self.user_ids) for comment in self.comments]
+            frames = {}
+            for user_id, examples in self.partition(chunk).items():
+                if not examples:
+                    continue
+                dataset = Dataset(
+                    self.examples,
+                    [partition[user_id] for partition in label_partitions],
+                    [partition[user_id] for partition in comment_partitions],
+                    self.is_text_project,
+                )
+                records = [dataset.to_record(example) for example in examples]
+                frames[user_id] = pd.DataFrame(records, columns=columns[user_id])
+            yield frames
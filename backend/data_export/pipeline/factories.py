@@ -1,9 +1,10 @@
-from typing import Dict, List, Type
+from typing import Dict, List, Optional, Type
 
+from django.conf import settings
 from django.db.models import QuerySet
 
 from . import writers
-from .catalog import CSV, JSON, JSONL, FastText
+from .catalog import CSV, JSON, JSONL, FastText, Parquet
 from .comments import Comments
 from .formatters import (
     DictFormatter,
@@ -19,7 +20,13 @@ from data_export.models import DATA, ExportedExample
 from projects.models import Project, ProjectType
 
 
-def create_writer(file_format: str) -> writers.Writer:
+def create_writer(file_format: str, project: Optional[Project] = None) -> writers.Writer:
+    if file_format == Parquet.name:
+        return writers.ParquetWriter(
+            columns=select_parquet_columns(project) if project else None,
+            compression=settings.EXPORT_PARQUET_COMPRESSION,
+            row_group_size=settings.EXPORT_PARQUET_ROW_GROUP_SIZE,
+        )
     mapping = {
         CSV.name: writers.CsvWriter(),
         JSON.name: writers.JsonWriter(),
@@ -31,6 +38,35 @@ def create_writer(file_format: str) -> writers.Writer:
     return mapping[file_format]
 
 
+def select_parquet_columns(project: Project) -> Dict[str, str]:
+    """Return the kinds of the columns in the formatted dataset, which are written with a fixed type.
+    The other columns are the meta."""
+    use_relation = getattr(project, "use_relation", False)
+    mapping: Dict[str, Dict[str, str]] = {
+        ProjectType.DOCUMENT_CLASSIFICATION: {"label": writers.STRINGS, Comments.column: writers.STRINGS},
+        ProjectType.SEQUENCE_LABELING: {
+            Spans.column: writers.SPANS,
+            Relations.column: writers.RELATIONS,
+            Comments.column: writers.COMMENTS,
+        }
+        if use_relation
+        else {"label": writers.SPANS, Comments.column: writers.STRINGS},
+        ProjectType.SEQ2SEQ: {"label": writers.STRINGS, Comments.column: writers.STRINGS},
+        ProjectType.IMAGE_CLASSIFICATION: {"label": writers.STRINGS, Comments.column: writers.STRINGS},
+        ProjectType.SPEECH2TEXT: {"label": writers.STRINGS, Comments.column: writers.STRINGS},
+        ProjectType.INTENT_DETECTION_AND_SLOT_FILLING: {
+            "cats": writers.STRINGS,
+            Spans.column: writers.SPANS,
+            Comments.column: writers.STRINGS,
+        },
+        ProjectType.BOUNDING_BOX: {"bbox": writers.BOUNDING_BOXES, Comments.column: writers.COMMENTS},
+        ProjectType.SEGMENTATION: {"segmentation": writers.SEGMENTS, Comments.column: writers.COMMENTS},
+        ProjectType.IMAGE_CAPTIONING: {"label": writers.STRINGS, Comments.column: writers.STRINGS},
+    }
+    data_column = "text" if project.is_text_project else "filename"
+    return {"id": writers.INT64, data_column: writers.STRING, **mapping[project.project_type]}
+
+
 def create_formatter(project: Project, file_format: str) -> List[Formatter]:
     use_relation = getattr(project, "use_relation", False)
     # text tasks
@@ -67,6 +103,11 @@ def create_formatter(project: Project, file_format: str) -> List[Formatter]:
                 RenameFormatter(**mapper_text_classification),
             ],
             FastText.name: [FastTextCategoryFormatter(Categories.column)],
+            Parquet.name: [
+                ListedCategoryFormatter(Categories.column),
+                ListedCategoryFormatter(Comments.column),
+                RenameFormatter(**mapper_text_classification),
+            ],
         },
         ProjectType.SEQUENCE_LABELING: {
             JSONL.name: [
@@ -80,7 +121,19 @@ def create_formatter(project: Project, file_format: str) -> List[Formatter]:
                 TupledSpanFormatter(Spans.column),
                 ListedCategoryFormatter(Comments.column),
                 RenameFormatter(**mapper_sequence_labeling),
+            ],
+            Parquet.name: [
+                DictFormatter(Spans.column),
+                DictFormatter(Relations.column),
+                DictFormatter(Comments.column),
+                RenameFormatter(**mapper_relation_extraction),
             ]
+            if use_relation
+            else [
+                DictFormatter(Spans.column),
+                ListedCategoryFormatter(Comments.column),
+                RenameFormatter(**mapper_sequence_labeling),
+            ],
         },
         ProjectType.SEQ2SEQ: {
             CSV.name: [
@@ -98,6 +151,11 @@ def create_formatter(project: Project, file_format: str) -> List[Formatter]:
                 ListedCategoryFormatter(Comments.column),
                 RenameFormatter(**mapper_seq2seq),
             ],
+            Parquet.name: [
+                ListedCategoryFormatter(Texts.column),
+                ListedCategoryFormatter(Comments.column),
+                RenameFormatter(**mapper_seq2seq),
+            ],
         },
         ProjectType.IMAGE_CLASSIFICATION: {
             JSONL.name: [
@@ -105,6 +163,11 @@ def create_formatter(project: Project, file_format: str) -> List[Formatter]:
                 ListedCategoryFormatter(Comments.column),
                 RenameFormatter(**mapper_image_classification),
             ],
+            Parquet.name: [
+                ListedCategoryFormatter(Categories.column),
+                ListedCategoryFormatter(Comments.column),
+                RenameFormatter(**mapper_image_classification),
+            ],
         },
         ProjectType.SPEECH2TEXT: {
             JSONL.name: [
@@ -112,6 +175,11 @@ def create_formatter(project: Project, file_format: str) -> List[Formatter]:
                 ListedCategoryFormatter(Comments.column),
                 RenameFormatter(**mapper_speech2text),
             ],
+            Parquet.name: [
+                ListedCategoryFormatter(Texts.column),
+                ListedCategoryFormatter(Comments.column),
+                RenameFormatter(**mapper_speech2text),
+            ],
         },
         ProjectType.INTENT_DETECTION_AND_SLOT_FILLING: {
             JSONL.name: [
@@ -119,28 +187,49 @@ def create_formatter(project: Project, file_format: str) -> List[Formatter]:
                 TupledSpanFormatter(Spans.column),
                 ListedCategoryFormatter(Comments.column),
                 RenameFormatter(**mapper_intent_detection),
-            ]
+            ],
+            Parquet.name: [
+                ListedCategoryFormatter(Categories.column),
+                DictFormatter(Spans.column),
+                ListedCategoryFormatter(Comments.column),
+                RenameFormatter(**mapper_intent_detection),
+            ],
         },
         ProjectType.BOUNDING_BOX: {
             JSONL.name: [
                 DictFormatter(BoundingBoxes.column),
                 DictFormatter(Comments.column),
                 RenameFormatter(**mapper_bounding_box),
-            ]
+            ],
+            Parquet.name: [
+                DictFormatter(BoundingBoxes.column),
+                DictFormatter(Comments.column),
+                RenameFormatter(**mapper_bounding_box),
+            ],
         },
         ProjectType.SEGMENTATION: {
             JSONL.name: [
                 DictFormatter(Segments.column),
                 DictFormatter(Comments.column),
                 RenameFormatter(**mapper_segmentation),
-            ]
+            ],
+            Parquet.name: [
+                DictFormatter(Segments.column),
+                DictFormatter(Comments.column),
+                RenameFormatter(**mapper_segmentation),
+            ],
         },
         ProjectType.IMAGE_CAPTIONING: {
             JSONL.name: [
                 ListedCategoryFormatter(Texts.column),
                 ListedCategoryFormatter(Comments.column),
                 RenameFormatter(**mapper_image_captioning),
-            ]
+            ],
+            Parquet.name: [
+                ListedCategoryFormatter(Texts.column),
+                ListedCategoryFormatter(Comments.column),
+                RenameFormatter(**mapper_image_captioning),
+            ],
         },
     }
     return mapping[project.project_type][file_format]
@@ -2,8 +2,9 @@
 Represents label collection.
 """
 import abc
+import copy
 from collections import defaultdict
-from typing import Dict, List, Tuple
+from typing import Dict, Iterable, List, Optional, Tuple
 
 from django.db.models import QuerySet
 
@@ -25,15 +26,39 @@ class Labels(abc.ABC):
     fields: Tuple[str, ...] = ("example", "label")  # To boost performance
 
     def __init__(self, examples: QuerySet[ExportedExample], user=None):
+        self.examples = examples
+        self.user = user
+        self.label_groups: Optional[Dict[int, List[ExportedLabel]]] = None
+
+    def load(self, example_ids: Optional[Iterable[int]] = None):
+        """Load the labels of the given examples, replacing the ones loaded before.
+        If `example_ids` is omitted, the labels of all the examples are loaded.
+        """
         self.label_groups = defaultdict(list)
+        examples = self.examples if example_ids is None else example_ids
         labels = self.label_class.objects.filter(example__in=examples)
-        if user:
-            labels = labels.filter(user=user)
+        if self.user:
+            labels = labels.filter(user=self.user)
         for label in labels.select_related(*self.fields):
-            self.label_groups[label.example.id].append(label)
+            self.label_groups[label.example_id].append(label)
 
     def find_by(self, example_id: int) -> Dict[str, List[ExportedLabel]]:
-        return {self.column: self.label_groups[example_id]}
+        if self.label_groups is None:
+            self.load()
+        return {self.column: self.label_groups[example_id]}  # type: ignore
+
+    def partition_by_user(self, user_ids: Iterable[int]) -> Dict[int, "Labels"]:
+        """Split the loaded labels into the collections of the given users."""
+        partitions = {}
+        for user_id in user_ids:
+            partition = copy.copy(self)
+            partition.label_groups = defaultdict(list)
+            partitions[user_id] = partition
+        for example_id, labels in (self.label_groups or {}).items():
+            for label in labels:
+                if label.user_id in partitions:
+                    partitions[label.user_id].label_groups[example_id].append(label)  # type: ignore
+        return partitions
 
 
 class Categories(Labels):
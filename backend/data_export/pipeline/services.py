@@ -1,19 +1,66 @@
-from typing import List
+from typing import IO, Iterator, List, Mapping, Optional
 
-from .dataset import Dataset
+import pandas as pd
+
+from .dataset import Dataset, MemberDatasets
 from .formatters import Formatter
 from .writers import Writer
 
 
+def apply_formatters(dataset: pd.DataFrame, formatters: List[Formatter]) -> pd.DataFrame:
+    for formatter in formatters:
+        dataset = formatter.format(dataset)
+    return dataset
+
+
 class ExportApplicationService:
-    def __init__(self, dataset: Dataset, formatters: List[Formatter], writer: Writer):
+    def __init__(self, dataset: Dataset, formatters: List[Formatter], writer: Writer, chunk_size: Optional[int] = None):
         self.dataset = dataset
         self.formatters = formatters
         self.writer = writer
+        self.chunk_size = chunk_size
 
     def export(self, file):
-        dataset = self.dataset.to_dataframe()
-        for formatter in self.formatters:
-            dataset = formatter.format(dataset)
-        self.writer.write(file, dataset)
+        if self.writer.binary:
+            with open(file, mode="wb") as binary:
+                self.export_to(binary)
+            return file
+        with open(file, mode="w", encoding="utf-8", newline="") as f:
+            self.export_to(f)
         return file
+
+    def export_to(self, f: IO[str]):
+        """Write the dataset to the opened text stream.
+        If the chunk size is set, the dataset is written chunk by chunk
+        so that the memory usage is bounded by the chunk size.
+        """
+        if self.chunk_size:
+            self.writer.write_chunks(f, self.iter_formatted_chunks(self.chunk_size))
+        else:
+            self.writer.write(f, apply_formatters(self.dataset.to_dataframe(), self.formatters))
+
+    def iter_formatted_chunks(self, chunk_size: int) -> Iterator[pd.DataFrame]:
+        for chunk in self.dataset.iter_chunks(chunk_size):
+            yield apply_formatters(chunk, self.formatters)
+
+
+class MemberExportApplicationService:
+    """Export the datasets of the members at once, writing each chunk to the member's file."""
+
+    def __init__(self, datasets: MemberDatasets, formatters: List[Formatter], writer: Writer, chunk_size: int):
+        self.datasets = datasets
+        self.formatters = formatters
+        self.writer = writer
+        self.chunk_size = chunk_size
+
+    def export_to(self, files: Mapping[int, IO]):
+        """Write the members' datasets to the opened streams keyed by user id."""
+        is_first = dict.fromkeys(files, True)
+        for file in files.values():
+            self.writer.write_header(file)
+        for frames in self.datasets.iter_chunks(self.chunk_size):
+            for user_id, frame in frames.items():
+                self.writer.write_chunk(files[user_id], apply_formatters(frame, self.formatters), is_first[user_id])
+                is_first[user_id] = False
+        for file in files.values():
+            self.writer.write_footer(file)
@@ -1,14 +1,54 @@
 import abc
+import contextlib
+import os
+from typing import IO, Any, ContextManager, Dict, Iterable, Iterator, List, Optional
 
+import numpy as np
 import pandas as pd
 
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:  # pragma: no cover
+    pyarrow = None  # type: ignore
+
+from api.json_codec import get_codec
+
+# The kinds of the columns written with a fixed type by `ParquetWriter`.
+INT64 = "int64"
+STRING = "string"
+STRINGS = "strings"
+SPANS = "spans"
+RELATIONS = "relations"
+BOUNDING_BOXES = "bounding_boxes"
+SEGMENTS = "segments"
+COMMENTS = "comments"
+
 
 class Writer(abc.ABC):
     extension = ""
+    # Whether the writer writes bytes instead of text to the file.
+    binary = False
 
-    @staticmethod
     @abc.abstractmethod
-    def write(file, dataset: pd.DataFrame):
+    def write(self, file, dataset: pd.DataFrame):
+        raise NotImplementedError("Please implement this method in the subclass.")
+
+    def write_chunks(self, file: IO, chunks: Iterable[pd.DataFrame]):
+        """Write the chunks to the opened file one by one."""
+        self.write_header(file)
+        for i, chunk in enumerate(chunks):
+            self.write_chunk(file, chunk, is_first=i == 0)
+        self.write_footer(file)
+
+    def write_header(self, file: IO):
+        pass
+
+    def write_footer(self, file: IO):
+        pass
+
+    @abc.abstractmethod
+    def write_chunk(self, file: IO, chunk: pd.DataFrame, is_first: bool):
         raise NotImplementedError("Please implement this method in the subclass.")
 
 
@@ -19,21 +59,80 @@ class CsvWriter(Writer):
     def write(file, dataset: pd.DataFrame):
         dataset.to_csv(file, index=False, encoding="utf-8")
 
+    @staticmethod
+    def write_chunk(file: IO[str], chunk: pd.DataFrame, is_first: bool):
+        chunk.to_csv(file, index=False, header=is_first)
+
+
+def open_text(file) -> ContextManager[IO[str]]:
+    """Open the file if a path is given, so that the writers can write to a path or an opened stream."""
+    if isinstance(file, (str, os.PathLike)):
+        return open(file, mode="w", encoding="utf-8", newline="")
+    return contextlib.nullcontext(file)
+
+
+def to_json_value(value) -> Any:
+    """Convert the missing value, which pandas fills with NaN, to None and the numpy scalars to Python ones."""
+    if value is None or (isinstance(value, float) and value != value):
+        return None
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def encode_records(chunk: pd.DataFrame) -> Iterator[str]:
+    """Encode the rows of the chunk as JSON objects with the JSON codec.
+    The columns are converted to lists at once, which is much faster than `to_dict(orient="records")`.
+    """
+    codec = get_codec()
+    names = list(chunk.columns)
+    columns = []
+    for _, series in chunk.items():
+        values = series.tolist()
+        # Only the columns of integers and booleans can't have a missing value.
+        if series.dtype.kind not in "iub":
+            values = [to_json_value(value) for value in values]
+        columns.append(values)
+    for row in zip(*columns):
+        yield codec.dumps(dict(zip(names, row)))
+
 
 class JsonWriter(Writer):
     extension = "json"
 
+    def write(self, file, dataset: pd.DataFrame):
+        with open_text(file) as f:
+            self.write_chunks(f, [dataset])
+
     @staticmethod
-    def write(file, dataset: pd.DataFrame):
-        dataset.to_json(file, orient="records", force_ascii=False)
+    def write_header(file: IO[str]):
+        file.write("[")
+
+    @staticmethod
+    def write_footer(file: IO[str]):
+        file.write("]")
+
+    @staticmethod
+    def write_chunk(file: IO[str], chunk: pd.DataFrame, is_first: bool):
+        records = ",".join(encode_records(chunk))
+        if not records:
+            return
+        if not is_first:
+            file.write(",")
+        file.write(records)
 
 
 class JsonlWriter(Writer):
     extension = "jsonl"
 
+    def write(self, file, dataset: pd.DataFrame):
+        with open_text(file) as f:
+            self.write_chunks(f, [dataset])
+
     @staticmethod
-    def write(file, dataset: pd.DataFrame):
-        dataset.to_json(file, orient="records", force_ascii=False, lines=True)
+    def write_chunk(file: IO[str], chunk: pd.DataFrame, is_first: bool):
+        # Every line ends with a newline, which separates the chunks.
+        file.writelines(f"{record}\n" for record in encode_records(chunk))
 
 
 class FastTextWriter(Writer):
@@ -42,3 +141,109 @@ class FastTextWriter(Writer):
     @staticmethod
     def write(file, dataset: pd.DataFrame):
         dataset.to_csv(file, index=False, encoding="utf-8", header=False)
+
+    @staticmethod
+    def write_chunk(file: IO[str], chunk: pd.DataFrame, is_first: bool):
+        chunk.to_csv(file, index=False, header=False)
+
+
+def arrow_column_types() -> Dict[str, "pyarrow.DataType"]:
+    """Return the Arrow types of the column kinds. The label columns are the lists of the labels' `to_dict`
+    or `to_string`."""
+    string, int64, float64 = pyarrow.string(), pyarrow.int64(), pyarrow.float64()
+    structs = {
+        SPANS: [("id", int64), ("label", string), ("start_offset", int64), ("end_offset", int64)],
+        RELATIONS: [("id", int64), ("from_id", int64), ("to_id", int64), ("type", string)],
+        BOUNDING_BOXES: [
+            ("uuid", string),
+            ("x", float64),
+            ("y", float64),
+            ("width", float64),
+            ("height", float64),
+            ("label", string),
+        ],
+        SEGMENTS: [("uuid", string), ("points", pyarrow.list_(float64)), ("label", string)],
+        COMMENTS: [("id", int64), ("comment", string)],
+    }
+    types = {kind: pyarrow.list_(pyarrow.struct(fields)) for kind, fields in structs.items()}
+    types[STRINGS] = pyarrow.list_(string)
+    types[INT64] = int64
+    types[STRING] = string
+    return types
+
+
+def to_json(value) -> Optional[str]:
+    """Encode a meta value as JSON with the JSON codec, leaving the missing value as null."""
+    value = to_json_value(value)
+    if value is None:
+        return None
+    return get_codec().dumps(value)
+
+
+class ParquetWriter(Writer):
+    """Write the dataset to a Parquet file.
+
+    The columns in `columns` are written with the type of their kind, e.g. a list of structs for spans,
+    so that the file can be loaded without parsing the labels. The other columns are the meta, whose
+    values can differ in type from example to example, so they are written as JSON strings.
+    The chunks are buffered until `row_group_size` rows, which are written as a row group,
+    so that the memory usage is bounded by the row group and the file can be read group by group.
+    """
+
+    extension = "parquet"
+    binary = True
+
+    def __init__(
+        self, columns: Optional[Dict[str, str]] = None, compression: str = "zstd", row_group_size: int = 10000
+    ):
+        if pyarrow is None:
+            raise ValueError(
+                "pyarrow must be installed to export Parquet files. Install it with `pip install doccano[parquet]`."
+            )
+        self.columns = {"id": INT64, **(columns or {})}
+        self.compression = compression
+        self.row_group_size = row_group_size
+        # The Parquet writers and the buffered tables, keyed by the id of the file.
+        self.writers: Dict[int, "pyarrow.parquet.ParquetWriter"] = {}
+        self.buffers: Dict[int, List["pyarrow.Table"]] = {}
+
+    def write(self, file, dataset: pd.DataFrame):
+        self.write_chunks(file, [dataset])
+
+    def create_schema(self, chunk: pd.DataFrame) -> "pyarrow.Schema":
+        column_types = arrow_column_types()
+        kinds = [self.columns.get(column, STRING) for column in chunk.columns]
+        return pyarrow.schema([pyarrow.field(column, column_types[kind]) for column, kind in zip(chunk.columns, kinds)])
+
+    def encode_meta(self, chunk: pd.DataFrame) -> pd.DataFrame:
+        meta_columns = [column for column in chunk.columns if column not in self.columns]
+        return chunk.assign(**{column: chunk[column].map(to_json) for column in meta_columns})
+
+    def write_chunk(self, file, chunk: pd.DataFrame, is_first: bool):
+        key = id(file)
+        if key not in self.writers:
+            schema = self.create_schema(chunk)
+            self.writers[key] = pyarrow.parquet.ParquetWriter(file, schema, compression=self.compression)
+            self.buffers[key] = []
+        writer = self.writers[key]
+        table = pyarrow.Table.from_pandas(self.encode_meta(chunk), schema=writer.schema, preserve_index=False)
+        self.buffers[key].append(table)
+        if sum(table.num_rows for table in self.buffers[key]) >= self.row_group_size:
+            self.flush(key)
+
+    def flush(self, key: int):
+        if not self.buffers[key]:
+            return
+        table = pyarrow.concat_tables(self.buffers[key])
+        self.buffers[key] = []
+        self.writers[key].write_table(table, row_group_size=self.row_group_size)
+
+    def write_footer(self, file):
+        key = id(file)
+        if key not in self.writers:
+            # No chunk was written, so write a file without columns.
+            self.writers[key] = pyarrow.parquet.ParquetWriter(file, pyarrow.schema([]), compression=self.compression)
+            self.buffers[key] = []
+        self.flush(key)
+        self.writers.pop(key).close()
+        del self.buffers[key]
@@ -0,0 +1,40 @@
+import os
+import unittest
+import zipfile
+
+from ..pipeline.archive import ZipArchive
+
+
+class TestZipArchive(unittest.TestCase):
+    def setUp(self):
+        self.file = "tmp.zip"
+
+    def tearDown(self):
+        os.remove(self.file)
+
+    def write(self, **kwargs):
+        with ZipArchive(self.file, **kwargs) as archive:
+            with archive.open("a.jsonl") as f:
+                f.write('{"text": "あ"}\n')
+            with archive.open("b.jsonl") as f:
+                f.write('{"text": "B"}\n')
+
+    def test_write_entries(self):
+        self.write()
+        with zipfile.ZipFile(self.file) as z:
+            self.assertEqual(z.namelist(), ["a.jsonl", "b.jsonl"])
+            self.assertEqual(z.read("a.jsonl").decode("utf-8"), '{"text": "あ"}\n')
+            self.assertEqual(z.getinfo("a.jsonl").compress_type, zipfile.ZIP_DEFLATED)
+
+    def test_store_mode(self):
+        self.write(store=True)
+        with zipfile.ZipFile(self.file) as z:
+            self.assertEqual(z.getinfo("b.jsonl").compress_type, zipfile.ZIP_STORED)
+            self.assertEqual(z.read("b.jsonl").decode("utf-8"), '{"text": "B"}\n')
+
+    def test_binary_entry(self):
+        with ZipArchive(self.file) as archive:
+            with archive.open("a.parquet", binary=True) as f:
+                f.write(b"PAR1")
+        with zipfile.ZipFile(self.file) as z:
+            self.assertEqual(z.read("a.parquet"), b"PAR1")
@@ -1,10 +1,19 @@
 import unittest
+from collections import defaultdict
 from unittest.mock import MagicMock
 
 import pandas as pd
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from model_mommy import mommy
 from pandas.testing import assert_frame_equal
 
-from data_export.pipeline.dataset import Dataset
+from data_export.models import ExportedExample
+from data_export.pipeline.dataset import Dataset, MemberDatasets
+from data_export.pipeline.factories import create_comment, create_labels
+from projects.models import ProjectType
+from projects.tests.utils import prepare_project
 
 
 class TestDataset(unittest.TestCase):
@@ -27,3 +36,75 @@ class TestDataset(unittest.TestCase):
         df = dataset.to_dataframe()
         expected = pd.DataFrame([{"data": "example", "labels": ["label"], "comments": ["comment"]}])
         assert_frame_equal(df, expected)
+
+
+class TestDatasetChunks(TestCase):
+    def setUp(self):
+        self.project = prepare_project(ProjectType.DOCUMENT_CLASSIFICATION)
+        self.example1 = mommy.make("ExportedExample", project=self.project.item, text="A", meta={"a": 1})
+        self.example2 = mommy.make("ExportedExample", project=self.project.item, text="B", meta={"b": 2})
+        self.example3 = mommy.make("ExportedExample", project=self.project.item, text="C")
+        mommy.make("ExportedCategory", example=self.example1, user=self.project.admin)
+        mommy.make("ExportedCategory", example=self.example3, user=self.project.admin)
+        mommy.make("ExportedComment", example=self.example2, user=self.project.admin)
+        examples = ExportedExample.objects.filter(project=self.project.item)
+        self.dataset = Dataset(examples, create_labels(self.project.item, examples), create_comment(examples))
+
+    def test_iter_chunks_matches_dataframe(self):
+        expected = self.dataset.to_dataframe()
+        df = pd.concat(self.dataset.iter_chunks(chunk_size=2), ignore_index=True)
+        self.assertEqual(list(df.columns), list(expected.columns))
+        self.assertEqual(df["id"].tolist(), expected["id"].tolist())
+        for column in ["categories", "Comments"]:
+            self.assertEqual(df[column].apply(len).tolist(), expected[column].apply(len).tolist())
+
+    def test_iter_chunks_is_bounded_by_chunk_size(self):
+        chunks = list(self.dataset.iter_chunks(chunk_size=2))
+        self.assertEqual([len(chunk) for chunk in chunks], [2, 1])
+
+
+class TestMemberDatasets(TestCase):
+    def setUp(self):
+        self.project = prepare_project(ProjectType.DOCUMENT_CLASSIFICATION)
+        self.example1 = mommy.make("ExportedExample", project=self.project.item)
+        self.example2 = mommy.make("ExportedExample", project=self.project.item)
+        mommy.make("ExportedCategory", example=self.example1, user=self.project.admin)
+        mommy.make("ExportedCategory", example=self.example1, user=self.project.annotator)
+        mommy.make("ExampleState", example=self.example1, confirmed_by=self.project.admin)
+        self.examples = ExportedExample.objects.filter(project=self.project.item)
+        self.users = [self.project.admin, self.project.annotator]
+
+    def create_datasets(self, users, confirmed_only=False):
+        labels = create_labels(self.project.item, self.examples)
+        comments = create_comment(self.examples)
+        return MemberDatasets(self.examples, labels, comments, [user.id for user in users], confirmed_only)
+
+    def read_datasets(self, datasets, chunk_size):
+        frames = defaultdict(list)
+        for chunk in datasets.iter_chunks(chunk_size):
+            for user_id, frame in chunk.items():
+                frames[user_id].append(frame)
+        return {user_id: pd.concat(user_frames, ignore_index=True) for user_id, user_frames in frames.items()}
+
+    def test_datasets_have_labels_of_members(self):
+        for chunk_size in [0, 1]:
+            datasets = self.read_datasets(self.create_datasets(self.users), chunk_size)
+            for user in self.users:
+                df = datasets[user.id]
+                self.assertEqual(df["id"].tolist(), [self.example1.id, self.example2.id])
+                self.assertEqual([[label.user for label in labels] for labels in df["categories"]], [[user], []])
+
+    def test_datasets_have_examples_confirmed_by_members(self):
+        datasets = self.read_datasets(self.create_datasets(self.users, confirmed_only=True), chunk_size=1)
+        self.assertEqual(datasets[self.project.admin.id]["id"].tolist(), [self.example1.id])
+        self.assertNotIn(self.project.annotator.id, datasets)
+
+    def test_number_of_queries_does_not_depend_on_members(self):
+        for confirmed_only in [False, True]:
+            counts = []
+            for users in [self.users[:1], [*self.users, self.project.approver]]:
+                datasets = self.create_datasets(users, confirmed_only)
+                with CaptureQueriesContext(connection) as context:
+                    list(datasets.iter_chunks(chunk_size=1))
+                counts.append(len(context))
+            self.assertEqual(counts[0], counts[1])
@@ -26,3 +26,11 @@ class TestLabels(TestCase):
         categories = Categories(self.examples, user=self.project.annotator)
         result = categories.find_by(self.example1.id)
         self.assertEqual(len(result[Categories.column]), 0)
+
+    def test_partition_by_user(self):
+        categories = Categories(self.examples)
+        categories.load([self.example1.id, self.example2.id])
+        admin_id, annotator_id = self.project.admin.id, self.project.annotator.id
+        partitions = categories.partition_by_user([admin_id, annotator_id])
+        self.assertEqual(len(partitions[admin_id].find_by(self.example1.id)[Categories.column]), 1)
+        self.assertEqual(len(partitions[annotator_id].find_by(self.example1.id)[Categories.column]), 0)
@@ -1,11 +1,17 @@
+import io
 import os
+import tempfile
+import unittest
 import zipfile
+from unittest.mock import patch
 
 import pandas as pd
 from django.test import TestCase, override_settings
 from model_mommy import mommy
 
+from .. import celery_tasks
 from ..celery_tasks import export_dataset
+from ..pipeline import writers
 from data_export.models import DATA
 from projects.models import ProjectType
 from projects.tests.utils import prepare_project
@@ -47,6 +53,17 @@ class TestExport(TestCase):
         return d
 
 
+class TestExportFailure(TestCase):
+    def test_partial_archive_is_removed(self):
+        project = prepare_project(ProjectType.DOCUMENT_CLASSIFICATION, collaborative_annotation=True)
+        mommy.make("ExportedExample", project=project.item, text="example")
+        with tempfile.TemporaryDirectory() as media_root, override_settings(MEDIA_ROOT=media_root):
+            with patch.object(celery_tasks, "create_comment", side_effect=RuntimeError):
+                result = export_dataset.apply(args=(project.id, "JSONL"), retries=export_dataset.max_retries)
+            self.assertTrue(result.failed())
+            self.assertEqual(os.listdir(media_root), [])
+
+
 class TestExportCategory(TestExport):
     def prepare_data(self, collaborative=False):
         self.project = prepare_project(ProjectType.DOCUMENT_CLASSIFICATION, collaborative_annotation=collaborative)
@@ -824,3 +841,120 @@ class TestExportRelation(TestExport):
             }
         ]
         self.assertEqual(dataset, expected_dataset)
+
+
+@override_settings(EXPORT_CHUNK_SIZE=1)
+class TestExportCategoryInChunks(TestExportCategory):
+    pass
+
+
+@override_settings(EXPORT_CHUNK_SIZE=0)
+class TestExportCategoryInMemory(TestExportCategory):
+    pass
+
+
+@override_settings(EXPORT_ZIP_STORE=True)
+class TestExportCategoryWithoutCompression(TestExportCategory):
+    pass
+
+
+@override_settings(EXPORT_MEMBERS_PER_SCAN=1)
+class TestExportCategoryMemberByMember(TestExportCategory):
+    def test_members_are_written_straight_into_archive(self):
+        self.prepare_data()
+        with patch.object(celery_tasks, "create_temporary_file") as create_temporary_file:
+            self.export_dataset()
+        create_temporary_file.assert_not_called()
+
+
+@override_settings(EXPORT_MEMBERS_PER_SCAN=2, EXPORT_CHUNK_SIZE=1)
+class TestExportCategoryInGroupsOfMembers(TestExportCategory):
+    def test_temporary_files_are_bounded_by_group(self):
+        self.prepare_data()
+        with patch.object(celery_tasks, "create_temporary_file", wraps=celery_tasks.create_temporary_file) as create:
+            self.export_dataset()
+        # The three members are split into groups of two and one, and the first member of a group needs no file.
+        self.assertEqual(create.call_count, 1)
+
+
+def read_parquet_zip_content(file):
+    datasets = {}
+    with zipfile.ZipFile(file) as z:
+        for file in z.filelist:
+            username = file.filename.split(".")[0]
+            datasets[username] = writers.pyarrow.parquet.read_table(io.BytesIO(z.read(file))).to_pylist()
+    return datasets
+
+
+@unittest.skipUnless(writers.pyarrow, "pyarrow is not installed")
+class TestExportSequenceLabelingToParquet(TestExportSequenceLabeling):
+    def export_dataset(self, confirmed_only=False):
+        file = export_dataset(self.project.id, "Parquet", confirmed_only)
+        datasets = read_parquet_zip_content(file)
+        os.remove(file)
+        if self.project.item.collaborative_annotation:
+            return datasets["all"]
+        return datasets
+
+    def test_unconfirmed_and_non_collaborative(self):
+        self.prepare_data()
+        datasets = self.export_dataset()
+        expected_datasets = {
+            self.project.admin.username: [
+                {**self.data1, "label": [self.span1.to_dict()], "Comments": [self.comment1.to_string()]},
+                {**self.data2, "label": [], "Comments": []},
+            ],
+            self.project.annotator.username: [
+                {**self.data1, "label": [self.span2.to_dict()], "Comments": [self.comment2.to_string()]},
+                {**self.data2, "label": [], "Comments": []},
+            ],
+            self.project.approver.username: [
+                {**self.data1, "label": [], "Comments": []},
+                {**self.data2, "label": [], "Comments": []},
+            ],
+        }
+        for username, dataset in expected_datasets.items():
+            self.assertEqual(dataset, datasets[username])
+
+    def test_unconfirmed_and_collaborative(self):
+        self.prepare_data(collaborative=True)
+        dataset = self.export_dataset()
+        expected_dataset = [
+            {
+                **self.data1,
+                "label": [self.span1.to_dict(), self.span2.to_dict()],
+                "Comments": sorted([self.comment1.to_string(), self.comment2.to_string()]),
+            },
+            {**self.data2, "label": [], "Comments": []},
+        ]
+        self.assertEqual(dataset, expected_dataset)
+
+    def test_confirmed_and_non_collaborative(self):
+        self.prepare_data()
+        datasets = self.export_dataset(confirmed_only=True)
+        expected_datasets = {
+            self.project.admin.username: [
+                {**self.data1, "label": [self.span1.to_dict()], "Comments": [self.comment1.to_string()]},
+            ],
+            self.project.annotator.username: [],
+            self.project.approver.username: [],
+        }
+        for username, dataset in expected_datasets.items():
+            self.assertEqual(dataset, datasets[username])
+
+    def test_confirmed_and_collaborative(self):
+        self.prepare_data(collaborative=True)
+        dataset = self.export_dataset(confirmed_only=True)
+        expected_dataset = [
+            {
+                **self.data1,
+                "label": [self.span1.to_dict(), self.span2.to_dict()],
+                "Comments": sorted([self.comment1.to_string(), self.comment2.to_string()]),
+            }
+        ]
+        self.assertEqual(dataset, expected_dataset)
+
+
+@override_settings(EXPORT_CHUNK_SIZE=0)
+class TestExportSequenceLabelingToParquetInMemory(TestExportSequenceLabelingToParquet):
+    pass
@@ -1,10 +1,23 @@
 import os
 import unittest
+from unittest.mock import patch
 
 import pandas as pd
+from django.test import override_settings
 from pandas.testing import assert_frame_equal
 
-from ..pipeline.writers import CsvWriter, FastTextWriter, JsonlWriter, JsonWriter
+from ..pipeline import writers
+from ..pipeline.writers import (
+    SPANS,
+    STRING,
+    STRINGS,
+    CsvWriter,
+    FastTextWriter,
+    JsonlWriter,
+    JsonWriter,
+    ParquetWriter,
+)
+from api.json_codec import JSONCodec
 
 
 class TestWriter(unittest.TestCase):
@@ -57,3 +70,134 @@ class TestFastText(unittest.TestCase):
         writer.write(file, self.dataset)
         loaded_dataset = open(file, encoding="utf-8").read().strip()
         self.assertEqual(loaded_dataset, self.expected)
+
+
+class TestWriteChunks(unittest.TestCase):
+    def setUp(self):
+        self.dataset = pd.DataFrame(
+            [
+                {"id": 0, "text": "A"},
+                {"id": 1, "text": "B"},
+                {"id": 2, "text": "C"},
+            ]
+        )
+        self.chunks = [self.dataset.iloc[:2], self.dataset.iloc[2:]]
+        self.file = "tmp_chunks"
+
+    def tearDown(self):
+        os.remove(self.file)
+
+    def write_chunks(self, writer):
+        with open(self.file, "w", encoding="utf-8", newline="") as f:
+            writer.write_chunks(f, self.chunks)
+
+    def test_csv(self):
+        self.write_chunks(CsvWriter())
+        assert_frame_equal(self.dataset, pd.read_csv(self.file))
+
+    def test_json(self):
+        self.write_chunks(JsonWriter())
+        assert_frame_equal(self.dataset, pd.read_json(self.file))
+
+    def test_jsonl(self):
+        self.write_chunks(JsonlWriter())
+        assert_frame_equal(self.dataset, pd.read_json(self.file, lines=True))
+
+    def test_jsonl_chunks_are_separated_by_newlines(self):
+        self.chunks.append(self.dataset.iloc[:0])
+        self.write_chunks(JsonlWriter())
+        with open(self.file, encoding="utf-8") as f:
+            self.assertEqual(f.read(), '{"id":0,"text":"A"}\n{"id":1,"text":"B"}\n{"id":2,"text":"C"}\n')
+
+    def test_json_missing_values_are_null(self):
+        self.chunks = [pd.DataFrame([{"id": 0, "text": "テキスト", "source": "wiki"}, {"id": 1, "text": "B"}])]
+        for writer in [JsonWriter(), JsonlWriter()]:
+            with self.subTest(writer=writer):
+                self.write_chunks(writer)
+                with open(self.file, encoding="utf-8") as f:
+                    content = f.read()
+                self.assertIn('"text":"テキスト"', content)
+                self.assertIn('{"id":1,"text":"B","source":null}', content)
+
+    @override_settings(JSON_CODEC="json")
+    def test_json_is_encoded_with_codec(self):
+        with patch.object(JSONCodec, "dumps", return_value="{}") as dumps:
+            self.write_chunks(JsonWriter())
+        self.assertEqual(dumps.call_count, 3)
+        with open(self.file, encoding="utf-8") as f:
+            self.assertEqual(f.read(), "[{},{},{}]")
+
+    @unittest.skipUnless(writers.pyarrow, "pyarrow is not installed")
+    def test_parquet(self):
+        with open(self.file, "wb") as f:
+            ParquetWriter(columns={"text": STRING}).write_chunks(f, self.chunks)
+        assert_frame_equal(self.dataset, pd.read_parquet(self.file))
+
+
+class TestParquetWriterWithoutPyarrow(unittest.TestCase):
+    def test_error(self):
+        with patch.object(writers, "pyarrow", None):
+            with self.assertRaisesRegex(ValueError, r"doccano\[parquet\]"):
+                ParquetWriter()
+
+
+@unittest.skipUnless(writers.pyarrow, "pyarrow is not installed")
+class TestParquetWriter(unittest.TestCase):
+    def setUp(self):
+        span = {"id": 1, "label": "PER", "start_offset": 0, "end_offset": 5}
+        self.records = [
+            {"id": 0, "text": "Peter", "label": [span], "Comments": ["comment"], "source": None},
+            {"id": 1, "text": "Hello", "label": [], "Comments": [], "source": None},
+            {"id": 2, "text": "World", "label": [], "Comments": [], "source": "wiki"},
+        ]
+        self.chunks = [pd.DataFrame(self.records[i : i + 1]) for i in range(3)]
+        self.file = "tmp.parquet"
+
+    def tearDown(self):
+        os.remove(self.file)
+
+    def write_chunks(self, writer):
+        with open(self.file, "wb") as f:
+            writer.write_chunks(f, self.chunks)
+        return writers.pyarrow.parquet.ParquetFile(self.file)
+
+    def test_label_columns_are_nested(self):
+        writer = ParquetWriter(columns={"text": STRING, "label": SPANS, "Comments": STRINGS})
+        parquet_file = self.write_chunks(writer)
+        schema = parquet_file.schema_arrow
+        label_type = schema.field("label").type.value_type
+        self.assertEqual([field.name for field in label_type], ["id", "label", "start_offset", "end_offset"])
+        self.assertEqual(schema.field("id").type, writers.pyarrow.int64())
+        self.assertEqual(schema.field("Comments").type, writers.pyarrow.list_(writers.pyarrow.string()))
+        self.assertEqual(schema.field("source").type, writers.pyarrow.string())
+        expected = [{**record, "source": record["source"] and '"wiki"'} for record in self.records]
+        self.assertEqual(parquet_file.read().to_pylist(), expected)
+
+    def test_meta_values_of_different_types_are_written_as_json(self):
+        columns = ["id", "text", "source", "score", "valid"]
+        records = [
+            {"id": 1, "text": "a", "score": 1, "valid": True},
+            {"id": 2, "text": "b", "source": "wiki", "score": 1.5, "valid": {"by": "admin"}},
+        ]
+        # The first chunk has no value of `source`, which pandas fills with NaN.
+        self.chunks = [pd.DataFrame([record], columns=columns) for record in records]
+        parquet_file = self.write_chunks(ParquetWriter(columns={"text": STRING}))
+        expected = [
+            {"id": 1, "text": "a", "source": None, "score": "1", "valid": "true"},
+            {"id": 2, "text": "b", "source": '"wiki"', "score": "1.5", "valid": '{"by":"admin"}'},
+        ]
+        self.assertEqual(parquet_file.read().to_pylist(), expected)
+
+    def test_row_groups(self):
+        writer = ParquetWriter(
+            columns={"text": STRING, "label": SPANS, "Comments": STRINGS}, row_group_size=2, compression="snappy"
+        )
+        parquet_file = self.write_chunks(writer)
+        metadata = parquet_file.metadata
+        self.assertEqual([metadata.row_group(i).num_rows for i in range(metadata.num_row_groups)], [2, 1])
+        self.assertEqual(metadata.row_group(0).column(0).compression, "SNAPPY")
+
+    def test_no_chunks(self):
+        self.chunks = []
+        parquet_file = self.write_chunks(ParquetWriter())
+        self.assertEqual(parquet_file.metadata.num_rows, 0)
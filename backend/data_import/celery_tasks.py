@@ -8,7 +8,9 @@ from django.shortcuts import get_object_or_404
 from django_drf_filepond.api import store_upload
 from django_drf_filepond.models import TemporaryUpload
 
+from .checkpoints import Checkpoints
 from .datasets import load_dataset
+from .parallel import ParallelDataset
 from .pipeline.catalog import Format, create_file_format
 from .pipeline.exceptions import (
     FileImportException,
@@ -46,26 +48,48 @@ def check_uploaded_files(upload_ids: List[str], file_format: Format):
     return cleaned_ids, errors
 
 
-@shared_task(autoretry_for=(Exception,), retry_backoff=True, retry_jitter=True)
-def import_dataset(user_id, project_id, file_format: str, upload_ids: List[str], task: str, **kwargs):
+@shared_task(bind=True, autoretry_for=(Exception,), retry_backoff=True, retry_jitter=True)
+def import_dataset(self, user_id, project_id, file_format: str, upload_ids: List[str], task: str, **kwargs):
     project = get_object_or_404(Project, pk=project_id)
     user = get_object_or_404(get_user_model(), pk=user_id)
+    # A retried task has the same id, so it resumes from the checkpoints of the previous attempts.
+    checkpoints = Checkpoints(self.request.id) if self.request.id else None
+    finished = False
     try:
         fmt = create_file_format(file_format)
         upload_ids, errors = check_uploaded_files(upload_ids, fmt)
         temporary_uploads = TemporaryUpload.objects.filter(upload_id__in=upload_ids)
         filenames = [
-            FileName(full_path=tu.get_file_path(), generated_name=tu.file.name, upload_name=tu.upload_name)
+            FileName(
+                full_path=tu.get_file_path(),
+                generated_name=tu.file.name,
+                upload_name=tu.upload_name,
+                upload_id=tu.upload_id,
+            )
             for tu in temporary_uploads
         ]
 
         dataset = load_dataset(task, fmt, filenames, project, **kwargs)
-        dataset.save(user, batch_size=settings.IMPORT_BATCH_SIZE)
+        if settings.IMPORT_WORKERS > 1:
+            dataset = ParallelDataset(
+                dataset, workers=settings.IMPORT_WORKERS, segment_size=settings.IMPORT_SEGMENT_SIZE
+            )
+        dataset.save(user, batch_size=settings.IMPORT_BATCH_SIZE, checkpoints=checkpoints)
         upload_to_store(temporary_uploads)
+        finished = True
         errors.extend(dataset.errors)
         return {"error": [e.dict() for e in errors]}
     except FileImportException as e:
+        finished = True
         return {"error": [e.dict()]}
+    finally:
+        # The checkpoints are only kept for the next attempt, so they are deleted once no attempt follows.
+        if checkpoints and (finished or is_last_attempt(self)):
+            checkpoints.delete()
+
+
+def is_last_attempt(task) -> bool:
+    return task.max_retries is not None and task.request.retries >= task.max_retries
 
 
 def upload_to_store(temporary_uploads):
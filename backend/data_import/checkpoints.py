@@ -0,0 +1,20 @@
+from .models import ImportCheckpoint
+from .pipeline.readers import FileName
+
+
+class Checkpoints:
+    """The checkpoints of an import task, one for each uploaded file."""
+
+    def __init__(self, task_id: str):
+        self.task_id = task_id
+
+    def get(self, filename: FileName) -> ImportCheckpoint:
+        checkpoint, _ = ImportCheckpoint.objects.get_or_create(
+            task_id=self.task_id,
+            upload_id=filename.upload_id,
+            segment=filename.segment.index if filename.segment else 0,
+        )
+        return checkpoint
+
+    def delete(self):
+        ImportCheckpoint.objects.filter(task_id=self.task_id).delete()
@@ -1,9 +1,11 @@
 import abc
-from typing import List, Type
+from typing import Any, List, Optional, Tuple, Type
 
 from django.contrib.auth.models import User
+from django.db import transaction
 
-from .models import DummyLabelType
+from .checkpoints import Checkpoints
+from .models import DummyLabelType, ImportCheckpoint
 from .pipeline.catalog import RELATION_EXTRACTION, Format
 from .pipeline.data import BaseData, BinaryData, TextData
 from .pipeline.examples import Examples
@@ -18,7 +20,9 @@ from .pipeline.readers import (
     DEFAULT_TEXT_COLUMN,
     FileName,
     Reader,
+    Records,
 )
+from examples.models import Example
 from label_types.models import CategoryType, LabelType, RelationType, SpanType
 from projects.models import Project, ProjectType
 
@@ -29,7 +33,38 @@ class Dataset(abc.ABC):
         self.project = project
         self.kwargs = kwargs
 
-    def save(self, user: User, batch_size: int = 1000):
+    def save(self, user: User, batch_size: int = 1000, checkpoints: Optional[Checkpoints] = None):
+        if checkpoints is None:
+            for records in self.reader.batch(batch_size):
+                self.save_batch(user, self.make(records))
+            return
+        filenames = self.reader.filenames
+        try:
+            for filename in filenames:
+                self.reader.filenames = [filename]
+                self.save_file(user, batch_size, checkpoints.get(filename))
+        finally:
+            self.reader.filenames = filenames
+
+    def save_file(self, user: User, batch_size: int, checkpoint: ImportCheckpoint):
+        """Save the file of the reader, resuming from the checkpoint.
+        Each batch is saved in the same transaction as the checkpoint.
+        """
+        if checkpoint.completed:
+            return
+        for records in self.reader.batch(batch_size, skip=checkpoint.records):
+            batch = self.make(records)
+            with transaction.atomic():
+                self.save_batch(user, batch)
+                checkpoint.advance(len(records))
+        checkpoint.complete()
+
+    def make(self, records: Records) -> Any:
+        """Make the examples and labels of a batch without touching the database."""
+        raise NotImplementedError()
+
+    def save_batch(self, user: User, batch: Any):
+        """Save the batch returned by `make` to the database."""
         raise NotImplementedError()
 
     @property
@@ -42,10 +77,12 @@ class PlainDataset(Dataset):
         super().__init__(reader, project, **kwargs)
         self.example_maker = ExampleMaker(project=project, data_class=TextData)
 
-    def save(self, user: User, batch_size: int = 1000):
-        for records in self.reader.batch(batch_size):
-            examples = Examples(self.example_maker.make(records))
-            examples.save()
+    def make(self, records: Records) -> List[Example]:
+        return self.example_maker.make(records)
+
+    def save_batch(self, user: User, batch: List[Example]):
+        examples = Examples(batch)
+        examples.save()
 
     @property
     def errors(self) -> List[FileParseException]:
@@ -71,19 +108,23 @@ class DatasetWithSingleLabelType(Dataset):
             column=kwargs.get("column_label") or DEFAULT_LABEL_COLUMN, label_class=self.label_class
         )
 
-    def save(self, user: User, batch_size: int = 1000):
-        for records in self.reader.batch(batch_size):
-            # create examples
-            examples = Examples(self.example_maker.make(records))
-            examples.save()
+    def make(self, records: Records) -> Tuple[List[Example], List[Label]]:
+        examples = self.example_maker.make(records)
+        labels = self.labels_class(self.label_maker.make(records), self.types)
+        labels.clean(self.project)
+        return examples, labels.labels
 
-            # create label types
-            labels = self.labels_class(self.label_maker.make(records), self.types)
-            labels.clean(self.project)
-            labels.save_types(self.project)
+    def save_batch(self, user: User, batch: Tuple[List[Example], List[Label]]):
+        # create examples
+        examples = Examples(batch[0])
+        examples.save()
 
-            # create Labels
-            labels.save(user, examples)
+        # create label types
+        labels = self.labels_class(batch[1], self.types)
+        labels.save_types(self.project)
+
+        # create Labels
+        labels.save(user, examples)
 
     @property
     def errors(self) -> List[FileParseException]:
@@ -95,10 +136,12 @@ class BinaryDataset(Dataset):
         super().__init__(reader, project, **kwargs)
         self.example_maker = BinaryExampleMaker(project=project, data_class=BinaryData)
 
-    def save(self, user: User, batch_size: int = 1000):
-        for records in self.reader.batch(batch_size):
-            examples = Examples(self.example_maker.make(records))
-            examples.save()
+    def make(self, records: Records) -> List[Example]:
+        return self.example_maker.make(records)
+
+    def save_batch(self, user: User, batch: List[Example]):
+        examples = Examples(batch)
+        examples.save()
 
     @property
     def errors(self) -> List[FileParseException]:
@@ -140,24 +183,29 @@ class RelationExtractionDataset(Dataset):
         self.span_maker = LabelMaker(column="entities", label_class=SpanLabel)
         self.relation_maker = LabelMaker(column="relations", label_class=RelationLabel)
 
-    def save(self, user: User, batch_size: int = 1000):
-        for records in self.reader.batch(batch_size):
-            # create examples
-            examples = Examples(self.example_maker.make(records))
-            examples.save()
+    def make(self, records: Records) -> Tuple[List[Example], List[Label], List[Label]]:
+        examples = self.example_maker.make(records)
+        spans = Spans(self.span_maker.make(records), self.span_types)
+        spans.clean(self.project)
+        relations = Relations(self.relation_maker.make(records), self.relation_types)
+        relations.clean(self.project)
+        return examples, spans.labels, relations.labels
 
-            # create label types
-            spans = Spans(self.span_maker.make(records), self.span_types)
-            spans.clean(self.project)
-            spans.save_types(self.project)
+    def save_batch(self, user: User, batch: Tuple[List[Example], List[Label], List[Label]]):
+        # create examples
+        examples = Examples(batch[0])
+        examples.save()
 
-            relations = Relations(self.relation_maker.make(records), self.relation_types)
-            relations.clean(self.project)
-            relations.save_types(self.project)
+        # create label types
+        spans = Spans(batch[1], self.span_types)
+        spans.save_types(self.project)
 
-            # create Labels
-            spans.save(user, examples)
-            relations.save(user, examples, spans=spans)
+        relations = Relations(batch[2], self.relation_types)
+        relations.save_types(self.project)
+
+        # create Labels
+        spans.save(user, examples)
+        relations.save(user, examples, spans=spans)
 
     @property
     def errors(self) -> List[FileParseException]:
@@ -178,24 +226,29 @@ class CategoryAndSpanDataset(Dataset):
         self.category_maker = LabelMaker(column="cats", label_class=CategoryLabel)
         self.span_maker = LabelMaker(column="entities", label_class=SpanLabel)
 
-    def save(self, user: User, batch_size: int = 1000):
-        for records in self.reader.batch(batch_size):
-            # create examples
-            examples = Examples(self.example_maker.make(records))
-            examples.save()
-
-            # create label types
-            categories = Categories(self.category_maker.make(records), self.category_types)
-            categories.clean(self.project)
-            categories.save_types(self.project)
-
-            spans = Spans(self.span_maker.make(records), self.span_types)
-            spans.clean(self.project)
-            spans.save_types(self.project)
-
-            # create Labels
-            categories.save(user, examples)
-            spans.save(user, examples)
+    def make(self, records: Records) -> Tuple[List[Example], List[Label], List[Label]]:
+        examples = self.example_maker.make(records)
+        categories = Categories(self.category_maker.make(records), self.category_types)
+        categories.clean(self.project)
+        spans = Spans(self.span_maker.make(records), self.span_types)
+        spans.clean(self.project)
+        return examples, categories.labels, spans.labels
+
+    def save_batch(self, user: User, batch: Tuple[List[Example], List[Label], List[Label]]):
+        # create examples
+        examples = Examples(batch[0])
+        examples.save()
+
+        # create label types
+        categories = Categories(batch[1], self.category_types)
+        categories.save_types(self.project)
+
+        spans = Spans(batch[2], self.span_types)
+        spans.save_types(self.project)
+
+        # create Labels
+        categories.save(user, examples)
+        spans.save(user, examples)
 
     @property
     def errors(self) -> List[FileParseException]:
@@ -0,0 +1,625 @@
+import contextlib
+import csv
+import datetime
+import json
+import os
+import platform
+import random
+import resource
+import shutil
+import tempfile
+import time
+import tracemalloc
+import uuid
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+from unittest.mock import patch
+
+import openpyxl
+import pandas as pd
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from seqeval.scheme import IOB2, Tokens
+
+from api.json_codec import CODECS
+from data_export.pipeline.writers import encode_records
+from data_import.datasets import load_dataset
+from data_import.pipeline.catalog import (
+    CSV,
+    JSON,
+    JSONL,
+    RELATION_EXTRACTION,
+    Arrow,
+    AudioFile,
+    CoNLL,
+    Excel,
+    FastText,
+    ImageFile,
+    Options,
+    Parquet,
+    TextFile,
+    TextLine,
+    create_file_format,
+)
+from data_import.pipeline.examples import Examples
+from data_import.pipeline.labels import Labels
+from data_import.pipeline.makers import BinaryExampleMaker, ExampleMaker, LabelMaker
+from data_import.pipeline.readers import (
+    DEFAULT_LABEL_COLUMN,
+    DEFAULT_TEXT_COLUMN,
+    FILE_NAME_COLUMN,
+    LINE_NUMBER_COLUMN,
+    UPLOAD_NAME_COLUMN,
+    UUID_COLUMN,
+    FileName,
+    Reader,
+    Records,
+    is_missing,
+)
+from data_import.pipeline.tagging import TagDecoder, align_spans
+from projects.models import (
+    BoundingBoxProject,
+    ImageCaptioningProject,
+    ImageClassificationProject,
+    IntentDetectionAndSlotFillingProject,
+    Project,
+    ProjectType,
+    SegmentationProject,
+    Seq2seqProject,
+    SequenceLabelingProject,
+    Speech2textProject,
+    TextClassificationProject,
+)
+
+try:
+    import pyarrow
+    import pyarrow.ipc
+    import pyarrow.parquet
+except ImportError:  # pragma: no cover
+    pyarrow = None  # type: ignore
+
+Record = Dict[str, Any]
+
+STAGES = ["parse", "make examples", "make labels", "save examples", "save types", "save labels"]
+OTHER = "other"
+# The whole import, and the steps measured alone without a database.
+IMPORT = "import"
+BATCHES = "batches"
+CONLL = "conll"
+JSON_CODEC = "json"
+MODES = [IMPORT, BATCHES, CONLL, JSON_CODEC]
+
+PROJECT_MODELS = {
+    ProjectType.DOCUMENT_CLASSIFICATION: TextClassificationProject,
+    ProjectType.SEQUENCE_LABELING: SequenceLabelingProject,
+    RELATION_EXTRACTION: SequenceLabelingProject,
+    ProjectType.SEQ2SEQ: Seq2seqProject,
+    ProjectType.INTENT_DETECTION_AND_SLOT_FILLING: IntentDetectionAndSlotFillingProject,
+    ProjectType.IMAGE_CLASSIFICATION: ImageClassificationProject,
+    ProjectType.IMAGE_CAPTIONING: ImageCaptioningProject,
+    ProjectType.BOUNDING_BOX: BoundingBoxProject,
+    ProjectType.SEGMENTATION: SegmentationProject,
+    ProjectType.SPEECH2TEXT: Speech2textProject,
+}
+
+WORDS = ["the", "committee", "rejected", "a", "call", "to", "boycott", "lamb", "from", "on", "Monday"]
+ENTITY_TYPES = ["PER", "ORG", "LOC", "MISC"]
+ENTITY_WORDS = {"PER": ["Peter", "Blackburn"], "ORG": ["EU", "Commission"], "LOC": ["Brussels"], "MISC": ["German"]}
+CATEGORIES = [f"category{i}" for i in range(10)]
+RELATION_TYPES = ["worksFor", "locatedIn"]
+# The smallest valid files, as the binary formats are only checked by their MIME type.
+PNG = bytes.fromhex(
+    "89504e470d0a1a0a0000000d4948445200000001000000010806000000"
+    "1f15c4890000000d49444154789c6360000002000185d6ad6f0000000049454e44ae426082"
+)
+WAV = (
+    b"RIFF$\x00\x00\x00WAVEfmt \x10\x00\x00\x00\x01\x00\x01\x00@\x1f\x00\x00"
+    b"\x80>\x00\x00\x02\x00\x10\x00data\x00\x00\x00\x00"
+)
+
+
+def generate_sentence(rng: random.Random, length: int) -> Tuple[List[str], List[str]]:
+    """Generates the words of a sentence and their IOB2 tags, with an entity about every five words."""
+    words: List[str] = []
+    tags: List[str] = []
+    while len(words) < length:
+        words.append(rng.choice(WORDS))
+        tags.append("O")
+        if rng.random() < 0.2:
+            type_ = rng.choice(ENTITY_TYPES)
+            for i, word in enumerate(ENTITY_WORDS[type_]):
+                words.append(word)
+                tags.append(("I-" if i else "B-") + type_)
+    return words, tags
+
+
+def tags_to_spans(words: List[str], tags: List[str]) -> List[Record]:
+    spans: List[Record] = []
+    offset = 0
+    for word, tag in zip(words, tags):
+        if tag.startswith("B-"):
+            spans.append({"start_offset": offset, "end_offset": offset + len(word), "label": tag[2:]})
+        elif tag.startswith("I-"):
+            spans[-1]["end_offset"] = offset + len(word)
+        offset += len(word) + 1
+    return spans
+
+
+def generate_records(task: str, size: int, length: int = 20, seed: int = 0) -> List[Record]:
+    """Generates the records of a task with the columns of its example file in the catalog."""
+    rng = random.Random(seed)
+    records = []
+    for i in range(size):
+        words, tags = generate_sentence(rng, length)
+        text = " ".join(words)
+        spans = tags_to_spans(words, tags)
+        categories = rng.sample(CATEGORIES, rng.randint(1, 2))
+        record: Record = {"text": text, "words": words, "tags": tags, "wikiPageID": i}
+        if task == ProjectType.DOCUMENT_CLASSIFICATION:
+            record["label"] = categories
+        elif task == ProjectType.SEQUENCE_LABELING:
+            record["label"] = spans
+        elif task == ProjectType.SEQ2SEQ:
+            record["label"] = [f"Summary of example {i}."]
+        elif task == ProjectType.INTENT_DETECTION_AND_SLOT_FILLING:
+            record["cats"] = categories[:1]
+            record["entities"] = spans
+        elif task == RELATION_EXTRACTION:
+            record["entities"] = [{"id": j, **span} for j, span in enumerate(spans)]
+            record["relations"] = [
+                {"id": j, "from_id": j, "to_id": j + 1, "type": rng.choice(RELATION_TYPES)}
+                for j in range(len(spans) - 1)
+            ]
+        records.append(record)
+    return records
+
+
+def select_columns(records: List[Record], columns: Tuple[str, ...] = ("words", "tags")) -> List[Record]:
+    """Leaves out the columns that are only used to write the CoNLL format."""
+    return [{key: value for key, value in record.items() if key not in columns} for record in records]
+
+
+def first_label(record: Record) -> str:
+    label = record.get("label") or [""]
+    return label[0]
+
+
+def write_dataset(records: List[Record], file_format: str, directory: str) -> List[FileName]:
+    """Writes the records to the files of the format, and returns the names the reader expects."""
+    extension = "xlsx" if file_format == Excel.name else file_format.lower()
+    path = os.path.join(directory, f"dataset.{extension}")
+    paths = [path]
+    if file_format == JSONL.name:
+        with open(path, "w", encoding="utf-8") as f:
+            for record in select_columns(records):
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+    elif file_format == JSON.name:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(select_columns(records), f, ensure_ascii=False)
+    elif file_format == CSV.name:
+        with open(path, "w", encoding="utf-8", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["text", "label", "wikiPageID"])
+            writer.writerows([record["text"], first_label(record), record["wikiPageID"]] for record in records)
+    elif file_format == Excel.name:
+        workbook = openpyxl.Workbook(write_only=True)
+        sheet = workbook.create_sheet()
+        sheet.append(["text", "label", "wikiPageID"])
+        for record in records:
+            sheet.append([record["text"], first_label(record), record["wikiPageID"]])
+        workbook.save(path)
+    elif file_format == FastText.name:
+        with open(path, "w", encoding="utf-8") as f:
+            for record in records:
+                labels = " ".join(f"__label__{label}" for label in record["label"])
+                f.write(f"{labels} {record['text']}\n")
+    elif file_format == TextLine.name:
+        with open(path, "w", encoding="utf-8") as f:
+            f.writelines(record["text"] + "\n" for record in records)
+    elif file_format == TextFile.name:
+        paths = [os.path.join(directory, f"dataset{i}.txt") for i in range(len(records))]
+        for record, filename in zip(records, paths):
+            with open(filename, "w", encoding="utf-8") as f:
+                f.write(record["text"])
+    elif file_format == CoNLL.name:
+        with open(path, "w", encoding="utf-8") as f:
+            for record in records:
+                f.writelines(f"{word}\t{tag}\n" for word, tag in zip(record["words"], record["tags"]))
+                f.write("\n")
+    elif file_format == Parquet.name:
+        table = pyarrow.Table.from_pylist(select_columns(records))
+        pyarrow.parquet.write_table(table, path)
+    elif file_format == Arrow.name:
+        table = pyarrow.Table.from_pylist(select_columns(records))
+        with pyarrow.ipc.new_file(path, table.schema) as ipc_writer:
+            ipc_writer.write(table)
+    elif file_format in (ImageFile.name, AudioFile.name):
+        # Each record is a file, but the binary files aren't read while importing them.
+        path = os.path.join(directory, "dataset.png" if file_format == ImageFile.name else "dataset.wav")
+        with open(path, "wb") as f:
+            f.write(PNG if file_format == ImageFile.name else WAV)
+        name = os.path.basename(path)
+        return [FileName(full_path=path, generated_name=f"{i}-{name}", upload_name=name) for i in range(len(records))]
+    else:
+        raise CommandError(f"Unknown file format: {file_format}")
+    return [
+        FileName(full_path=path, generated_name=os.path.basename(path), upload_name=os.path.basename(path))
+        for path in paths
+    ]
+
+
+def list_cases(tasks: Optional[List[str]] = None, formats: Optional[List[str]] = None) -> List[Tuple[str, str]]:
+    """Returns the pairs of a task and a format registered in the catalog."""
+    cases = []
+    for task, options in Options.options.items():
+        for file_format in dict.fromkeys(option.file_format.name for option in options):
+            if (not tasks or task in tasks) and (not formats or file_format in formats):
+                cases.append((task, file_format))
+    return cases
+
+
+def reset_peak_rss():
+    """Resets the peak resident set size of the process. It's only supported on Linux."""
+    with contextlib.suppress(OSError):
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+
+
+def get_peak_rss() -> int:
+    """Returns the peak resident set size of the process in bytes."""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    # ru_maxrss isn't reset, so it's the peak since the process started.
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+class StageProfiler:
+    """Measures the time and the number of queries of each stage of the import.
+
+    The methods of the pipeline are wrapped while it's profiled. The time and the queries
+    are charged to the innermost stage, so the stages don't overlap.
+    """
+
+    def __init__(self):
+        self.seconds: Dict[str, float] = {stage: 0.0 for stage in [*STAGES, OTHER]}
+        self.queries: Dict[str, int] = {stage: 0 for stage in [*STAGES, OTHER]}
+        self.stack = [OTHER]
+        self.started = time.perf_counter()
+
+    def switch(self, stage: Optional[str] = None):
+        now = time.perf_counter()
+        self.seconds[self.stack[-1]] += now - self.started
+        self.started = now
+        if stage is None:
+            self.stack.pop()
+        else:
+            self.stack.append(stage)
+
+    def wrap(self, stage: str, method: Callable) -> Callable:
+        def wrapper(*args, **kwargs):
+            self.switch(stage)
+            try:
+                return method(*args, **kwargs)
+            finally:
+                self.switch()
+
+        return wrapper
+
+    def wrap_generator(self, stage: str, method: Callable[..., Iterator]) -> Callable[..., Iterator]:
+        def wrapper(*args, **kwargs):
+            iterator = iter(method(*args, **kwargs))
+            while True:
+                self.switch(stage)
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    return
+                finally:
+                    self.switch()
+                yield item
+
+        return wrapper
+
+    def __call__(self, execute, sql, params, many, context):
+        self.queries[self.stack[-1]] += 1
+        return execute(sql, params, many, context)
+
+    @contextlib.contextmanager
+    def profile(self):
+        targets = [
+            (Reader, "batch", "parse", self.wrap_generator),
+            (ExampleMaker, "make", "make examples", self.wrap),
+            (BinaryExampleMaker, "make", "make examples", self.wrap),
+            (LabelMaker, "make", "make labels", self.wrap),
+            (Examples, "save", "save examples", self.wrap),
+        ]
+        # The subclasses of Labels override some of the methods.
+        for cls in [Labels, *Labels.__subclasses__()]:
+            for name, stage in [("clean", "make labels"), ("save_types", "save types"), ("save", "save labels")]:
+                if name in vars(cls):
+                    targets.append((cls, name, stage, self.wrap))
+        with contextlib.ExitStack() as stack:
+            for cls, name, stage, wrap in targets:
+                stack.enter_context(patch.object(cls, name, wrap(stage, vars(cls)[name])))
+            stack.enter_context(connection.execute_wrapper(self))
+            self.started = time.perf_counter()
+            yield self
+            self.switch()
+
+    def dict(self) -> Dict[str, Dict[str, Any]]:
+        return {
+            stage: {"seconds": round(self.seconds[stage], 6), "queries": self.queries[stage]}
+            for stage in [*STAGES, OTHER]
+        }
+
+
+def create_project(task: str, user: User) -> Project:
+    kwargs = {"use_relation": True} if task == RELATION_EXTRACTION else {}
+    project_type = ProjectType.SEQUENCE_LABELING if task == RELATION_EXTRACTION else task
+    return PROJECT_MODELS[task].objects.create(
+        name=f"benchmark {task}", project_type=project_type, created_by=user, **kwargs
+    )
+
+
+def run_case(task: str, file_format: str, size: int, batch_size: int, user: User, directory: str) -> Dict[str, Any]:
+    """Imports a synthetic dataset of the task and the format, and returns the measurements."""
+    records = generate_records(task, size)
+    filenames = write_dataset(records, file_format, directory)
+    del records
+    project = create_project(task, user)
+    try:
+        reset_peak_rss()
+        dataset = load_dataset(task, create_file_format(file_format), filenames, project)
+        profiler = StageProfiler()
+        with profiler.profile():
+            start = time.perf_counter()
+            dataset.save(user, batch_size=batch_size)
+            seconds = time.perf_counter() - start
+        peak_rss = get_peak_rss()
+        examples = project.examples.count()
+    finally:
+        project.delete()
+    return {
+        "task": task,
+        "format": file_format,
+        "records": examples,
+        "errors": len(dataset.errors),
+        "seconds": round(seconds, 6),
+        "records_per_second": round(examples / seconds, 1) if seconds else None,
+        "peak_rss_bytes": peak_rss,
+        "queries": sum(profiler.queries.values()),
+        "stages": profiler.dict(),
+    }
+
+
+def measure(func: Callable[[], Any], repeat: int = 1) -> Tuple[float, int]:
+    """Returns the seconds to call the function `repeat` times and the peak memory allocated by a call."""
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return time.perf_counter() - start, peak
+
+
+def step_result(name: str, records: int, seconds: float, peak: int, size: Optional[int] = None) -> Dict[str, Any]:
+    result = {
+        "name": name,
+        "records": records,
+        "seconds": round(seconds, 6),
+        "records_per_second": round(records / seconds, 1) if seconds else None,
+        "peak_allocation_bytes": peak,
+    }
+    if size is not None:
+        result["megabytes_per_second"] = round(size / seconds / 1e6, 1) if seconds else None
+    return result
+
+
+def to_reader_rows(records: List[Record]) -> List[Record]:
+    """Converts the records into the rows the readers pass to the makers, with the spans as lists."""
+    return [
+        {
+            UUID_COLUMN: uuid.uuid4(),
+            FILE_NAME_COLUMN: "dataset.jsonl",
+            UPLOAD_NAME_COLUMN: "dataset.jsonl",
+            LINE_NUMBER_COLUMN: i + 1,
+            DEFAULT_TEXT_COLUMN: record["text"],
+            DEFAULT_LABEL_COLUMN: [
+                [span["start_offset"], span["end_offset"], span["label"]] for span in record["label"]
+            ],
+            "wikiPageID": record["wikiPageID"],
+        }
+        for i, record in enumerate(records)
+    ]
+
+
+def consume_data_frame(rows: List[Record]) -> int:
+    """The previous implementation: dict -> DataFrame -> dict for the examples and the labels."""
+    df = pd.DataFrame(rows)
+    df_with_data_column = df.loc[:, ~df.columns.isin([DEFAULT_LABEL_COLUMN])]
+    df_with_data_column = df_with_data_column.dropna(subset=[DEFAULT_TEXT_COLUMN])
+    count = len(df_with_data_column.to_dict(orient="records"))
+    df_label = df.explode(DEFAULT_LABEL_COLUMN)
+    df_label = df_label[[UUID_COLUMN, DEFAULT_LABEL_COLUMN]]
+    df_label.dropna(subset=[DEFAULT_LABEL_COLUMN], inplace=True)
+    return count + len(df_label.to_dict(orient="records"))
+
+
+def consume_records(rows: List[Record]) -> int:
+    records = Records.from_rows(rows)
+    count = sum(1 for row in records.rows([DEFAULT_LABEL_COLUMN]) if not is_missing(row[DEFAULT_TEXT_COLUMN]))
+    for value in records[DEFAULT_LABEL_COLUMN]:
+        count += sum(1 for obj in value if not is_missing(obj))
+    return count
+
+
+def run_batches(size: int, batch_size: int) -> List[Dict[str, Any]]:
+    """Measures the conversion of the parsed rows into batches, repeating a batch to make up the size."""
+    rows = to_reader_rows(generate_records(ProjectType.SEQUENCE_LABELING, batch_size))
+    repeat = max(size // batch_size, 1)
+    results = []
+    for name, consume in [("DataFrame", consume_data_frame), ("Records", consume_records)]:
+        seconds, peak = measure(lambda: consume(rows), repeat)
+        results.append(step_result(name, repeat * batch_size, seconds, peak))
+    return results
+
+
+def align_with_seqeval(sentences: List[Tuple[List[str], List[str]]], delimiter: str = " ") -> int:
+    """The previous implementation: seqeval tokens and a join of the words before each entity."""
+    count = 0
+    for words, tags in sentences:
+        for entity in Tokens(tags, IOB2).entities:
+            text = delimiter.join(words[: entity.start])
+            start = len(text) + len(delimiter) if text else len(text)
+            end = start + len(delimiter.join(words[entity.start : entity.end]))
+            count += end > start
+    return count
+
+
+def align_with_decoder(sentences: List[Tuple[List[str], List[str]]], delimiter: str = " ") -> int:
+    decoder = TagDecoder("IOB2")
+    batch = decoder.decode_batch([tags for _, tags in sentences])
+    count = 0
+    for (words, _), entities in zip(sentences, batch):
+        count += sum(end > start for start, end, _ in align_spans(words, entities, delimiter))
+    return count
+
+
+def run_conll(size: int) -> List[Dict[str, Any]]:
+    """Measures the decoding of the tags of CoNLL sentences and the alignment of the entities to the text."""
+    records = generate_records(ProjectType.SEQUENCE_LABELING, size)
+    sentences = [(record["words"], record["tags"]) for record in records]
+    results = []
+    for name, align in [("seqeval", align_with_seqeval), ("TagDecoder", align_with_decoder)]:
+        seconds, peak = measure(lambda: align(sentences))
+        results.append(step_result(name, len(sentences), seconds, peak))
+    return results
+
+
+def run_json(size: int) -> List[Dict[str, Any]]:
+    """Measures the JSON codecs decoding and encoding NER records as JSONL, and the export of a data frame."""
+    rows = select_columns(generate_records(ProjectType.SEQUENCE_LABELING, size))
+    lines = [CODECS["json"].dumps(row) for row in rows]
+    nbytes = sum(len(line.encode()) + 1 for line in lines)
+    results = []
+    for name, codec in CODECS.items():
+        if not codec.is_available():
+            continue
+        seconds, peak = measure(lambda: [codec.loads(line) for line in lines])
+        results.append(step_result(f"{name} decode", len(rows), seconds, peak, nbytes))
+        seconds, peak = measure(lambda: [codec.dumps(row) for row in rows])
+        results.append(step_result(f"{name} encode", len(rows), seconds, peak, nbytes))
+    # The export writers get a data frame, whose rows are converted to be encoded with the codec.
+    df = pd.DataFrame(rows)
+    seconds, peak = measure(lambda: list(encode_records(df)))
+    results.append(step_result("data frame encode", len(rows), seconds, peak, nbytes))
+    seconds, peak = measure(lambda: df.to_json(orient="records", force_ascii=False, lines=True))
+    results.append(step_result("pandas to_json encode", len(rows), seconds, peak, nbytes))
+    return results
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure the throughput, the peak memory and the queries of each stage to import "
+        "synthetic datasets of every task and format into the configured database. "
+        "The other modes measure a step of the import alone: the conversion of the parsed rows into batches, "
+        "the alignment of CoNLL tags, and the JSON codecs"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--mode", choices=MODES, default=IMPORT, help="What to measure. The import by default.")
+        parser.add_argument("--size", type=int, default=10_000, help="The number of records in a dataset.")
+        parser.add_argument(
+            "--batch_size", type=int, default=settings.IMPORT_BATCH_SIZE, help="The number of records in a batch."
+        )
+        parser.add_argument("--tasks", nargs="+", help="The tasks to import. All the tasks by default.")
+        parser.add_argument("--formats", nargs="+", help="The formats to import. All the formats by default.")
+        parser.add_argument("--output", help="The JSON file to store the results in.")
+        parser.add_argument(
+            "--no_test_database",
+            action="store_true",
+            help="Import into the configured database instead of a test database. The projects are deleted afterwards.",
+        )
+
+    def handle(self, *args, **options):
+        if options["mode"] == IMPORT:
+            results = self.run_import(options)
+        else:
+            results = self.run_step(options)
+        summary = {
+            "mode": options["mode"],
+            "database": connection.vendor,
+            "size": options["size"],
+            "batch_size": options["batch_size"],
+            "python": platform.python_version(),
+            "created_at": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            "results": results,
+        }
+        if options["output"]:
+            with open(options["output"], "w") as f:
+                json.dump(summary, f, indent=2)
+
+    def run_step(self, options: Dict[str, Any]) -> List[Dict[str, Any]]:
+        mode = options["mode"]
+        self.stdout.write(f"{mode}, {options['size']} records")
+        if mode == BATCHES:
+            results = run_batches(options["size"], options["batch_size"])
+        elif mode == CONLL:
+            results = run_conll(options["size"])
+        else:
+            results = run_json(options["size"])
+        for result in results:
+            throughput = f"{result['records_per_second'] or 0:10.1f} records/s"
+            if "megabytes_per_second" in result:
+                throughput += f", {result['megabytes_per_second'] or 0:8.1f} MB/s"
+            self.stdout.write(
+                f"{result['name']:>36}: {throughput}, "
+                f"peak allocation {result['peak_allocation_bytes'] / 1024 / 1024:8.1f} MiB"
+            )
+        return results
+
+    def run_import(self, options: Dict[str, Any]) -> List[Dict[str, Any]]:
+        cases = list_cases(options["tasks"], options["formats"])
+        if not cases:
+            raise CommandError("No format is registered for the tasks.")
+        directory = tempfile.mkdtemp()
+        old_name = None
+        if not options["no_test_database"]:
+            if connection.vendor == "sqlite":
+                # The default test database of SQLite is in memory, which hides the cost of writing to the disk.
+                connection.settings_dict["TEST"]["NAME"] = os.path.join(directory, "benchmark.sqlite3")
+            old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            return self.run_cases(cases, options, directory)
+        finally:
+            if old_name is not None:
+                connection.creation.destroy_test_db(old_name, verbosity=0)
+            shutil.rmtree(directory, ignore_errors=True)
+
+    def run_cases(self, cases: List[Tuple[str, str]], options: Dict[str, Any], directory: str) -> List[Dict[str, Any]]:
+        user, created = User.objects.get_or_create(username="benchmark")
+        self.stdout.write(f"{connection.vendor}, {options['size']} records, batch size {options['batch_size']}")
+        results = []
+        try:
+            for task, file_format in cases:
+                case_directory = tempfile.mkdtemp(dir=directory)
+                result = run_case(task, file_format, options["size"], options["batch_size"], user, case_directory)
+                shutil.rmtree(case_directory)
+                results.append(result)
+                queries = ", ".join(f"{stage} {value['queries']}" for stage, value in result["stages"].items())
+                self.stdout.write(
+                    f"{task:>36} {file_format:>9}: {result['records_per_second'] or 0:10.1f} records/s, "
+                    f"peak RSS {result['peak_rss_bytes'] / 1024 / 1024:8.1f} MiB, queries: {queries}"
+                )
+        finally:
+            if created:
+                user.delete()
+        return results
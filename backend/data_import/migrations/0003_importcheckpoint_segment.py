@@ -0,0 +1,26 @@
+# Generated by Django 4.1.13 on 2026-10-18 18:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("data_import", "0002_importcheckpoint"),
+    ]
+
+    operations = [
+        migrations.AlterUniqueTogether(
+            name="importcheckpoint",
+            unique_together=set(),
+        ),
+        migrations.AddField(
+            model_name="importcheckpoint",
+            name="segment",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AlterUniqueTogether(
+            name="importcheckpoint",
+            unique_together={("task_id", "upload_id", "segment")},
+        ),
+    ]
@@ -1,5 +1,8 @@
 from unittest.mock import MagicMock
 
+from django.db import models
+from django.db.models import F
+
 from label_types.models import CategoryType
 
 
@@ -8,3 +11,31 @@ class DummyLabelType(CategoryType):
 
     class Meta:
         proxy = True
+
+
+class ImportCheckpoint(models.Model):
+    """The progress of an import task on an uploaded file, or on a segment of the file.
+
+    The checkpoint is advanced in the same transaction as the batch it counts,
+    so a retried task can skip the records that have already been saved.
+    """
+
+    task_id = models.CharField(max_length=255)
+    upload_id = models.CharField(max_length=22)
+    segment = models.PositiveIntegerField(default=0)
+    records = models.PositiveIntegerField(default=0)
+    batches = models.PositiveIntegerField(default=0)
+    completed = models.BooleanField(default=False)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = (("task_id", "upload_id", "segment"),)
+
+    def advance(self, records: int):
+        ImportCheckpoint.objects.filter(pk=self.pk).update(records=F("records") + records, batches=F("batches") + 1)
+        self.records += records
+        self.batches += 1
+
+    def complete(self):
+        self.completed = True
+        self.save(update_fields=["completed", "updated_at"])
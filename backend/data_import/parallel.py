@@ -0,0 +1,165 @@
+"""
+Import the uploaded files with a pool of worker processes.
+
+Each file is parsed and validated by a worker process, which sends the batches made by
+`Dataset.make` back through a bounded queue. The calling process saves the batches in
+the order of the files, one transaction per batch.
+"""
+import dataclasses
+import multiprocessing
+import queue
+from typing import Any, List, Optional, Tuple
+
+from django.contrib.auth.models import User
+from django.db import connections, transaction
+
+from .checkpoints import Checkpoints
+from .datasets import Dataset
+from .models import ImportCheckpoint
+from .pipeline.exceptions import FileParseException
+from .pipeline.readers import FileName
+
+BATCH = "batch"
+ERRORS = "errors"
+FAILURE = "failure"
+
+
+def make_batches(dataset: Dataset, filename: FileName, batch_size: int, skip: int, batches: multiprocessing.Queue):
+    """Parse and validate a file in the worker process, and put the batches into the queue."""
+    try:
+        dataset.reader.filenames = [filename]
+        for records in dataset.reader.batch(batch_size, skip=skip):
+            batches.put((BATCH, (len(records), dataset.make(records))))
+        # The exceptions can't be pickled, so send their arguments instead.
+        errors = [(error.filename, error.line_num, error.message) for error in dataset.errors]
+        batches.put((ERRORS, errors))
+    except Exception as e:
+        batches.put((FAILURE, repr(e)))
+
+
+def close_connections():
+    """Close the database connections, so that a forked worker doesn't share them with this process.
+    Both processes open a new connection when they need one. A connection in a transaction is kept open,
+    as closing it would roll the transaction back.
+    """
+    for connection in connections.all(initialized_only=True):
+        if not connection.in_atomic_block:
+            connection.close()
+
+
+class Worker:
+    def __init__(
+        self,
+        context,
+        dataset: Dataset,
+        filename: FileName,
+        batch_size: int,
+        max_queued_batches: int,
+        checkpoint: Optional[ImportCheckpoint] = None,
+    ):
+        self.filename = filename
+        self.checkpoint = checkpoint
+        self.batches = context.Queue(maxsize=max_queued_batches)
+        skip = checkpoint.records if checkpoint else 0
+        self.process = context.Process(
+            target=make_batches, args=(dataset, filename, batch_size, skip, self.batches), daemon=True
+        )
+        self.process.start()
+
+    def receive(self, timeout: float = 1) -> Tuple[str, Any]:
+        while True:
+            try:
+                return self.batches.get(timeout=timeout)
+            except queue.Empty:
+                if self.process.is_alive():
+                    continue
+            # The process may have exited right after putting the last message.
+            try:
+                return self.batches.get(timeout=timeout)
+            except queue.Empty:
+                return FAILURE, f"The worker exited with code {self.process.exitcode}."
+
+    def stop(self):
+        if self.process.is_alive():
+            self.process.terminate()
+        self.process.join()
+
+
+class ParallelDataset(Dataset):
+    """Wrap a dataset to parse and validate its files in parallel.
+
+    The workers are forked from the calling process, so they share its state without pickling.
+    The database connections are closed before forking, as a Celery worker process holds them open.
+    Up to `workers` files are processed at once, and each worker can get `max_queued_batches`
+    batches ahead of the database. If `segment_size` is set, the files the parser can split
+    are processed in segments of about that many bytes, so that a large file uses several workers.
+    """
+
+    def __init__(self, dataset: Dataset, workers: int, max_queued_batches: int = 2, segment_size: int = 0):
+        super().__init__(dataset.reader, dataset.project, **dataset.kwargs)
+        self.dataset = dataset
+        self.workers = workers
+        self.max_queued_batches = max_queued_batches
+        self.segment_size = segment_size
+        self._errors: List[FileParseException] = []
+
+    def save(self, user: User, batch_size: int = 1000, checkpoints: Optional[Checkpoints] = None):
+        context = multiprocessing.get_context("fork")
+        files: List[Tuple[FileName, Optional[ImportCheckpoint]]] = [
+            (filename, checkpoints.get(filename) if checkpoints else None) for filename in self.split_files()
+        ]
+        files = [(filename, checkpoint) for filename, checkpoint in files if not (checkpoint and checkpoint.completed)]
+        workers: List[Worker] = []
+        try:
+            for i in range(len(files)):
+                while len(workers) < min(i + self.workers, len(files)):
+                    filename, checkpoint = files[len(workers)]
+                    close_connections()
+                    worker = Worker(
+                        context, self.dataset, filename, batch_size, self.max_queued_batches, checkpoint=checkpoint
+                    )
+                    workers.append(worker)
+                self.save_worker_batches(user, workers[i])
+                workers[i].stop()
+        finally:
+            for worker in workers:
+                worker.stop()
+
+    def split_files(self) -> List[FileName]:
+        if not self.segment_size:
+            return self.reader.filenames
+        filenames: List[FileName] = []
+        for filename in self.reader.filenames:
+            segments = self.reader.parser.split(filename.full_path, self.segment_size)
+            if len(segments) > 1:
+                filenames.extend(dataclasses.replace(filename, segment=segment) for segment in segments)
+            else:
+                filenames.append(filename)
+        return filenames
+
+    def save_worker_batches(self, user: User, worker: Worker):
+        while True:
+            kind, payload = worker.receive()
+            if kind == BATCH:
+                size, batch = payload
+                with transaction.atomic():
+                    self.save_batch(user, batch)
+                    if worker.checkpoint:
+                        worker.checkpoint.advance(size)
+            elif kind == ERRORS:
+                self._errors.extend(FileParseException(*error) for error in payload)
+                if worker.checkpoint:
+                    worker.checkpoint.complete()
+                return
+            else:
+                raise RuntimeError(f"Failed to import {worker.filename.upload_name}: {payload}")
+
+    def make(self, records):
+        return self.dataset.make(records)
+
+    def save_batch(self, user: User, batch: Any):
+        self.dataset.save_batch(user, batch)
+
+    @property
+    def errors(self) -> List[FileParseException]:
+        return self._errors
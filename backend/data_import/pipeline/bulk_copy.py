@@ -0,0 +1,55 @@
+"""
+Load the labels into PostgreSQL with `COPY FROM STDIN`.
+
+`COPY` checks the same constraints as `INSERT`, so a batch that breaks a unique or
+check constraint fails in the same way as with `bulk_create`.
+"""
+import io
+from typing import Any, Iterable, List, Type
+
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.models import AutoField, Field, Model
+
+ESCAPES = str.maketrans({"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r"})
+
+
+def can_copy(using: str = DEFAULT_DB_ALIAS) -> bool:
+    return connections[using].vendor == "postgresql"
+
+
+def to_copy_value(value: Any) -> str:
+    """Formats the value in the text format of `COPY`."""
+    if value is None:
+        return "\\N"
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    return str(value).translate(ESCAPES)
+
+
+def copy_fields(model: Type[Model]) -> List[Field]:
+    return [field for field in model._meta.concrete_fields if not isinstance(field, AutoField)]
+
+
+def to_copy_rows(model: Type[Model], objs: Iterable[Model], using: str = DEFAULT_DB_ALIAS) -> io.StringIO:
+    """Writes the objects to a buffer in the text format of `COPY`, one line for each object."""
+    connection = connections[using]
+    fields = copy_fields(model)
+    buffer = io.StringIO()
+    for obj in objs:
+        values = [field.get_db_prep_save(field.pre_save(obj, add=True), connection) for field in fields]
+        buffer.write("\t".join(map(to_copy_value, values)))
+        buffer.write("\n")
+    buffer.seek(0)
+    return buffer
+
+
+def copy_from(model: Type[Model], objs: List[Model], using: str = DEFAULT_DB_ALIAS):
+    """Inserts the objects with `COPY FROM STDIN`. Unlike `bulk_create`, the primary keys are not set."""
+    if not objs:
+        return
+    connection = connections[using]
+    quote = connection.ops.quote_name
+    columns = ", ".join(quote(field.column) for field in copy_fields(model))
+    sql = f"COPY {quote(model._meta.db_table)} ({columns}) FROM STDIN"
+    with connection.cursor() as cursor:
+        cursor.copy_expert(sql, to_copy_rows(model, objs, using))
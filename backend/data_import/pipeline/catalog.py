@@ -9,6 +9,13 @@ from typing_extensions import Literal
 from .exceptions import FileFormatException
 from projects.models import ProjectType
 
+try:
+    import pyarrow  # noqa: F401
+
+    HAS_PYARROW = True
+except ImportError:  # pragma: no cover
+    HAS_PYARROW = False
+
 # Define the example directories
 EXAMPLE_DIR = Path(__file__).parent.resolve() / "examples"
 TASK_AGNOSTIC_DIR = EXAMPLE_DIR / "task_agnostic"
@@ -126,6 +133,10 @@ encodings = Literal[
 ]
 
 
+# The types of the compressed files, which the text formats can be uploaded as.
+COMPRESSED_TYPES = "application/gzip, application/x-gzip, application/x-bzip2, application/x-xz, application/zstd"
+
+
 class Format:
     name = ""
     accept_types = ""
@@ -144,17 +155,17 @@ class Format:
 
 class CSV(Format):
     name = "CSV"
-    accept_types = "text/csv"
+    accept_types = f"text/csv, {COMPRESSED_TYPES}"
 
 
 class FastText(Format):
     name = "fastText"
-    accept_types = "text/plain"
+    accept_types = f"text/plain, {COMPRESSED_TYPES}"
 
 
 class JSON(Format):
     name = "JSON"
-    accept_types = "application/json"
+    accept_types = f"application/json, {COMPRESSED_TYPES}"
 
 
 class JSONL(Format):
@@ -169,7 +180,7 @@ class Excel(Format):
 
 class TextFile(Format):
     name = "TextFile"
-    accept_types = "text/*"
+    accept_types = f"text/*, {COMPRESSED_TYPES}"
 
     @staticmethod
     def is_plain_text():
@@ -178,7 +189,7 @@ class TextFile(Format):
 
 class TextLine(Format):
     name = "TextLine"
-    accept_types = "text/*"
+    accept_types = f"text/*, {COMPRESSED_TYPES}"
 
     @staticmethod
     def is_plain_text():
@@ -187,7 +198,17 @@ class TextLine(Format):
 
 class CoNLL(Format):
     name = "CoNLL"
-    accept_types = "text/*"
+    accept_types = f"text/*, {COMPRESSED_TYPES}"
+
+
+class Parquet(Format):
+    name = "Parquet"
+    accept_types = "*"
+
+
+class Arrow(Format):
+    name = "Arrow"
+    accept_types = "*"
 
 
 class ImageFile(Format):
@@ -221,6 +242,11 @@ class ArgEncoding(BaseModel):
     encoding: encodings = "utf_8"
 
 
+class ArgColumnar(BaseModel):
+    column_data: str = "text"
+    column_label: str = "label"
+
+
 class ArgCoNLL(BaseModel):
     encoding: encodings = "utf_8"
     scheme: Literal["IOB2", "IOE2", "IOBES", "BILOU"] = "IOB2"
@@ -430,6 +456,25 @@ Options.register(
     )
 )
 
+# Columnar formats, which need pyarrow
+columnar_examples = {
+    ProjectType.DOCUMENT_CLASSIFICATION: TEXT_CLASSIFICATION_DIR / "example.jsonl",
+    ProjectType.SEQUENCE_LABELING: SEQUENCE_LABELING_DIR / "example.jsonl",
+    ProjectType.SEQ2SEQ: SEQ2SEQ_DIR / "example.jsonl",
+}
+if HAS_PYARROW:
+    for task_id, file in columnar_examples.items():
+        for file_format in [Parquet, Arrow]:
+            Options.register(
+                Option(
+                    display_name=file_format.name,
+                    task_id=task_id,
+                    file_format=file_format,
+                    arg=ArgColumnar,
+                    file=file,
+                )
+            )
+
 # Image tasks
 image_tasks = [
     ProjectType.IMAGE_CLASSIFICATION,
@@ -0,0 +1,111 @@
+"""
+Read the uploaded files compressed with gzip, bzip2, xz or zstd as a stream.
+
+The compression is detected from the magic number at the head of the file rather than
+from its name, so the temporary upload is kept compressed and decompressed while it is parsed.
+The decompressed bytes are limited by the `MAX_DECOMPRESSED_SIZE` setting, because a small
+upload can expand to any size. `zstandard` is needed to read zstd files.
+"""
+import bz2
+import gzip
+import io
+import lzma
+import re
+from typing import Any, BinaryIO, Optional, Tuple, Type
+
+from django.conf import settings
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover
+    zstandard = None  # type: ignore
+
+GZIP = "gzip"
+BZIP2 = "bzip2"
+XZ = "xz"
+ZSTD = "zstd"
+MAGIC_NUMBERS = {
+    GZIP: re.compile(re.escape(b"\x1f\x8b\x08")),
+    # The block size and the magic number of the first block, or the end of an empty stream.
+    BZIP2: re.compile(b"BZh[1-9](1AY&SY|\x17rE8P\x90)"),
+    XZ: re.compile(re.escape(b"\xfd7zXZ\x00")),
+    ZSTD: re.compile(re.escape(b"\x28\xb5\x2f\xfd")),
+}
+HEAD_SIZE = 10
+
+
+class DecompressedSizeError(OSError):
+    def __init__(self, max_size: int):
+        super().__init__(f"The decompressed file is larger than the maximum size of {max_size} bytes.")
+
+
+# The errors raised while reading a corrupted, truncated or too large stream.
+DECOMPRESSION_ERRORS: Tuple[Type[Exception], ...] = (OSError, EOFError, lzma.LZMAError)
+if zstandard is not None:
+    DECOMPRESSION_ERRORS += (zstandard.ZstdError,)
+
+
+def detect_compression(filename: str) -> Optional[str]:
+    """Returns the compression of the file, or None if it isn't compressed."""
+    with open(filename, "rb") as f:
+        head = f.read(HEAD_SIZE)
+    for compression, magic_number in MAGIC_NUMBERS.items():
+        if magic_number.match(head):
+            return compression
+    return None
+
+
+class LimitedReader(io.RawIOBase):
+    """A binary stream that raises `DecompressedSizeError` once more than `max_size` bytes are read."""
+
+    def __init__(self, f: BinaryIO, max_size: int):
+        self.f = f
+        self.max_size = max_size
+        self.size = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        # One byte more than the maximum is read to tell whether the stream goes beyond it.
+        size = min(len(buffer), self.max_size - self.size + 1)
+        data = self.f.read(size)
+        n = len(data)
+        memoryview(buffer)[:n] = data
+        self.size += n
+        if self.size > self.max_size:
+            raise DecompressedSizeError(self.max_size)
+        return n
+
+    def close(self):
+        self.f.close()
+        super().close()
+
+
+def open_binary(filename: str, max_size: Optional[int] = None) -> BinaryIO:
+    """Opens the file in binary mode, decompressing it as it is read if it is compressed.
+
+    The decompressed stream raises `DecompressedSizeError` after `max_size` bytes, which
+    defaults to the `MAX_DECOMPRESSED_SIZE` setting.
+    """
+    compression = detect_compression(filename)
+    f: Any
+    if compression == GZIP:
+        f = gzip.open(filename, "rb")
+    elif compression == BZIP2:
+        f = bz2.open(filename, "rb")
+    elif compression == XZ:
+        f = lzma.open(filename, "rb")
+    elif compression == ZSTD:
+        if zstandard is None:
+            raise OSError(
+                "zstandard must be installed to read zstd files. Install it with `pip install doccano[zstd]`."
+            )
+        # A file can have several frames, e.g. when it is compressed in parallel.
+        decompressor = zstandard.ZstdDecompressor()
+        f = decompressor.stream_reader(open(filename, "rb"), read_across_frames=True, closefd=True)
+    else:
+        return open(filename, "rb")
+    if max_size is None:
+        max_size = settings.MAX_DECOMPRESSED_SIZE
+    return io.BufferedReader(LimitedReader(f, max_size))
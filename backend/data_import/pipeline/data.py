@@ -1,8 +1,9 @@
 import abc
-from typing import Any, Dict
+from typing import Any, Dict, List, Mapping
 
 from pydantic import UUID4, BaseModel, validator
 
+from .validators import is_non_empty_str, is_str, is_uuid4
 from examples.models import Example
 from projects.models import Project
 
@@ -18,8 +19,46 @@ class BaseData(BaseModel, abc.ABC):
 
     @classmethod
     def parse(cls, example_uuid: UUID4, filename: str, upload_name: str, text: str = "", **kwargs):
+        columns: Dict[str, List[Any]] = {
+            "example_uuid": [example_uuid],
+            "filename": [filename],
+            "upload_name": [upload_name],
+            "text": [text],
+        }
+        if cls.validate_columns(columns)[0]:
+            return cls.parse_valid(example_uuid, filename, upload_name, text, **kwargs)
+        return cls.parse_invalid(example_uuid, filename, upload_name, text, **kwargs)
+
+    @classmethod
+    def parse_valid(cls, example_uuid: UUID4, filename: str, upload_name: str, text: str = "", **kwargs):
+        """Creates the data from the values that passed `validate_columns`, skipping the validation."""
+        values: Dict[str, Any] = {
+            "filename": filename,
+            "upload_name": upload_name,
+            "uuid": example_uuid,
+            "meta": kwargs,
+        }
+        if "text" in cls.model_fields:
+            values["text"] = text
+        return cls.model_construct(**values)
+
+    @classmethod
+    def parse_invalid(cls, example_uuid: UUID4, filename: str, upload_name: str, text: str = "", **kwargs):
+        """Creates the data with the validation, which converts the values or raises the error."""
         return cls(uuid=example_uuid, filename=filename, upload_name=upload_name, text=text, meta=kwargs)
 
+    @classmethod
+    def validate_columns(cls, columns: Mapping[str, List[Any]]) -> List[bool]:
+        """Returns whether each record of the batch passes the validation as it is, so that it can be skipped.
+        The columns are keyed by the arguments of `parse` and checked one after another.
+        """
+        checks = [
+            map(is_uuid4, columns["example_uuid"]),
+            map(is_str, columns["filename"]),
+            map(is_str, columns["upload_name"]),
+        ]
+        return [all(values) for values in zip(*checks)]
+
     def __hash__(self):
         return hash(tuple(self.dict()))
 
@@ -38,6 +77,11 @@ class TextData(BaseData):
         else:
             raise ValueError("The empty text is not allowed.")
 
+    @classmethod
+    def validate_columns(cls, columns: Mapping[str, List[Any]]) -> List[bool]:
+        valid = super().validate_columns(columns)
+        return [is_valid and is_non_empty_str(text) for is_valid, text in zip(valid, columns["text"])]
+
     def create(self, project: Project) -> Example:
         return Example(
             uuid=self.uuid,
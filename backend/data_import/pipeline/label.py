@@ -1,10 +1,17 @@
 import abc
 import uuid
-from typing import Any, Optional
+from typing import Any, ClassVar, Dict, List, Optional, Tuple
 
 from pydantic import UUID4, BaseModel, NonNegativeInt, constr, root_validator
 
 from .label_types import LabelTypes
+from .validators import (
+    has_only_keys,
+    is_int,
+    is_non_empty_str,
+    is_non_negative_int,
+    is_uuid4,
+)
 from examples.models import Example
 from label_types.models import CategoryType, LabelType, RelationType, SpanType
 from labels.models import Category as CategoryModel
@@ -16,6 +23,9 @@ from projects.models import Project
 
 
 class Label(BaseModel, abc.ABC):
+    # The keys of the values that `validate_batch` accepts. A missing optional key is checked as -1.
+    required_keys: ClassVar[Tuple[str, ...]] = ()
+    optional_keys: ClassVar[Tuple[str, ...]] = ()
     id: int = -1
     uuid: UUID4
     example_uuid: UUID4
@@ -30,6 +40,44 @@ class Label(BaseModel, abc.ABC):
 
     @classmethod
     def parse(cls, example_uuid: UUID4, obj: Any):
+        values = cls.to_values(obj)
+        if cls.validate_batch([example_uuid], [values])[0]:
+            return cls.parse_valid(example_uuid, values)
+        return cls.parse_invalid(example_uuid, values)
+
+    @classmethod
+    def to_values(cls, obj: Any) -> Dict[str, Any]:
+        """Converts the imported object to the values of the fields."""
+        raise NotImplementedError()
+
+    @classmethod
+    def parse_valid(cls, example_uuid: UUID4, values: Dict[str, Any]):
+        """Creates a label from the values that passed `validate_batch`, skipping the validation."""
+        return cls.model_construct(**{"id": -1, "uuid": uuid.uuid4(), "example_uuid": example_uuid, **values})
+
+    @classmethod
+    def parse_invalid(cls, example_uuid: UUID4, values: Dict[str, Any]):
+        """Creates a label with the validation, which converts the values or raises the error."""
+        return cls(example_uuid=example_uuid, **values)
+
+    @classmethod
+    def validate_batch(cls, example_uuids: List[Any], values: List[Dict[str, Any]]) -> List[bool]:
+        """Returns whether each label of the batch passes the validation as it is, so that it can be skipped.
+        The values are checked for the keys, and then split into the columns of the fields,
+        which `validate_columns` checks one after another.
+        """
+        valid = [
+            is_uuid4(example_uuid) and has_only_keys(label, required=cls.required_keys, optional=cls.optional_keys)
+            for example_uuid, label in zip(example_uuids, values)
+        ]
+        columns = {
+            key: [label.get(key, -1) if is_valid else None for is_valid, label in zip(valid, values)]
+            for key in (*cls.required_keys, *cls.optional_keys)
+        }
+        return [is_valid and passed for is_valid, passed in zip(valid, cls.validate_columns(columns))]
+
+    @classmethod
+    def validate_columns(cls, columns: Dict[str, List[Any]]) -> List[bool]:
         raise NotImplementedError()
 
     @abc.abstractmethod
@@ -45,14 +93,19 @@ class Label(BaseModel, abc.ABC):
 
 
 class CategoryLabel(Label):
+    required_keys = ("label",)
     label: constr(min_length=1)  # type: ignore
 
     def __lt__(self, other):
         return self.label < other.label
 
     @classmethod
-    def parse(cls, example_uuid: UUID4, obj: Any):
-        return cls(example_uuid=example_uuid, label=obj)  # type: ignore
+    def to_values(cls, obj: Any) -> Dict[str, Any]:
+        return {"label": obj}
+
+    @classmethod
+    def validate_columns(cls, columns: Dict[str, List[Any]]) -> List[bool]:
+        return list(map(is_non_empty_str, columns["label"]))
 
     def create_type(self, project: Project) -> Optional[LabelType]:
         return CategoryType(text=self.label, project=project)
@@ -62,6 +115,8 @@ class CategoryLabel(Label):
 
 
 class SpanLabel(Label):
+    required_keys = ("start_offset", "end_offset", "label")
+    optional_keys = ("id",)
     label: constr(min_length=1)  # type: ignore
     start_offset: NonNegativeInt
     end_offset: NonNegativeInt
@@ -77,15 +132,27 @@ class SpanLabel(Label):
         return values
 
     @classmethod
-    def parse(cls, example_uuid: UUID4, obj: Any):
+    def to_values(cls, obj: Any) -> Dict[str, Any]:
         if isinstance(obj, list) or isinstance(obj, tuple):
             columns = ["start_offset", "end_offset", "label"]
-            obj = zip(columns, obj)
-            return cls(example_uuid=example_uuid, **dict(obj))
+            return dict(zip(columns, obj))
         elif isinstance(obj, dict):
-            return cls(example_uuid=example_uuid, **obj)
+            return obj
         raise ValueError("SpanLabel.parse()")
 
+    @classmethod
+    def validate_columns(cls, columns: Dict[str, List[Any]]) -> List[bool]:
+        return [
+            is_int(label_id)
+            and is_non_negative_int(start_offset)
+            and is_non_negative_int(end_offset)
+            and start_offset < end_offset
+            and is_non_empty_str(label)
+            for label_id, start_offset, end_offset, label in zip(
+                columns["id"], columns["start_offset"], columns["end_offset"], columns["label"]
+            )
+        ]
+
     def create_type(self, project: Project) -> Optional[LabelType]:
         return SpanType(text=self.label, project=project)
 
@@ -101,14 +168,19 @@ class SpanLabel(Label):
 
 
 class TextLabel(Label):
+    required_keys = ("text",)
     text: constr(min_length=1)  # type: ignore
 
     def __lt__(self, other):
         return self.text < other.text
 
     @classmethod
-    def parse(cls, example_uuid: UUID4, obj: Any):
-        return cls(example_uuid=example_uuid, text=obj)  # type: ignore
+    def to_values(cls, obj: Any) -> Dict[str, Any]:
+        return {"text": obj}
+
+    @classmethod
+    def validate_columns(cls, columns: Dict[str, List[Any]]) -> List[bool]:
+        return list(map(is_non_empty_str, columns["text"]))
 
     def create_type(self, project: Project) -> Optional[LabelType]:
         return None
@@ -118,6 +190,8 @@ class TextLabel(Label):
 
 
 class RelationLabel(Label):
+    required_keys = ("from_id", "to_id", "type")
+    optional_keys = ("id",)
     from_id: int
     to_id: int
     type: constr(min_length=1)  # type: ignore
@@ -126,8 +200,17 @@ class RelationLabel(Label):
         return self.from_id < other.from_id
 
     @classmethod
-    def parse(cls, example_uuid: UUID4, obj: Any):
-        return cls(example_uuid=example_uuid, **obj)
+    def to_values(cls, obj: Any) -> Dict[str, Any]:
+        return obj
+
+    @classmethod
+    def validate_columns(cls, columns: Dict[str, List[Any]]) -> List[bool]:
+        return [
+            is_int(label_id) and is_int(from_id) and is_int(to_id) and is_non_empty_str(label_type)
+            for label_id, from_id, to_id, label_type in zip(
+                columns["id"], columns["from_id"], columns["to_id"], columns["type"]
+            )
+        ]
 
     def create_type(self, project: Project) -> Optional[LabelType]:
         return RelationType(text=self.type, project=project)
@@ -1,13 +1,21 @@
-from typing import Dict, List, Type
+from typing import Dict, List, Set, Type
+
+from django.db import connections
 
 from label_types.models import LabelType
 from projects.models import Project
 
 
 class LabelTypes:
+    """The label types of a project, cached across the batches of an import.
+
+    Only the types whose texts haven't been seen yet are saved, and only those are read back by `update`.
+    """
+
     def __init__(self, label_type_class: Type[LabelType]):
         self.types: Dict[str, LabelType] = {}
         self.label_type_class = label_type_class
+        self.unread_texts: Set[str] = set()
 
     def __contains__(self, text: str) -> bool:
         return text in self.types
@@ -16,8 +24,23 @@ class LabelTypes:
         return self.types[text]
 
     def save(self, label_types: List[LabelType]):
-        self.label_type_class.objects.bulk_create(label_types, ignore_conflicts=True)
+        new_types = {}
+        for label_type in label_types:
+            if label_type.text not in self.types and label_type.text not in new_types:
+                new_types[label_type.text] = label_type
+        if not new_types:
+            return
+        self.label_type_class.objects.bulk_create(list(new_types.values()), ignore_conflicts=True)
+        self.unread_texts.update(new_types)
 
     def update(self, project: Project):
-        types = self.label_type_class.objects.filter(project=project)
-        self.types = {label_type.text: label_type for label_type in types}
+        if not self.unread_texts:
+            return
+        objects = self.label_type_class.objects
+        texts = list(self.unread_texts)
+        fields = [self.label_type_class._meta.get_field(name) for name in ["project", "text"]]
+        chunk_size = max(connections[objects.db].ops.bulk_batch_size(fields, texts), 1)
+        for i in range(0, len(texts), chunk_size):
+            types = objects.filter(project=project, text__in=texts[i : i + chunk_size])
+            self.types.update({label_type.text: label_type for label_type in types})
+        self.unread_texts.clear()
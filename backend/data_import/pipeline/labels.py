@@ -2,6 +2,9 @@ import abc
 from itertools import groupby
 from typing import Dict, List, Tuple
 
+from django.conf import settings
+
+from .bulk_copy import can_copy, copy_from
 from .examples import Examples
 from .label import Label
 from .label_types import LabelTypes
@@ -38,7 +41,10 @@ class Labels(abc.ABC):
             for label in self.labels
             if label.example_uuid in examples
         ]
-        self.label_model.objects.bulk_create(labels)
+        if settings.IMPORT_LABELS_WITH_COPY and can_copy():
+            copy_from(self.label_model, labels)
+        else:
+            self.label_model.objects.bulk_create(labels)
 
 
 class Categories(Labels):
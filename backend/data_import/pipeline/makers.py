@@ -1,15 +1,16 @@
 from typing import List, Optional, Type
 
-import pandas as pd
-
 from .data import BaseData
 from .exceptions import FileParseException
 from .label import Label
 from .readers import (
     DEFAULT_TEXT_COLUMN,
+    FILE_NAME_COLUMN,
     LINE_NUMBER_COLUMN,
     UPLOAD_NAME_COLUMN,
     UUID_COLUMN,
+    Records,
+    is_missing,
 )
 from examples.models import Example
 from projects.models import Project
@@ -29,20 +30,23 @@ class ExampleMaker:
         self.exclude_columns = exclude_columns or []
         self._errors: List[FileParseException] = []
 
-    def make(self, df: pd.DataFrame) -> List[Example]:
-        if not self.check_column_existence(df):
+    def make(self, records: Records) -> List[Example]:
+        if not self.check_column_existence(records):
             return []
-        self.check_value_existence(df)
-        # make dataframe without exclude columns and missing data
-        df_with_data_column = df.loc[:, ~df.columns.isin(self.exclude_columns)]
-        df_with_data_column = df_with_data_column.dropna(subset=[self.column_data])
+        self.check_value_existence(records)
 
         examples = []
-        for row in df_with_data_column.to_dict(orient="records"):
+        # only the records failing the checks of the batch are validated by pydantic
+        valid = self.validate(records, self.column_data)
+        # make rows without exclude columns and missing data
+        for is_valid, row in zip(valid, records.rows(exclude_columns=self.exclude_columns)):
+            if is_missing(row.get(self.column_data)):
+                continue
             line_num = row.pop(LINE_NUMBER_COLUMN, 0)
             row[DEFAULT_TEXT_COLUMN] = row.pop(self.column_data)  # Rename column for parsing
             try:
-                data = self.data_class.parse(**row)
+                parse = self.data_class.parse_valid if is_valid else self.data_class.parse_invalid
+                data = parse(**row)
                 example = data.create(self.project)
                 examples.append(example)
             except ValueError:
@@ -51,20 +55,31 @@ class ExampleMaker:
                 self._errors.append(error)
         return examples
 
-    def check_column_existence(self, df: pd.DataFrame) -> bool:
+    def validate(self, records: Records, column_data: Optional[str]) -> List[bool]:
+        """Checks the columns of the batch, returning whether each record passes the validation as it is."""
+        columns = {
+            "example_uuid": records[UUID_COLUMN],
+            "filename": records[FILE_NAME_COLUMN],
+            "upload_name": records[UPLOAD_NAME_COLUMN],
+            "text": records[column_data] if column_data else [""] * len(records),
+        }
+        return self.data_class.validate_columns(columns)
+
+    def check_column_existence(self, records: Records) -> bool:
         message = f"Column {self.column_data} not found in the file"
-        if self.column_data not in df.columns:
-            for filename in df[UPLOAD_NAME_COLUMN].unique():
+        if self.column_data not in records:
+            for filename in dict.fromkeys(records[UPLOAD_NAME_COLUMN]):
                 self._errors.append(FileParseException(filename, 0, message))
             return False
         return True
 
-    def check_value_existence(self, df: pd.DataFrame):
-        df_without_data_column = df[df[self.column_data].isnull()]
-        for row in df_without_data_column.to_dict(orient="records"):
-            message = f"Column {self.column_data} not found in record"
-            error = FileParseException(row[UPLOAD_NAME_COLUMN], row.get(LINE_NUMBER_COLUMN, 0), message)
-            self._errors.append(error)
+    def check_value_existence(self, records: Records):
+        line_nums = records[LINE_NUMBER_COLUMN] if LINE_NUMBER_COLUMN in records else [0] * len(records)
+        for value, filename, line_num in zip(records[self.column_data], records[UPLOAD_NAME_COLUMN], line_nums):
+            if is_missing(value):
+                message = f"Column {self.column_data} not found in record"
+                error = FileParseException(filename, line_num, message)
+                self._errors.append(error)
 
     @property
     def errors(self) -> List[FileParseException]:
@@ -73,10 +88,12 @@ class ExampleMaker:
 
 
 class BinaryExampleMaker(ExampleMaker):
-    def make(self, df: pd.DataFrame) -> List[Example]:
+    def make(self, records: Records) -> List[Example]:
         examples = []
-        for row in df.to_dict(orient="records"):
-            data = self.data_class.parse(**row)
+        valid = self.validate(records, None)
+        for is_valid, row in zip(valid, records.rows()):
+            parse = self.data_class.parse_valid if is_valid else self.data_class.parse_invalid
+            data = parse(**row)
             example = data.create(self.project)
             examples.append(example)
         return examples
@@ -88,26 +105,41 @@ class LabelMaker:
         self.label_class = label_class
         self._errors: List[FileParseException] = []
 
-    def make(self, df: pd.DataFrame) -> List[Label]:
-        if not self.check_column_existence(df):
+    def make(self, records: Records) -> List[Label]:
+        if not self.check_column_existence(records):
             return []
 
-        df_label = df.explode(self.column)
-        df_label = df_label[[UUID_COLUMN, self.column]]
-        df_label.dropna(subset=[self.column], inplace=True)
+        example_uuids = []
+        values = []
+        for example_uuid, value in zip(records[UUID_COLUMN], records[self.column]):
+            # explode the list of labels into one label per row
+            objs = value if isinstance(value, (list, tuple, set)) else [value]
+            for obj in objs:
+                if is_missing(obj):
+                    continue
+                try:
+                    values.append(self.label_class.to_values(obj))
+                    example_uuids.append(example_uuid)
+                except ValueError:
+                    pass
+
         labels = []
-        for row in df_label.to_dict(orient="records"):
+        # only the labels failing the checks of the batch are validated by pydantic
+        valid = self.label_class.validate_batch(example_uuids, values)
+        for is_valid, example_uuid, label_values in zip(valid, example_uuids, values):
+            if is_valid:
+                labels.append(self.label_class.parse_valid(example_uuid, label_values))
+                continue
             try:
-                label = self.label_class.parse(row[UUID_COLUMN], row[self.column])
-                labels.append(label)
+                labels.append(self.label_class.parse_invalid(example_uuid, label_values))
             except ValueError:
                 pass
         return labels
 
-    def check_column_existence(self, df: pd.DataFrame) -> bool:
+    def check_column_existence(self, records: Records) -> bool:
         message = f"Column {self.column} not found in the file"
-        if self.column not in df.columns:
-            for filename in df[UPLOAD_NAME_COLUMN].unique():
+        if self.column not in records:
+            for filename in dict.fromkeys(records[UPLOAD_NAME_COLUMN]):
                 self._errors.append(FileParseException(filename, 0, message))
             return False
         return True
@@ -1,60 +1,137 @@
+import base64
+import codecs
+import collections
 import csv
+import datetime
+import decimal
+import functools
+import hashlib
 import io
+import itertools
 import json
+import logging
 import os
-from typing import Any, Dict, Iterator, List, Tuple
+import re
+import zipfile
+from typing import (
+    IO,
+    Any,
+    BinaryIO,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
 
-import chardet
+import openpyxl
 import pyexcel
 import pyexcel.exceptions
 from chardet import UniversalDetector
-from seqeval.scheme import BILOU, IOB2, IOBES, IOE2, Tokens
+from django.core.cache import cache
+from openpyxl.utils.exceptions import InvalidFileException
+
+try:
+    import pyarrow
+    import pyarrow.ipc
+    import pyarrow.parquet
+except ImportError:  # pragma: no cover
+    pyarrow = None  # type: ignore
 
+from .compression import detect_compression, open_binary
 from .exceptions import FileParseException
 from .readers import (
     DEFAULT_LABEL_COLUMN,
     DEFAULT_TEXT_COLUMN,
     LINE_NUMBER_COLUMN,
+    ColumnarParser,
     Parser,
 )
+from .splitters import Segment, is_splittable, open_segment, split_csv, split_lines
+from .tagging import SCHEMES, TagDecoder, align_spans
+from api.json_codec import get_codec
+
+logger = logging.getLogger(__name__)
 
 DEFAULT_ENCODING = "Auto"
+XLSX_EXTENSIONS = {".xlsx", ".xlsm"}
+CONLL_BATCH_SIZE = 1000
+WHITESPACE = re.compile(r"[ \t\n\r]*")
+NUMBER_CHARS = frozenset("0123456789.eE+-")
+# An error this close to the end of the buffer may be caused by a literal or an escape cut off by it, e.g. "-Infin".
+CUT_OFF_MARGIN = len("-Infinity")
+
+
+# The number of bytes read from the head of a file to detect its encoding.
+ENCODING_SAMPLE_SIZE = 1024 * 1024
+# The seconds the detected encoding of a file is cached, which is longer than an upload is kept.
+ENCODING_CACHE_TIMEOUT = 24 * 60 * 60
+
 
+def is_utf8(sample: bytes, is_whole_file: bool) -> bool:
+    """Returns whether the sample is valid UTF-8. A character cut off at the end of a partial sample is allowed."""
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    try:
+        decoder.decode(sample, final=is_whole_file)
+        return True
+    except UnicodeDecodeError:
+        return False
 
-def detect_encoding(filename: str, buffer_size: int = io.DEFAULT_BUFFER_SIZE) -> str:
+
+def detect_encoding(
+    filename: str, buffer_size: int = io.DEFAULT_BUFFER_SIZE, sample_size: int = ENCODING_SAMPLE_SIZE
+) -> str:
     """Detects character encoding automatically.
 
+    Only the first `sample_size` bytes of the file are read. If they are valid UTF-8,
+    the file is assumed to be UTF-8 without running the detector.
+
     If you want to know the supported encodings, please see the following document:
     https://chardet.readthedocs.io/en/latest/supported-encodings.html
 
     Args:
         filename: the filename for detecting the encoding.
-        buffer_size: the buffer size to read file contents incrementally.
+        buffer_size: the buffer size to feed the detector incrementally.
+        sample_size: the maximum number of bytes to read.
 
     Returns:
         The character encoding.
     """
-    # For a small file.
-    if os.path.getsize(filename) < buffer_size:
-        detected = chardet.detect(open(filename, "rb").read())
-        return detected.get("encoding", "utf-8")
-
-    # For a large file, call the Universal Encoding Detector incrementally.
+    # The stream is buffered and reads ahead of the sample, so it is only limited by the maximum decompressed size.
+    with open_binary(filename) as f:
+        sample = f.read(sample_size)
+        is_whole_file = f.read(1) == b""
+    if sample.startswith(codecs.BOM_UTF8):
+        return "utf-8-sig"
+    if is_utf8(sample, is_whole_file):
+        return "utf-8"
+
+    # Call the Universal Encoding Detector incrementally.
     # It will stop as soon as it is confident enough to report its results.
     # See: https://chardet.readthedocs.io/en/latest/usage.html
-    with open(filename, "rb") as f:
-        detector = UniversalDetector()
-        while True:
-            binary = f.read(buffer_size)
-            detector.feed(binary)
-            if binary == b"":
-                break
-            if detector.done:
-                break
+    detector = UniversalDetector()
+    for i in range(0, len(sample), buffer_size):
+        detector.feed(sample[i : i + buffer_size])
         if detector.done:
-            return detector.result["encoding"] or "utf-8"
-        else:
-            return "utf-8"
+            break
+    detector.close()
+    return detector.result["encoding"] or "utf-8"
+
+
+def detect_file_encoding(filename: str, size: int, modified_at: int) -> str:
+    """Caches the detected encoding of a file in the Django cache as long as the file doesn't change.
+    The key is made of the path, the size and the modification time, so a path reused for another file
+    isn't given a stale encoding. The Celery workers share the encodings if the cache is shared, e.g. Redis.
+    """
+    path = hashlib.sha256(os.path.abspath(filename).encode("utf-8")).hexdigest()
+    key = f"data_import:encoding:{path}:{size}:{modified_at}"
+    encoding = cache.get(key)
+    if encoding is None:
+        encoding = detect_encoding(filename)
+        cache.set(key, encoding, ENCODING_CACHE_TIMEOUT)
+    return encoding
 
 
 def decide_encoding(filename: str, encoding: str) -> str:
@@ -71,30 +148,194 @@ def decide_encoding(filename: str, encoding: str) -> str:
         The character encoding.
     """
     if encoding == DEFAULT_ENCODING:
-        return detect_encoding(filename)
+        stat = os.stat(filename)
+        return detect_file_encoding(filename, stat.st_size, stat.st_mtime_ns)
     else:
         return encoding
 
 
+def split_file(
+    filename: str, encoding: str, segment_size: int, splitter: Callable[[BinaryIO, int], List[Segment]]
+) -> List[Segment]:
+    """Splits the file into segments if it isn't compressed and a newline is a single byte in its encoding."""
+    if detect_compression(filename) or not is_splittable(decide_encoding(filename, encoding)):
+        return []
+    with open(filename, "rb") as f:
+        return splitter(f, segment_size)
+
+
+def open_file(filename: str, encoding: str, segment: Optional[Segment] = None) -> IO[str]:
+    """Opens the file or its segment in text mode. A compressed file is decompressed as it is read."""
+    if segment is not None:
+        return open_segment(filename, segment, encoding)
+    if detect_compression(filename):
+        return io.TextIOWrapper(open_binary(filename), encoding=encoding)
+    return open(filename, encoding=encoding)
+
+
 class LineReader:
     """LineReader is a helper class to read a file line by line.
 
     Attributes:
         filename: The filename to read.
         encoding: The character encoding.
+        segment: The segment of the file to read. If it is None, the whole file is read.
     """
 
-    def __init__(self, filename: str, encoding: str = DEFAULT_ENCODING):
+    def __init__(self, filename: str, encoding: str = DEFAULT_ENCODING, segment: Optional[Segment] = None):
         self.filename = filename
         self.encoding = encoding
+        self.segment = segment
+
+    @property
+    def first_line_num(self) -> int:
+        return self.segment.records_before + 1 if self.segment else 1
 
     def __iter__(self) -> Iterator[str]:
         encoding = decide_encoding(self.filename, self.encoding)
-        with open(self.filename, encoding=encoding) as f:
+        with open_file(self.filename, encoding, self.segment) as f:
             for line in f:
                 yield line.rstrip()
 
 
+class LineSplitParser(Parser):
+    """LineSplitParser is a base class of the parsers that read a file line by line,
+    so that the file can be split at any newline.
+
+    Attributes:
+        encoding: The character encoding.
+    """
+
+    encoding = DEFAULT_ENCODING
+
+    def split(self, filename: str, segment_size: int) -> List[Segment]:
+        return split_file(filename, self.encoding, segment_size, split_lines)
+
+    def parse(self, filename: str) -> Iterator[Dict[Any, Any]]:
+        return self.parse_segment(filename, None)
+
+    def parse_segment(self, filename: str, segment: Optional[Segment]) -> Iterator[Dict[Any, Any]]:
+        raise NotImplementedError("Please implement this method in the subclass.")
+
+
+class JSONArrayReader:
+    """JSONArrayReader is a helper class to read the elements of a JSON array one by one.
+
+    The file is read in chunks, and the consumed part of the buffer is dropped,
+    so the memory usage doesn't grow with the size of the file. If the document
+    is not an array, it is read at once and iterated in the same way as `json.load`.
+
+    Attributes:
+        f: The text stream to read.
+        chunk_size: The number of characters to read at once.
+    """
+
+    def __init__(self, f: IO[str], chunk_size: int = 64 * 1024):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.decoder = json.JSONDecoder()
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+        # The position of the head of the buffer in the file.
+        self.offset = 0
+        self.line_num = 1
+        self.column = 0
+
+    def __iter__(self) -> Iterator[Any]:
+        if self.skip_whitespace() != "[":
+            value = self.decode()
+            self.check_end()
+            yield from value
+            return
+        self.pos += 1
+        if self.skip_whitespace() == "]":
+            self.pos += 1
+            self.check_end()
+            return
+        while True:
+            value = self.decode()
+            if self.pos > self.chunk_size:
+                self.trim()
+            yield value
+            char = self.skip_whitespace()
+            if char == "]":
+                self.pos += 1
+                self.check_end()
+                return
+            if char != ",":
+                raise self.error(json.JSONDecodeError("Expecting ',' delimiter", self.buffer, self.pos))
+            self.pos += 1
+            self.skip_whitespace()
+
+    def read(self, size: int) -> bool:
+        chunk = self.f.read(size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buffer += chunk
+        return True
+
+    def trim(self):
+        """Drops the consumed part of the buffer, keeping track of its position in the file."""
+        newlines = self.buffer.count("\n", 0, self.pos)
+        if newlines:
+            self.line_num += newlines
+            self.column = self.pos - self.buffer.rfind("\n", 0, self.pos) - 1
+        else:
+            self.column += self.pos
+        self.offset += self.pos
+        self.buffer = self.buffer[self.pos :]
+        self.pos = 0
+
+    def skip_whitespace(self) -> str:
+        """Skips the whitespace and returns the next character, or an empty string at the end of the file."""
+        while True:
+            self.pos = WHITESPACE.match(self.buffer, self.pos).end()  # type: ignore
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self.read(self.chunk_size):
+                return ""
+
+    def decode(self) -> Any:
+        # A value cut off by the end of the buffer is decoded again after reading more,
+        # while any other error is raised at once without reading the rest of the file.
+        # A number followed by any of NUMBER_CHARS may be cut off too, e.g. "1." or "1e".
+        # The read size doubles so that a large value is not decoded many times.
+        size = self.chunk_size
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+                is_complete = end < len(self.buffer) and not (
+                    isinstance(value, (int, float)) and self.buffer[end] in NUMBER_CHARS
+                )
+                if is_complete or self.eof:
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError as e:
+                if self.eof or not self.is_cut_off(e):
+                    raise self.error(e)
+            self.read(size)
+            size *= 2
+
+    def is_cut_off(self, e: json.JSONDecodeError) -> bool:
+        """Tells whether the error may be caused by the end of the buffer rather than by a malformed value."""
+        return e.pos + CUT_OFF_MARGIN >= len(self.buffer) or e.msg.startswith("Unterminated string")
+
+    def check_end(self):
+        if self.skip_whitespace():
+            raise self.error(json.JSONDecodeError("Extra data", self.buffer, self.pos))
+
+    def error(self, e: json.JSONDecodeError) -> json.JSONDecodeError:
+        """Converts the position of the error in the buffer into the position in the file."""
+        error = json.JSONDecodeError(e.msg, e.doc, e.pos)
+        error.pos = self.offset + e.pos
+        error.lineno = self.line_num + e.lineno - 1
+        error.colno = e.colno + self.column if e.lineno == 1 else e.colno
+        error.args = (f"{e.msg}: line {error.lineno} column {error.colno} (char {error.pos})",)
+        return error
+
+
 class PlainParser(Parser):
     """PlainParser is a parser simply returns a dictionary.
 
@@ -108,7 +349,7 @@ class PlainParser(Parser):
         yield {}
 
 
-class LineParser(Parser):
+class LineParser(LineSplitParser):
     """LineParser is a parser to read a file line by line.
 
     Attributes:
@@ -118,9 +359,9 @@ class LineParser(Parser):
     def __init__(self, encoding: str = DEFAULT_ENCODING, **kwargs):
         self.encoding = encoding
 
-    def parse(self, filename: str) -> Iterator[Dict[Any, Any]]:
-        reader = LineReader(filename, self.encoding)
-        for line_num, line in enumerate(reader, start=1):
+    def parse_segment(self, filename: str, segment: Optional[Segment]) -> Iterator[Dict[Any, Any]]:
+        reader = LineReader(filename, self.encoding, segment)
+        for line_num, line in enumerate(reader, start=reader.first_line_num):
             yield {DEFAULT_TEXT_COLUMN: line, LINE_NUMBER_COLUMN: line_num}
 
 
@@ -136,7 +377,7 @@ class TextFileParser(Parser):
 
     def parse(self, filename: str) -> Iterator[Dict[Any, Any]]:
         encoding = decide_encoding(filename, self.encoding)
-        with open(filename, encoding=encoding) as f:
+        with open_file(filename, encoding) as f:
             yield {DEFAULT_TEXT_COLUMN: f.read()}
 
 
@@ -152,11 +393,28 @@ class CSVParser(Parser):
         self.encoding = encoding
         self.delimiter = delimiter
 
+    def split(self, filename: str, segment_size: int) -> List[Segment]:
+        # A byte below 0x40 can't be a part of a multibyte character in the splittable encodings, e.g. Shift_JIS.
+        if len(self.delimiter) != 1 or ord(self.delimiter) >= 0x40:
+            return []
+        delimiter = self.delimiter.encode("ascii")
+        return split_file(filename, self.encoding, segment_size, functools.partial(split_csv, delimiter=delimiter))
+
     def parse(self, filename: str) -> Iterator[Dict[Any, Any]]:
+        return self.parse_segment(filename, None)
+
+    def parse_segment(self, filename: str, segment: Optional[Segment]) -> Iterator[Dict[Any, Any]]:
         encoding = decide_encoding(filename, self.encoding)
-        with open(filename, encoding=encoding) as f:
-            reader = csv.DictReader(f, delimiter=self.delimiter)
-            for line_num, row in enumerate(reader, start=1):
+        fieldnames = None
+        line_num = 1
+        if segment and segment.start > 0:
+            # The header is only in the first segment. The records before this one include the header.
+            with open_file(filename, encoding) as f:
+                fieldnames = csv.DictReader(f, delimiter=self.delimiter).fieldnames
+            line_num = segment.records_before
+        with open_file(filename, encoding, segment) as f:
+            reader = csv.DictReader(f, fieldnames=fieldnames, delimiter=self.delimiter)
+            for line_num, row in enumerate(reader, start=line_num):
                 yield {LINE_NUMBER_COLUMN: line_num, **row}
 
 
@@ -172,22 +430,27 @@ class JSONParser(Parser):
         self._errors: List[FileParseException] = []
 
     def parse(self, filename: str) -> Iterator[Dict[Any, Any]]:
+        """Yields the elements of the array in the file.
+        The file is read twice, first to check the whole document without keeping the elements,
+        so that a malformed file yields nothing, in the same way as `json.load` does.
+        """
         encoding = decide_encoding(filename, self.encoding)
-        with open(filename, encoding=encoding) as f:
+        with open_file(filename, encoding) as f:
             try:
-                rows = json.load(f)
-                for row in rows:
-                    yield row
+                collections.deque(JSONArrayReader(f), maxlen=0)
             except json.decoder.JSONDecodeError as e:
-                error = FileParseException(filename, line_num=1, message=str(e))
+                error = FileParseException(filename, line_num=e.lineno, message=str(e))
                 self._errors.append(error)
+                return
+        with open_file(filename, encoding) as f:
+            yield from JSONArrayReader(f)
 
     @property
     def errors(self) -> List[FileParseException]:
         return self._errors
 
 
-class JSONLParser(Parser):
+class JSONLParser(LineSplitParser):
     """JSONLParser is a parser to read a JSONL file and return its rows.
 
     Attributes:
@@ -198,11 +461,12 @@ class JSONLParser(Parser):
         self.encoding = encoding
         self._errors: List[FileParseException] = []
 
-    def parse(self, filename: str) -> Iterator[Dict[Any, Any]]:
-        reader = LineReader(filename, self.encoding)
-        for line_num, line in enumerate(reader, start=1):
+    def parse_segment(self, filename: str, segment: Optional[Segment]) -> Iterator[Dict[Any, Any]]:
+        reader = LineReader(filename, self.encoding, segment)
+        codec = get_codec()
+        for line_num, line in enumerate(reader, start=reader.first_line_num):
             try:
-                row = json.loads(line)
+                row = codec.loads(line)
                 yield {LINE_NUMBER_COLUMN: line_num, **row}
             except json.decoder.JSONDecodeError as e:
                 error = FileParseException(filename, line_num, str(e))
@@ -213,27 +477,180 @@ class JSONLParser(Parser):
         return self._errors
 
 
+def trim_row(values: Iterable[Any]) -> List[Any]:
+    """Replaces the empty cells with empty strings and removes the trailing ones, as pyexcel does."""
+    row = ["" if value is None else value for value in values]
+    while row and row[-1] == "":
+        row.pop()
+    return row
+
+
 class ExcelParser(Parser):
-    """ExcelParser is a parser to read a excel file."""
+    """ExcelParser is a parser to read a excel file.
+
+    The xlsx files are read row by row in the read-only mode of openpyxl, so the workbook is
+    never loaded at once. Each visible sheet is imported in order, with its first row as the header.
+    The other formats are read by pyexcel.
+    """
 
     def __init__(self, **kwargs):
         self._errors = []
 
     def parse(self, filename: str) -> Iterator[Dict[Any, Any]]:
-        rows = pyexcel.iget_records(file_name=filename)
+        if os.path.splitext(filename)[1].lower() in XLSX_EXTENSIONS:
+            rows = self.iter_xlsx_records(filename)
+        else:
+            rows = pyexcel.iget_records(file_name=filename)
         try:
             for line_num, row in enumerate(rows, start=1):
                 yield {LINE_NUMBER_COLUMN: line_num, **row}
-        except pyexcel.exceptions.FileTypeNotSupported as e:
+        except (pyexcel.exceptions.FileTypeNotSupported, InvalidFileException, zipfile.BadZipFile) as e:
             error = FileParseException(filename, line_num=1, message=str(e))
             self._errors.append(error)
 
+    @staticmethod
+    def iter_xlsx_records(filename: str) -> Iterator[Dict[Any, Any]]:
+        workbook = openpyxl.load_workbook(filename, read_only=True, data_only=True)
+        try:
+            for sheet in workbook.worksheets:
+                if sheet.sheet_state != "visible":
+                    continue
+                rows = sheet.iter_rows(values_only=True)
+                header = trim_row(next(rows, ()))
+                count = 0
+                # The empty rows are only yielded if a row with values follows them.
+                empty_rows = 0
+                for values in rows:
+                    row = trim_row(values)
+                    if not row:
+                        empty_rows += 1
+                        continue
+                    for _ in range(empty_rows):
+                        yield dict.fromkeys(header, "")
+                    count += empty_rows + 1
+                    empty_rows = 0
+                    yield dict(itertools.zip_longest(header, row, fillvalue=""))
+                logger.info("Read %d rows from the sheet %s of %s", count, sheet.title, filename)
+        finally:
+            workbook.close()
+
+    @property
+    def errors(self) -> List[FileParseException]:
+        return self._errors
+
+
+def has_non_json_values(data_type: "pyarrow.DataType") -> bool:
+    """Returns whether the values of the type are converted to Python objects that JSON can't encode."""
+    if pyarrow.types.is_list(data_type) or pyarrow.types.is_large_list(data_type):
+        return has_non_json_values(data_type.value_type)
+    if pyarrow.types.is_fixed_size_list(data_type):
+        return has_non_json_values(data_type.value_type)
+    if pyarrow.types.is_struct(data_type):
+        return any(has_non_json_values(data_type.field(i).type) for i in range(data_type.num_fields))
+    if pyarrow.types.is_map(data_type):
+        return has_non_json_values(data_type.key_type) or has_non_json_values(data_type.item_type)
+    return (
+        pyarrow.types.is_temporal(data_type)
+        or pyarrow.types.is_decimal(data_type)
+        or pyarrow.types.is_binary(data_type)
+        or pyarrow.types.is_large_binary(data_type)
+        or pyarrow.types.is_fixed_size_binary(data_type)
+    )
+
+
+def to_json_value(value: Any) -> Any:
+    """Converts a value to one that JSON can encode, e.g. a datetime to an ISO 8601 string."""
+    if isinstance(value, (datetime.date, datetime.time)):
+        return value.isoformat()
+    if isinstance(value, datetime.timedelta):
+        return value.total_seconds()
+    if isinstance(value, decimal.Decimal):
+        return str(value)
+    if isinstance(value, bytes):
+        try:
+            return value.decode("utf-8")
+        except UnicodeDecodeError:
+            return base64.b64encode(value).decode("ascii")
+    if isinstance(value, list):
+        return [to_json_value(item) for item in value]
+    if isinstance(value, dict):
+        return {key: to_json_value(item) for key, item in value.items()}
+    if isinstance(value, tuple):
+        # A map is converted to a list of key-value tuples.
+        return [to_json_value(item) for item in value]
+    return value
+
+
+class ArrowBatchParser(ColumnarParser):
+    """The base class of the parsers that read a file in record batches with pyarrow.
+
+    The values are converted to Python objects column by column. A nested column,
+    such as a list of spans, is read as lists and dictionaries. The values that JSON can't
+    encode, such as timestamps, decimals and binaries, are converted to strings, so that they
+    can be stored in the meta of the examples.
+    """
+
+    def __init__(self, **kwargs):
+        self._errors: List[FileParseException] = []
+
+    def read_batches(self, filename: str, batch_size: int) -> Iterator["pyarrow.RecordBatch"]:
+        raise NotImplementedError("Please implement this method in the subclass.")
+
+    def parse_columns(self, filename: str, batch_size: int) -> Iterator[Dict[str, List[Any]]]:
+        if pyarrow is None:
+            message = "pyarrow must be installed to read the file. Install it with `pip install doccano[parquet]`."
+            self._errors.append(FileParseException(filename, line_num=1, message=message))
+            return
+        line_num = 1
+        try:
+            for batch in self.read_batches(filename, batch_size):
+                columns = batch.to_pydict()
+                for field in batch.schema:
+                    if has_non_json_values(field.type):
+                        columns[field.name] = [to_json_value(value) for value in columns[field.name]]
+                columns[LINE_NUMBER_COLUMN] = list(range(line_num, line_num + batch.num_rows))
+                line_num += batch.num_rows
+                yield columns
+        except (pyarrow.ArrowException, OSError) as e:
+            self._errors.append(FileParseException(filename, line_num=line_num, message=str(e)))
+
     @property
     def errors(self) -> List[FileParseException]:
         return self._errors
 
 
-class FastTextParser(Parser):
+class ParquetParser(ArrowBatchParser):
+    """ParquetParser is a parser to read a Parquet file.
+
+    The row groups are read in batches of up to `batch_size` records.
+    """
+
+    def read_batches(self, filename: str, batch_size: int) -> Iterator["pyarrow.RecordBatch"]:
+        with pyarrow.parquet.ParquetFile(filename, memory_map=True) as f:
+            yield from f.iter_batches(batch_size=batch_size)
+
+
+class ArrowParser(ArrowBatchParser):
+    """ArrowParser is a parser to read a file in the Arrow IPC file or stream format.
+
+    The file is memory-mapped, and its record batches are sliced into batches of up to
+    `batch_size` records without copying.
+    """
+
+    def read_batches(self, filename: str, batch_size: int) -> Iterator["pyarrow.RecordBatch"]:
+        with pyarrow.memory_map(filename) as source:
+            try:
+                reader = pyarrow.ipc.open_file(source)
+                batches = (reader.get_batch(i) for i in range(reader.num_record_batches))
+            except pyarrow.ArrowInvalid:
+                source.seek(0)
+                batches = pyarrow.ipc.open_stream(source)
+            for batch in batches:
+                for offset in range(0, batch.num_rows, batch_size):
+                    yield batch.slice(offset, batch_size)
+
+
+class FastTextParser(LineSplitParser):
     """FastTextParser is a parser to read a fastText format and returns a text and labels.
 
     The example format is as follows:
@@ -250,9 +667,9 @@ class FastTextParser(Parser):
         self.encoding = encoding
         self.label = label
 
-    def parse(self, filename: str) -> Iterator[Dict[Any, Any]]:
-        reader = LineReader(filename, self.encoding)
-        for line_num, line in enumerate(reader, start=1):
+    def parse_segment(self, filename: str, segment: Optional[Segment]) -> Iterator[Dict[Any, Any]]:
+        reader = LineReader(filename, self.encoding, segment)
+        for line_num, line in enumerate(reader, start=reader.first_line_num):
             labels = []
             tokens = []
             for token in line.rstrip().split(" "):
@@ -293,31 +710,32 @@ class CoNLLParser(Parser):
     def __init__(self, encoding: str = DEFAULT_ENCODING, delimiter: str = " ", scheme: str = "IOB2", **kwargs):
         self.encoding = encoding
         self.delimiter = delimiter
-        mapping = {"IOB2": IOB2, "IOE2": IOE2, "IOBES": IOBES, "BILOU": BILOU}
         self._errors: List[FileParseException] = []
-        if scheme in mapping:
-            self.scheme = mapping[scheme]
+        if scheme in SCHEMES:
+            self.decoder: Optional[TagDecoder] = TagDecoder(scheme)
         else:
-            self.scheme = None
+            self.decoder = None
 
     @property
     def errors(self) -> List[FileParseException]:
         return self._errors
 
     def parse(self, filename: str) -> Iterator[Dict[Any, Any]]:
-        if not self.scheme:
+        if not self.decoder:
             message = "The specified scheme is not supported."
             error = FileParseException(filename, line_num=1, message=message)
             self._errors.append(error)
             return
 
         reader = LineReader(filename, self.encoding)
+        sentences: List[Tuple[List[str], List[str]]] = []
         words, tags = [], []
         for line_num, line in enumerate(reader, start=1):
             line = line.rstrip()
             if line:
                 tokens = line.split("\t")
                 if len(tokens) != 2:
+                    yield from self.create_records(sentences)
                     message = "A line must be separated by tab and has two columns."
                     self._errors.append(FileParseException(filename, line_num, message))
                     return
@@ -325,24 +743,24 @@ class CoNLLParser(Parser):
                 words.append(word)
                 tags.append(tag)
             else:
-                yield self.create_record(tags, words)
+                sentences.append((words, tags))
                 words, tags = [], []
+                if len(sentences) == CONLL_BATCH_SIZE:
+                    yield from self.create_records(sentences)
+                    sentences = []
         if words:
-            yield self.create_record(tags, words)
-
-    def create_record(self, tags, words):
-        text = self.delimiter.join(words)
-        labels = self.align_span(words, tags)
-        return {DEFAULT_TEXT_COLUMN: text, DEFAULT_LABEL_COLUMN: labels}
+            sentences.append((words, tags))
+        yield from self.create_records(sentences)
+
+    def create_records(self, sentences: List[Tuple[List[str], List[str]]]) -> Iterator[Dict[Any, Any]]:
+        """Decodes the tags of the sentences at once and yields a record for each sentence."""
+        assert self.decoder is not None
+        batch = self.decoder.decode_batch([tags for _, tags in sentences])
+        for (words, _), entities in zip(sentences, batch):
+            text = self.delimiter.join(words)
+            labels = align_spans(words, entities, self.delimiter)
+            yield {DEFAULT_TEXT_COLUMN: text, DEFAULT_LABEL_COLUMN: labels}
 
     def align_span(self, words: List[str], tags: List[str]) -> List[Tuple[int, int, str]]:
-        tokens = Tokens(tags, self.scheme)
-        labels = []
-        for entity in tokens.entities:
-            text = self.delimiter.join(words[: entity.start])
-            start = len(text) + len(self.delimiter) if text else len(text)
-            chunk = words[entity.start : entity.end]
-            text = self.delimiter.join(chunk)
-            end = start + len(text)
-            labels.append((start, end, entity.tag))
-        return labels
+        assert self.decoder is not None
+        return align_spans(words, self.decoder.decode(tags), self.delimiter)
@@ -1,12 +1,14 @@
 import abc
 import collections.abc
 import dataclasses
+import itertools
+import math
 import uuid
-from typing import Any, Dict, Iterator, List
-
-import pandas as pd
+from typing import Any, Dict, Iterable, Iterator, List, Optional
 
+from .compression import DECOMPRESSION_ERRORS
 from .exceptions import FileParseException
+from .splitters import Segment
 
 DEFAULT_TEXT_COLUMN = "text"
 DEFAULT_LABEL_COLUMN = "label"
@@ -16,6 +18,59 @@ UUID_COLUMN = "example_uuid"
 LINE_NUMBER_COLUMN = "#line_number"
 
 
+def is_missing(value: Any) -> bool:
+    """Returns whether the value is missing in the same way as `pd.isnull` does for a scalar."""
+    return value is None or (isinstance(value, float) and math.isnan(value))
+
+
+class Records:
+    """Records is a batch of records stored column by column.
+
+    The records are kept as plain lists of values, one list per column, so that the makers
+    can read a column without converting the batch into a data frame and back.
+    A value missing in a record is stored as `None`.
+    """
+
+    def __init__(self, columns: Optional[Dict[str, List[Any]]] = None):
+        self.columns: Dict[str, List[Any]] = columns or {}
+        self.length = len(next(iter(self.columns.values()))) if self.columns else 0
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Dict[str, Any]]) -> "Records":
+        records = cls()
+        for row in rows:
+            records.append(row)
+        return records
+
+    def append(self, row: Dict[str, Any]):
+        for key, value in row.items():
+            column = self.columns.get(key)
+            if column is None:
+                column = self.columns[key] = [None] * self.length
+            column.append(value)
+        self.length += 1
+        if len(row) < len(self.columns):
+            for column in self.columns.values():
+                if len(column) < self.length:
+                    column.append(None)
+
+    def __len__(self) -> int:
+        return self.length
+
+    def __contains__(self, column: str) -> bool:
+        return column in self.columns
+
+    def __getitem__(self, column: str) -> List[Any]:
+        return self.columns[column]
+
+    def rows(self, exclude_columns: Iterable[str] = ()) -> Iterator[Dict[str, Any]]:
+        """Yields the records as dictionaries without the excluded columns."""
+        excluded = set(exclude_columns)
+        names = [name for name in self.columns if name not in excluded]
+        for values in zip(*(self.columns[name] for name in names)):
+            yield dict(zip(names, values))
+
+
 class BaseReader(collections.abc.Iterable):
     """Reader has a role to parse files and return a Record iterator."""
 
@@ -34,7 +89,7 @@ class BaseReader(collections.abc.Iterable):
         raise NotImplementedError("Please implement this method in the subclass.")
 
     @abc.abstractmethod
-    def batch(self, batch_size: int) -> Iterator[pd.DataFrame]:
+    def batch(self, batch_size: int, skip: int = 0) -> Iterator[Records]:
         raise NotImplementedError("Please implement this method in the subclass.")
 
 
@@ -51,40 +106,104 @@ class Parser(abc.ABC):
         """Returns parsing errors."""
         return []
 
+    def split(self, filename: str, segment_size: int) -> List[Segment]:
+        """Splits the file into segments of about `segment_size` bytes that can be parsed independently.
+        Returns an empty list if the file can't be split."""
+        return []
+
+    def parse_segment(self, filename: str, segment: Segment) -> Iterator[Dict[Any, Any]]:
+        """Parses a segment of the file returned by `split`."""
+        raise NotImplementedError("The parser doesn't support splitting a file.")
+
+
+class ColumnarParser(Parser):
+    """The abstract parser of a columnar file format.
+
+    The columns are read in batches, so that the reader can make `Records` from them
+    without building a dictionary for each record.
+    """
+
+    @abc.abstractmethod
+    def parse_columns(self, filename: str, batch_size: int) -> Iterator[Dict[str, List[Any]]]:
+        """Yields the values of up to `batch_size` records at a time, column by column.
+        The line number column holds the position of each record in the file, starting at 1."""
+        raise NotImplementedError("Please implement this method in the subclass.")
+
+    def parse(self, filename: str) -> Iterator[Dict[Any, Any]]:
+        for columns in self.parse_columns(filename, batch_size=1000):
+            yield from Records(columns).rows()
+
 
 @dataclasses.dataclass
 class FileName:
     full_path: str
     generated_name: str
     upload_name: str
+    upload_id: str = ""
+    segment: Optional[Segment] = None
 
 
 class Reader(BaseReader):
     def __init__(self, filenames: List[FileName], parser: Parser):
         self.filenames = filenames
         self.parser = parser
+        self._errors: List[FileParseException] = []
 
     def __iter__(self) -> Iterator[Dict[Any, Any]]:
         for filename in self.filenames:
-            rows = self.parser.parse(filename.full_path)
-            for row in rows:
-                yield {
-                    UUID_COLUMN: uuid.uuid4(),
-                    FILE_NAME_COLUMN: filename.generated_name,
-                    UPLOAD_NAME_COLUMN: filename.upload_name,
-                    **row,
-                }
-
-    def batch(self, batch_size: int) -> Iterator[pd.DataFrame]:
-        batch = []
-        for record in self:
+            if filename.segment is None:
+                rows = self.parser.parse(filename.full_path)
+            else:
+                rows = self.parser.parse_segment(filename.full_path, filename.segment)
+            line_num = 0
+            try:
+                for row in rows:
+                    line_num = row.get(LINE_NUMBER_COLUMN, line_num)
+                    yield {
+                        UUID_COLUMN: uuid.uuid4(),
+                        FILE_NAME_COLUMN: filename.generated_name,
+                        UPLOAD_NAME_COLUMN: filename.upload_name,
+                        **row,
+                    }
+            except DECOMPRESSION_ERRORS as e:
+                # The rest of a corrupted or truncated compressed file can't be read.
+                self._errors.append(FileParseException(filename.upload_name, line_num, str(e)))
+
+    def batch(self, batch_size: int, skip: int = 0) -> Iterator[Records]:
+        """Yields the records in batches, leaving out the first `skip` records."""
+        if isinstance(self.parser, ColumnarParser):
+            yield from self.batch_columns(self.parser, batch_size, skip)
+            return
+        batch = Records()
+        for record in itertools.islice(self, skip, None):
             batch.append(record)
             if len(batch) == batch_size:
-                yield pd.DataFrame(batch)
-                batch = []
+                yield batch
+                batch = Records()
         if batch:
-            yield pd.DataFrame(batch)
+            yield batch
+
+    def batch_columns(self, parser: ColumnarParser, batch_size: int, skip: int) -> Iterator[Records]:
+        """Yields the batches of the columnar parser as they are. A batch doesn't span files."""
+        for filename in self.filenames:
+            for columns in parser.parse_columns(filename.full_path, batch_size):
+                size = len(next(iter(columns.values()), []))
+                if skip >= size:
+                    skip -= size
+                    continue
+                if skip:
+                    columns = {name: values[skip:] for name, values in columns.items()}
+                    size -= skip
+                    skip = 0
+                yield Records(
+                    {
+                        UUID_COLUMN: [uuid.uuid4() for _ in range(size)],
+                        FILE_NAME_COLUMN: [filename.generated_name] * size,
+                        UPLOAD_NAME_COLUMN: [filename.upload_name] * size,
+                        **columns,
+                    }
+                )
 
     @property
     def errors(self) -> List[FileParseException]:
-        return self.parser.errors
+        return self.parser.errors + self._errors
@@ -0,0 +1,177 @@
+"""
+Split line-oriented files into segments that can be parsed independently.
+
+A segment is a range of bytes that starts at the beginning of a record and ends
+right after a newline. The number of records before the segment is counted while
+scanning, so the line numbers in the errors stay the same as in the whole file.
+"""
+import codecs
+import dataclasses
+import io
+import re
+from typing import IO, Iterator, List
+
+BLOCK_SIZE = 1024 * 1024
+
+
+@dataclasses.dataclass(frozen=True)
+class Segment:
+    index: int
+    start: int
+    end: int
+    records_before: int
+
+
+def is_splittable(encoding: str) -> bool:
+    """Returns whether a newline is a single `\\n` byte in the encoding, so that the bytes can be split at it."""
+    try:
+        return "\n".encode(encoding) in (b"\n", codecs.BOM_UTF8 + b"\n")
+    except LookupError:
+        return False
+
+
+def make_segments(boundaries: List[int], records: List[int], size: int) -> List[Segment]:
+    starts = [0, *boundaries]
+    ends = [*boundaries, size]
+    counts = [0, *records]
+    return [
+        Segment(index=i, start=start, end=end, records_before=count)
+        for i, (start, end, count) in enumerate(zip(starts, ends, counts))
+        if start < end or i == 0
+    ]
+
+
+def file_size(f: IO[bytes]) -> int:
+    size = f.seek(0, io.SEEK_END)
+    f.seek(0)
+    return size
+
+
+def split_lines(f: IO[bytes], segment_size: int) -> List[Segment]:
+    """Splits the file at the first newline after every `segment_size` bytes.
+
+    The records of a segment are its lines.
+    """
+    size = file_size(f)
+    boundaries: List[int] = []
+    records: List[int] = []
+    target = segment_size
+    offset = 0
+    lines = 0
+    while target < size:
+        block = f.read(BLOCK_SIZE)
+        if not block:
+            break
+        while target < offset + len(block):
+            newline = block.find(b"\n", max(target - offset - 1, 0))
+            if newline == -1:
+                break
+            boundary = offset + newline + 1
+            boundaries.append(boundary)
+            records.append(lines + block.count(b"\n", 0, newline + 1))
+            target = boundary + segment_size
+        lines += block.count(b"\n")
+        offset += len(block)
+    return make_segments(boundaries, records, size)
+
+
+# The states of the CSV reader at a byte, as in the `csv` module with the default dialect.
+START_FIELD = 0
+IN_FIELD = 1
+IN_QUOTED_FIELD = 2
+QUOTE_IN_QUOTED_FIELD = 3
+
+
+def iter_csv_record_ends(f: IO[bytes], delimiter: bytes = b",") -> Iterator[int]:
+    """Yields the offsets right after the newlines that end non-empty CSV records.
+
+    The quotes are tracked in the same way as the `csv` module: a quote starts a quoted field only at
+    the start of a field, and a doubled quote in a quoted field is an escaped quote. A newline in a quoted
+    field doesn't end the record. Only the quotes, the delimiters and the newlines are looked at,
+    and the other bytes between them are told by the gap between the offsets.
+    """
+    special_bytes = re.compile(b"[" + re.escape(b'"\n' + delimiter) + b"]")
+    offset = 0
+    state = START_FIELD
+    last_end = 0
+    last_byte = b""
+    # The offset of the last special byte. The BOM isn't a part of the first field.
+    last_special = len(codecs.BOM_UTF8) - 1 if f.read(len(codecs.BOM_UTF8)) == codecs.BOM_UTF8 else -1
+    f.seek(0)
+    while True:
+        block = f.read(BLOCK_SIZE)
+        if not block:
+            return
+        for match in special_bytes.finditer(block):
+            position = offset + match.start()
+            if position > last_special + 1 and state in (START_FIELD, QUOTE_IN_QUOTED_FIELD):
+                state = IN_FIELD
+            last_special = position
+            char = match.group()
+            if char == b'"':
+                if state == START_FIELD or state == QUOTE_IN_QUOTED_FIELD:
+                    state = IN_QUOTED_FIELD
+                elif state == IN_QUOTED_FIELD:
+                    state = QUOTE_IN_QUOTED_FIELD
+                continue
+            if state == IN_QUOTED_FIELD:
+                continue
+            state = START_FIELD
+            if char == delimiter:
+                continue
+            end = offset + match.end()
+            # An empty line is skipped by the CSV reader, so it doesn't count as a record.
+            before = block[match.start() - 1 : match.start()] if match.start() else last_byte
+            if end - last_end > 2 or (end - last_end == 2 and before != b"\r"):
+                yield end
+            last_end = end
+        offset += len(block)
+        last_byte = block[-1:]
+
+
+def split_csv(f: IO[bytes], segment_size: int, delimiter: bytes = b",") -> List[Segment]:
+    """Splits the file at the end of the first CSV record after every `segment_size` bytes.
+
+    The records before a segment include the header.
+    """
+    size = file_size(f)
+    boundaries: List[int] = []
+    records: List[int] = []
+    target = segment_size
+    for count, end in enumerate(iter_csv_record_ends(f, delimiter), start=1):
+        if target >= size:
+            break
+        if end >= target and end < size:
+            boundaries.append(end)
+            records.append(count)
+            target = end + segment_size
+    return make_segments(boundaries, records, size)
+
+
+class SegmentIO(io.RawIOBase):
+    """A binary stream that reads the bytes of a segment of the file."""
+
+    def __init__(self, filename: str, segment: Segment):
+        self.f = open(filename, "rb")
+        self.f.seek(segment.start)
+        self.remaining = segment.end - segment.start
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        size = min(len(buffer), self.remaining)
+        if size <= 0:
+            return 0
+        n = self.f.readinto(memoryview(buffer)[:size])
+        self.remaining -= n
+        return n
+
+    def close(self):
+        self.f.close()
+        super().close()
+
+
+def open_segment(filename: str, segment: Segment, encoding: str) -> IO[str]:
+    """Opens the segment of the file in text mode in the same way as `open`."""
+    return io.TextIOWrapper(io.BufferedReader(SegmentIO(filename, segment)), encoding=encoding)
@@ -0,0 +1,135 @@
+"""
+Decode the tags of the CoNLL format into entities.
+
+The decoder extracts the same entities as `seqeval.scheme.Tokens` in the strict mode,
+but the patterns of the scheme are expanded into sets of
+`(previous prefix, current prefix, same type)` once, and each distinct tag is split
+into its prefix and type only once. The sentences of a batch are decoded in a single
+pass over their tags joined by an `O` tag, which ends an entity in the same way as
+the end of a sentence does.
+"""
+import itertools
+from typing import Dict, FrozenSet, Iterable, List, Sequence, Tuple
+
+Entity = Tuple[int, int, str]
+Pattern = Tuple[str, str, bool]
+
+OUTSIDE = ("O", "_")
+ANY_PREFIX = "IOBESUL"
+SAME, DIFF, ANY_TYPE = (True,), (False,), (True, False)
+
+
+def expand(patterns: Iterable[Tuple[str, str, Tuple[bool, ...]]]) -> FrozenSet[Pattern]:
+    return frozenset(
+        (prev, current, same)
+        for prev_prefixes, current_prefixes, conditions in patterns
+        for prev, current, same in itertools.product(prev_prefixes, current_prefixes, conditions)
+    )
+
+
+class Scheme:
+    def __init__(self, allowed: str, start, inside, end):
+        self.allowed = allowed
+        self.start = expand(start)
+        self.inside = expand(inside)
+        self.end = expand(end)
+
+
+SCHEMES = {
+    "IOB2": Scheme(
+        allowed="IOB",
+        start=[(ANY_PREFIX, "B", ANY_TYPE)],
+        inside=[("BI", "I", SAME)],
+        end=[("I", "OB", ANY_TYPE), ("I", "I", DIFF), ("B", "OB", ANY_TYPE), ("B", "I", DIFF)],
+    ),
+    "IOE2": Scheme(
+        allowed="IOE",
+        start=[("OE", "IE", ANY_TYPE), ("I", "IE", DIFF)],
+        inside=[("I", "IE", SAME)],
+        end=[("E", ANY_PREFIX, ANY_TYPE)],
+    ),
+    "IOBES": Scheme(
+        allowed="IOBES",
+        start=[(ANY_PREFIX, "BS", ANY_TYPE)],
+        inside=[("BI", "IE", SAME)],
+        end=[("SE", ANY_PREFIX, ANY_TYPE)],
+    ),
+    "BILOU": Scheme(
+        allowed="BILOU",
+        start=[(ANY_PREFIX, "BU", ANY_TYPE)],
+        inside=[("BI", "IL", SAME)],
+        end=[("UL", ANY_PREFIX, ANY_TYPE)],
+    ),
+}
+
+
+class TagDecoder:
+    """Extracts the entities from the tags in a tagging scheme.
+
+    Attributes:
+        scheme: The name of the tagging scheme. It supports `IOB2`, `IOE2`, `IOBES`, and `BILOU`.
+    """
+
+    def __init__(self, scheme: str):
+        self.scheme = SCHEMES[scheme]
+        self.tags: Dict[str, Tuple[str, str]] = {}
+
+    def split(self, tag: str) -> Tuple[str, str]:
+        """Splits the tag into its prefix and type, e.g. `B-PER` into `B` and `PER`."""
+        try:
+            return self.tags[tag]
+        except KeyError:
+            pass
+        prefix = tag[:1]
+        if not prefix or prefix not in self.scheme.allowed:
+            message = "Invalid token is found: {}. Allowed prefixes are: {}."
+            raise ValueError(message.format(tag, "|".join(self.scheme.allowed)))
+        self.tags[tag] = prefix, tag[1:].strip("-") or "_"
+        return self.tags[tag]
+
+    def decode(self, tags: Sequence[str]) -> List[Entity]:
+        """Returns the entities as `(start, end, type)`, where `start` and `end` are token indices."""
+        return self.decode_batch([tags])[0]
+
+    def decode_batch(self, sequences: Sequence[Sequence[str]]) -> List[List[Entity]]:
+        """Returns the entities of each sentence in the same way as `decode`."""
+        split = self.split
+        tokens = [OUTSIDE]
+        offsets = []
+        for tags in sequences:
+            offsets.append(len(tokens))
+            tokens.extend(split(tag) for tag in tags)
+            tokens.append(OUTSIDE)
+
+        start_patterns, inside_patterns, end_patterns = self.scheme.start, self.scheme.inside, self.scheme.end
+        entities: List[Entity] = []
+        i, last = 1, len(tokens)
+        prev_prefix, prev_type = OUTSIDE
+        while i < last:
+            prefix, type_ = tokens[i]
+            if (prev_prefix, prefix, prev_type == type_) in start_patterns:
+                # The outside token at the end of each sentence stops the loop.
+                j = i + 1
+                while (tokens[j - 1][0], tokens[j][0], tokens[j - 1][1] == tokens[j][1]) in inside_patterns:
+                    j += 1
+                if (tokens[j - 1][0], tokens[j][0], tokens[j - 1][1] == tokens[j][1]) in end_patterns:
+                    entities.append((i, j, type_))
+                i = j
+            else:
+                i += 1
+            prev_prefix, prev_type = tokens[i - 1]
+
+        batch: List[List[Entity]] = [[] for _ in sequences]
+        sentence = 0
+        for start, end, type_ in entities:
+            while sentence + 1 < len(offsets) and offsets[sentence + 1] <= start:
+                sentence += 1
+            offset = offsets[sentence]
+            batch[sentence].append((start - offset, end - offset, type_))
+        return batch
+
+
+def align_spans(words: Sequence[str], entities: Iterable[Entity], delimiter: str) -> List[Entity]:
+    """Converts the token indices of the entities into the character offsets in the words joined by the delimiter."""
+    starts = [0, *itertools.accumulate(len(word) + len(delimiter) for word in words)]
+    return [(starts[start], starts[end] - len(delimiter), type_) for start, end, type_ in entities]
@@ -0,0 +1,36 @@
+"""
+Checks for the common cases of the imported values.
+
+The data and label models are created with `model_construct`, skipping the pydantic
+validation, when these checks pass, because the validation wouldn't change the values.
+Otherwise, the models are validated as usual so that the errors are reported in the same way.
+"""
+import uuid
+from typing import Any, Dict, Iterable
+
+
+def is_uuid4(value: Any) -> bool:
+    return isinstance(value, uuid.UUID) and value.version == 4
+
+
+def is_str(value: Any) -> bool:
+    return type(value) is str
+
+
+def is_non_empty_str(value: Any) -> bool:
+    return type(value) is str and value != ""
+
+
+def is_int(value: Any) -> bool:
+    return type(value) is int
+
+
+def is_non_negative_int(value: Any) -> bool:
+    return type(value) is int and value >= 0
+
+
+def has_only_keys(values: Dict[str, Any], required: Iterable[str], optional: Iterable[str] = ()) -> bool:
+    if not isinstance(values, dict):
+        return False
+    keys = values.keys()
+    return set(required) <= keys and keys <= {*required, *optional}
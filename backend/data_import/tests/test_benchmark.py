@@ -0,0 +1,52 @@
+import io
+import json
+import os
+import shutil
+import tempfile
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from examples.models import Example
+from projects.models import Project
+
+
+class TestBenchmarkImport(TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.output = os.path.join(self.test_dir, "results.json")
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def test_import_every_task_and_format(self):
+        options = {"size": 5, "batch_size": 2, "output": self.output, "no_test_database": True}
+        call_command("benchmark_import", stdout=io.StringIO(), **options)
+        with open(self.output) as f:
+            results = json.load(f)
+        self.assertGreater(len(results["results"]), 0)
+        for result in results["results"]:
+            with self.subTest(task=result["task"], format=result["format"]):
+                self.assertEqual(result["records"], 5)
+                self.assertEqual(result["errors"], 0)
+                self.assertGreater(result["stages"]["save examples"]["queries"], 0)
+        self.assertEqual(Project.objects.count(), 0)
+        self.assertEqual(Example.objects.count(), 0)
+
+    def test_steps(self):
+        expected = {
+            "batches": ["DataFrame", "Records"],
+            "conll": ["seqeval", "TagDecoder"],
+            "json": ["json decode", "json encode", "data frame encode", "pandas to_json encode"],
+        }
+        for mode, names in expected.items():
+            with self.subTest(mode=mode):
+                options = {"mode": mode, "size": 20, "batch_size": 10, "output": self.output}
+                call_command("benchmark_import", stdout=io.StringIO(), **options)
+                with open(self.output) as f:
+                    results = json.load(f)
+                self.assertEqual(results["mode"], mode)
+                result_names = [result["name"] for result in results["results"]]
+                self.assertTrue(set(names) <= set(result_names))
+                for result in results["results"]:
+                    self.assertEqual(result["records"], 20)
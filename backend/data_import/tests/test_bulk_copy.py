@@ -0,0 +1,63 @@
+import datetime
+import unittest
+import uuid
+
+from django.db import connection
+from django.test import TestCase
+from model_mommy import mommy
+
+from data_import.pipeline.bulk_copy import (
+    copy_fields,
+    copy_from,
+    to_copy_rows,
+    to_copy_value,
+)
+from labels.models import Span
+from projects.models import ProjectType
+from projects.tests.utils import prepare_project
+
+
+class TestCopyValue(unittest.TestCase):
+    def test_null(self):
+        self.assertEqual(to_copy_value(None), "\\N")
+
+    def test_bool(self):
+        self.assertEqual(to_copy_value(True), "t")
+        self.assertEqual(to_copy_value(False), "f")
+
+    def test_escape_special_characters(self):
+        self.assertEqual(to_copy_value("a\tb\nc\rd\\e"), "a\\tb\\nc\\rd\\\\e")
+
+    def test_other_values(self):
+        self.assertEqual(to_copy_value(1), "1")
+        self.assertEqual(to_copy_value(0.5), "0.5")
+        self.assertEqual(to_copy_value(datetime.date(2022, 1, 2)), "2022-01-02")
+
+
+class TestCopyRows(TestCase):
+    def setUp(self):
+        self.project = prepare_project(ProjectType.SEQUENCE_LABELING)
+        self.example = mommy.make("Example", project=self.project.item)
+        self.label = mommy.make("SpanType", project=self.project.item)
+
+    def make_spans(self):
+        return [
+            Span(example=self.example, user=self.project.admin, label=self.label, start_offset=i, end_offset=i + 1)
+            for i in range(3)
+        ]
+
+    def test_write_one_line_per_object(self):
+        lines = to_copy_rows(Span, self.make_spans()).read().splitlines()
+        self.assertEqual(len(lines), 3)
+        for i, line in enumerate(lines):
+            values = line.split("\t")
+            self.assertEqual(len(values), len(copy_fields(Span)))
+            self.assertEqual(values[-2:], [str(i), str(i + 1)])
+
+    @unittest.skipUnless(connection.vendor == "postgresql", "COPY is only supported by PostgreSQL")
+    def test_copy_from(self):
+        spans = self.make_spans()
+        copy_from(Span, spans)
+        saved = Span.objects.order_by("start_offset")
+        self.assertEqual([span.uuid for span in saved], [span.uuid for span in spans])
+        self.assertIsInstance(saved[0].uuid, uuid.UUID)
@@ -0,0 +1,97 @@
+import bz2
+import gzip
+import lzma
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from data_import.pipeline import compression
+from data_import.pipeline.compression import (
+    BZIP2,
+    GZIP,
+    XZ,
+    ZSTD,
+    DecompressedSizeError,
+    detect_compression,
+    open_binary,
+)
+
+
+class TestCompression(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.test_file = os.path.join(self.test_dir, "test_file")
+        self.content = b"Hello, World!\n" * 100
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def create_file(self, content: bytes):
+        with open(self.test_file, "wb") as f:
+            f.write(content)
+
+    def test_detect_compression(self):
+        compressions = [
+            (GZIP, gzip.compress),
+            (BZIP2, bz2.compress),
+            (XZ, lzma.compress),
+        ]
+        for expected, compress in compressions:
+            with self.subTest(compression=expected):
+                self.create_file(compress(self.content))
+                self.assertEqual(detect_compression(self.test_file), expected)
+                with open_binary(self.test_file) as f:
+                    self.assertEqual(f.read(), self.content)
+
+    @unittest.skipUnless(compression.zstandard, "zstandard is not installed")
+    def test_detect_zstd(self):
+        self.create_file(compression.zstandard.compress(self.content))
+        self.assertEqual(detect_compression(self.test_file), ZSTD)
+        with open_binary(self.test_file) as f:
+            self.assertEqual(f.read(), self.content)
+
+    def test_zstd_without_zstandard(self):
+        self.create_file(b"\x28\xb5\x2f\xfd")
+        with patch.object(compression, "zstandard", None):
+            with self.assertRaisesRegex(OSError, r"doccano\[zstd\]"):
+                open_binary(self.test_file)
+
+    def test_detect_empty_bzip2(self):
+        self.create_file(bz2.compress(b""))
+        self.assertEqual(detect_compression(self.test_file), BZIP2)
+
+    def test_not_compressed(self):
+        for content in [self.content, b"BZh9 is not bzip2", b""]:
+            with self.subTest(content=content):
+                self.create_file(content)
+                self.assertIsNone(detect_compression(self.test_file))
+                with open_binary(self.test_file) as f:
+                    self.assertEqual(f.read(), content)
+
+    @unittest.skipUnless(compression.zstandard, "zstandard is not installed")
+    def test_read_zstd_frames(self):
+        zstandard = compression.zstandard
+        self.create_file(zstandard.compress(b"Hello, ") + zstandard.compress(b"World!"))
+        with open_binary(self.test_file) as f:
+            self.assertEqual(f.read(), b"Hello, World!")
+
+    def test_truncated_file(self):
+        self.create_file(gzip.compress(self.content)[:-10])
+        with open_binary(self.test_file) as f:
+            with self.assertRaises(EOFError):
+                f.read()
+
+    def test_max_size(self):
+        self.create_file(gzip.compress(self.content))
+        with open_binary(self.test_file, max_size=len(self.content)) as f:
+            self.assertEqual(f.read(), self.content)
+        with open_binary(self.test_file, max_size=len(self.content) - 1) as f:
+            with self.assertRaises(DecompressedSizeError):
+                f.read()
+
+    def test_max_size_of_uncompressed_file(self):
+        self.create_file(self.content)
+        with open_binary(self.test_file, max_size=1) as f:
+            self.assertEqual(f.read(), self.content)
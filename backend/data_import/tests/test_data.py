@@ -57,3 +57,35 @@ class TestBinaryData(TestCase):
         self.assertIsInstance(example, Example)
         self.assertEqual(example.uuid, self.dic["example_uuid"])
         self.assertEqual(example.text, None)
+
+
+class TestTextDataValidation(TestCase):
+    def setUp(self):
+        self.dic = {
+            "example_uuid": uuid.uuid4(),
+            "filename": "test.txt",
+            "upload_name": "test.txt",
+            "text": "test",
+            "key": "value",
+        }
+
+    def test_parse_valid_values_equals_validated_model(self):
+        data = TextData.parse(**self.dic)
+        expected = TextData(
+            uuid=self.dic["example_uuid"],
+            filename="test.txt",
+            upload_name="test.txt",
+            text="test",
+            meta={"key": "value"},
+        )
+        self.assertEqual(data.model_dump(), expected.model_dump())
+
+    def test_parse_coerces_uuid_string(self):
+        self.dic["example_uuid"] = str(self.dic["example_uuid"])
+        data = TextData.parse(**self.dic)
+        self.assertEqual(str(data.uuid), self.dic["example_uuid"])
+
+    def test_parse_non_string_text_raises_value_error(self):
+        self.dic["text"] = 1
+        with self.assertRaises(ValueError):
+            TextData.parse(**self.dic)
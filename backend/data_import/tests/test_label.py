@@ -82,6 +82,22 @@ class TestSpanLabel(TestLabel):
         self.assertEqual(span.start_offset, 0)
         self.assertEqual(span.end_offset, 1)
 
+    def test_parse_dict_with_id(self):
+        span = SpanLabel.parse(uuid.uuid4(), obj={"id": 3, "label": "A", "start_offset": 0, "end_offset": 1})
+        self.assertEqual(span.id, 3)
+
+    def test_parse_equals_validated_model(self):
+        example_uuid = uuid.uuid4()
+        span = SpanLabel.parse(example_uuid, obj=[0, 1, "A"])
+        expected = SpanLabel(label="A", start_offset=0, end_offset=1, example_uuid=example_uuid)
+        self.assertEqual(span.model_dump(exclude={"uuid"}), expected.model_dump(exclude={"uuid"}))
+        self.assertNotEqual(span.uuid, expected.uuid)
+
+    def test_parse_invalid_offset(self):
+        for obj in [[1, 0, "A"], [-1, 1, "A"], [0, 1, ""], [0, "x", "A"]]:
+            with self.subTest(obj=obj), self.assertRaises(ValueError):
+                SpanLabel.parse(uuid.uuid4(), obj=obj)
+
     def test_invalid_negative_offset(self):
         with self.assertRaises(ValueError):
             SpanLabel(label="A", start_offset=-1, end_offset=1, example_uuid=uuid.uuid4())
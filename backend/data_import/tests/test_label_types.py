@@ -27,3 +27,24 @@ class TestCategoryLabel(TestCase):
         label_types.update(self.project.item)
         category_type = label_types["A"]
         self.assertEqual(category_type.text, "A")
+
+    def test_save_and_update_only_new_types(self):
+        label_types = LabelTypes(CategoryType)
+        label_types.save([CategoryType(text=text, project=self.project.item) for text in ["A", "B", "A"]])
+        label_types.update(self.project.item)
+        with self.assertNumQueries(0):
+            label_types.save([CategoryType(text=text, project=self.project.item) for text in ["A", "B"]])
+            label_types.update(self.project.item)
+        with self.assertNumQueries(2):
+            label_types.save([CategoryType(text=text, project=self.project.item) for text in ["A", "C"]])
+            label_types.update(self.project.item)
+        self.assertEqual(CategoryType.objects.count(), 3)
+        self.assertEqual(sorted(label_types.types), ["A", "B", "C"])
+
+    def test_update_existing_type(self):
+        existing_type = mommy.make("CategoryType", text="A", project=self.project.item)
+        label_types = LabelTypes(CategoryType)
+        label_types.save([CategoryType(text="A", project=self.project.item)])
+        label_types.update(self.project.item)
+        self.assertEqual(label_types["A"], existing_type)
+        self.assertEqual(CategoryType.objects.count(), 1)
@@ -1,7 +1,7 @@
 import uuid
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 
-from django.test import TestCase
+from django.test import TestCase, override_settings
 from model_mommy import mommy
 
 from data_import.models import DummyLabelType
@@ -105,6 +105,22 @@ class TestSpans(TestCase):
         self.spans.save(self.user, self.examples)
         self.assertEqual(Span.objects.count(), 3)
 
+    @override_settings(IMPORT_LABELS_WITH_COPY=True)
+    def test_save_with_copy(self):
+        self.spans.save_types(self.project.item)
+        self.spans.save(self.user, self.examples)
+        self.assertEqual(Span.objects.count(), 3)
+
+    @override_settings(IMPORT_LABELS_WITH_COPY=True)
+    @patch("data_import.pipeline.labels.copy_from")
+    @patch("data_import.pipeline.labels.can_copy", return_value=True)
+    def test_save_uses_copy_on_postgresql(self, can_copy, copy_from):
+        self.spans.save_types(self.project.item)
+        self.spans.save(self.user, self.examples)
+        model, labels = copy_from.call_args.args
+        self.assertEqual(model, Span)
+        self.assertEqual(len(labels), 3)
+
     def test_save_types(self):
         self.spans.save_types(self.project.item)
         self.assertEqual(SpanType.objects.count(), 2)
@@ -1,16 +1,16 @@
 import uuid
 
-import pandas as pd
 from django.test import TestCase
 
 from data_import.pipeline.data import TextData
-from data_import.pipeline.label import CategoryLabel
+from data_import.pipeline.label import CategoryLabel, SpanLabel
 from data_import.pipeline.makers import ExampleMaker, LabelMaker
 from data_import.pipeline.readers import (
     FILE_NAME_COLUMN,
     LINE_NUMBER_COLUMN,
     UPLOAD_NAME_COLUMN,
     UUID_COLUMN,
+    Records,
 )
 from projects.tests.utils import prepare_project
 
@@ -31,21 +31,21 @@ class TestExamplesMaker(TestCase):
         self.maker = ExampleMaker(self.project.item, TextData, self.text_column, [self.label_column])
 
     def test_make_examples(self):
-        df = pd.DataFrame([self.record])
-        examples = self.maker.make(df)
+        records = Records.from_rows([self.record])
+        examples = self.maker.make(records)
         self.assertEqual(len(examples), 1)
 
     def test_check_column_existence(self):
         self.record.pop(self.text_column)
-        df = pd.DataFrame([self.record])
-        examples = self.maker.make(df)
+        records = Records.from_rows([self.record])
+        examples = self.maker.make(records)
         self.assertEqual(len(examples), 0)
         self.assertEqual(len(self.maker.errors), 1)
 
     def test_empty_text_raises_error(self):
         self.record[self.text_column] = ""
-        df = pd.DataFrame([self.record])
-        examples = self.maker.make(df)
+        records = Records.from_rows([self.record])
+        examples = self.maker.make(records)
         self.assertEqual(len(examples), 0)
         self.assertEqual(len(self.maker.errors), 1)
 
@@ -54,7 +54,7 @@ class TestLabelFormatter(TestCase):
     def setUp(self):
         self.label_column = "label"
         self.label_class = CategoryLabel
-        self.df = pd.DataFrame(
+        self.records = Records.from_rows(
             [
                 {LINE_NUMBER_COLUMN: 1, UUID_COLUMN: uuid.uuid4(), self.label_column: ["A"]},
                 {LINE_NUMBER_COLUMN: 2, UUID_COLUMN: uuid.uuid4(), self.label_column: ["B", "C"]},
@@ -63,7 +63,7 @@ class TestLabelFormatter(TestCase):
 
     def test_make(self):
         label_maker = LabelMaker(column=self.label_column, label_class=self.label_class)
-        labels = label_maker.make(self.df)
+        labels = label_maker.make(self.records)
         self.assertEqual(len(labels), 3)
         with self.subTest():
             for label, expected in zip(labels, ["A", "B", "C"]):
@@ -72,11 +72,11 @@ class TestLabelFormatter(TestCase):
     def test_format_without_specified_column(self):
         label_maker = LabelMaker(column="invalid_column", label_class=self.label_class)
         with self.assertRaises(KeyError):
-            label_maker.make(self.df)
+            label_maker.make(self.records)
 
     def test_format_with_partially_correct_column(self):
         label_maker = LabelMaker(column=self.label_column, label_class=self.label_class)
-        df = pd.DataFrame(
+        records = Records.from_rows(
             [
                 {LINE_NUMBER_COLUMN: 1, UUID_COLUMN: uuid.uuid4(), self.label_column: ["A"]},
                 {LINE_NUMBER_COLUMN: 2, UUID_COLUMN: uuid.uuid4(), "invalid_column": ["B"]},
@@ -84,5 +84,73 @@ class TestLabelFormatter(TestCase):
                 {LINE_NUMBER_COLUMN: 3, UUID_COLUMN: uuid.uuid4(), self.label_column: [{}]},
             ]
         )
-        labels = label_maker.make(df)
+        labels = label_maker.make(records)
         self.assertEqual(len(labels), 1)
+
+
+class TestBatchValidation(TestCase):
+    """The checks of the batch must accept only the values that pydantic accepts as they are."""
+
+    def test_examples(self):
+        texts = ["text", "", 1, None, ["text"]]
+        rows = [
+            {
+                LINE_NUMBER_COLUMN: i,
+                UUID_COLUMN: uuid.uuid4(),
+                FILE_NAME_COLUMN: "file1",
+                UPLOAD_NAME_COLUMN: "upload1",
+                "text": text,
+            }
+            for i, text in enumerate(texts)
+        ]
+        records = Records.from_rows(rows)
+        valid = ExampleMaker(prepare_project().item, TextData).validate(records, "text")
+        self.assertEqual(valid, [True, False, False, False, False])
+        for is_valid, row in zip(valid, rows):
+            row = {key: value for key, value in row.items() if key != LINE_NUMBER_COLUMN}
+            with self.subTest(text=row["text"]):
+                try:
+                    TextData.parse_invalid(**row)
+                except ValueError:
+                    self.assertFalse(is_valid)
+                    continue
+                if is_valid:
+                    expected = TextData.parse_invalid(**row).model_dump()
+                    self.assertEqual(TextData.parse_valid(**row).model_dump(), expected)
+
+    def test_labels(self):
+        objs = [
+            (0, 1, "A"),
+            {"id": 3, "start_offset": 0, "end_offset": 1, "label": "A"},
+            (1, 0, "A"),
+            (-1, 1, "A"),
+            (0, 1, ""),
+            ("0", "1", "A"),
+            {"start_offset": 0, "label": "A"},
+            {"start_offset": 0, "end_offset": 1, "label": "A", "extra": 1},
+            {"id": "3", "start_offset": 0, "end_offset": 1, "label": "A"},
+        ]
+        example_uuids = [uuid.uuid4() for _ in objs]
+        values = [SpanLabel.to_values(obj) for obj in objs]
+        valid = SpanLabel.validate_batch(example_uuids, values)
+        self.assertEqual(valid, [True, True, False, False, False, False, False, False, False])
+        for is_valid, example_uuid, label_values in zip(valid, example_uuids, values):
+            with self.subTest(values=label_values):
+                try:
+                    validated = SpanLabel.parse_invalid(example_uuid, label_values)
+                except ValueError:
+                    self.assertFalse(is_valid)
+                    continue
+                if is_valid:
+                    constructed = SpanLabel.parse_valid(example_uuid, label_values)
+                    self.assertEqual(constructed.model_dump(exclude={"uuid"}), validated.model_dump(exclude={"uuid"}))
+
+    def test_maker_keeps_the_labels_accepted_by_pydantic(self):
+        records = Records.from_rows(
+            [
+                {UUID_COLUMN: uuid.uuid4(), "label": [(0, 1, "A"), (1, 0, "A"), ("0", "1", "B"), {"label": "C"}]},
+            ]
+        )
+        labels = LabelMaker(column="label", label_class=SpanLabel).make(records)
+        spans = [(label.start_offset, label.end_offset, label.label) for label in labels]
+        self.assertEqual(spans, [(0, 1, "A"), (0, 1, "B")])
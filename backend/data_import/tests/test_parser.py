@@ -1,11 +1,30 @@
+import bz2
+import datetime
+import decimal
+import functools
+import gzip
+import io
 import json
+import lzma
 import os
 import shutil
 import tempfile
 import unittest
+from unittest.mock import patch
 
-from data_import.pipeline import parsers
-from data_import.pipeline.readers import LINE_NUMBER_COLUMN
+import openpyxl
+from django.core.cache import cache
+from django.test import override_settings
+
+from data_import.pipeline import compression, parsers
+from data_import.pipeline.readers import LINE_NUMBER_COLUMN, Records
+
+try:
+    import pyarrow
+    import pyarrow.ipc
+    import pyarrow.parquet
+except ImportError:  # pragma: no cover
+    pyarrow = None  # type: ignore
 
 
 class TestParser(unittest.TestCase):
@@ -31,6 +50,46 @@ class TestParser(unittest.TestCase):
             next(it)
 
 
+class TestDetectEncoding(TestParser):
+    def create_binary_file(self, content: bytes):
+        with open(self.test_file, "wb") as f:
+            f.write(content)
+
+    def test_utf8(self):
+        self.create_binary_file("Hello, World!\nこんにちは".encode("utf-8"))
+        self.assertEqual(parsers.detect_encoding(self.test_file), "utf-8")
+
+    def test_utf8_with_bom(self):
+        self.create_binary_file("Hello".encode("utf-8-sig"))
+        self.assertEqual(parsers.detect_encoding(self.test_file), "utf-8-sig")
+
+    def test_character_cut_off_by_sample(self):
+        self.create_binary_file("こんにちは".encode("utf-8"))
+        self.assertEqual(parsers.detect_encoding(self.test_file, sample_size=4), "utf-8")
+
+    def test_other_encoding(self):
+        self.create_binary_file("こんにちは、世界。日本語の文章です。".encode("shift_jis"))
+        self.assertEqual(parsers.detect_encoding(self.test_file).lower(), "shift_jis")
+
+    def test_decide_encoding_detects_once(self):
+        cache.clear()
+        self.create_binary_file(b"Hello")
+        with patch("data_import.pipeline.parsers.detect_encoding", return_value="utf-8") as detect_encoding:
+            parsers.decide_encoding(self.test_file, parsers.DEFAULT_ENCODING)
+            parsers.decide_encoding(self.test_file, parsers.DEFAULT_ENCODING)
+        detect_encoding.assert_called_once()
+
+    def test_decide_encoding_detects_changed_file_again(self):
+        self.create_binary_file("Hello".encode("utf-8"))
+        self.assertEqual(parsers.decide_encoding(self.test_file, parsers.DEFAULT_ENCODING), "utf-8")
+        self.create_binary_file("こんにちは、世界。日本語の文章です。".encode("shift_jis"))
+        encoding = parsers.decide_encoding(self.test_file, parsers.DEFAULT_ENCODING)
+        self.assertEqual(encoding.lower(), "shift_jis")
+
+    def test_decide_specified_encoding(self):
+        self.assertEqual(parsers.decide_encoding(self.test_file, "cp932"), "cp932")
+
+
 class TestPlainParser(TestParser):
     def test_read(self):
         content = "example"
@@ -82,6 +141,75 @@ class TestJSONParser(TestParser):
         expected = json.loads(content)
         self.assert_record(content, parser, expected)
 
+    def test_read_indented_array(self):
+        content = json.dumps([{"text": "line1", "labels": [1.5e3, None]}, {"text": "line2\n", "labels": []}], indent=2)
+        parser = parsers.JSONParser()
+        expected = json.loads(content)
+        self.assert_record(content, parser, expected)
+
+    def test_read_empty_array(self):
+        parser = parsers.JSONParser()
+        self.assert_record(" [ ] ", parser, [])
+
+    def test_error_has_line_number(self):
+        content = '[\n{"text": "line1"},\n{"text": }\n]'
+        parser = parsers.JSONParser()
+        self.create_file(content)
+        rows = list(parser.parse(self.test_file))
+        self.assertEqual(rows, [])
+        self.assertEqual(len(parser.errors), 1)
+        self.assertEqual(parser.errors[0].line_num, 3)
+
+    def test_malformed_array_yields_nothing(self):
+        content = '[{"text": "line1"}, {"text": "line2"}, {"text": "line3"'
+        parser = parsers.JSONParser()
+        self.create_file(content)
+        self.assertEqual(list(parser.parse(self.test_file)), [])
+        self.assertEqual(len(parser.errors), 1)
+
+
+class TestJSONArrayReader(unittest.TestCase):
+    def read(self, content, chunk_size):
+        return list(parsers.JSONArrayReader(io.StringIO(content), chunk_size=chunk_size))
+
+    def test_values_across_chunks(self):
+        rows = [{"text": "a" * 10, "score": 1.25e-3}, 12345, -0.5, "x", [True, False, None], {}]
+        content = json.dumps(rows)
+        for chunk_size in [1, 2, 3, 5, 64]:
+            with self.subTest(chunk_size=chunk_size):
+                self.assertEqual(self.read(content, chunk_size), rows)
+
+    def test_escapes_and_constants_across_chunks(self):
+        content = '["\\u00e9\\ud83d\\ude00", -Infinity, {"a": [true, false, null]}]'
+        for chunk_size in [1, 2, 3, 5, 64]:
+            with self.subTest(chunk_size=chunk_size):
+                self.assertEqual(
+                    self.read(content, chunk_size), ["\u00e9\U0001f600", float("-inf"), {"a": [True, False, None]}]
+                )
+
+    def test_malformed_value_does_not_read_the_rest(self):
+        content = '[{"text": tru}, ' + ", ".join(['{"text": "valid"}'] * 10000) + "]"
+        f = io.StringIO(content)
+        with self.assertRaises(json.JSONDecodeError) as cm:
+            list(parsers.JSONArrayReader(f, chunk_size=64))
+        self.assertEqual(cm.exception.pos, 10)
+        self.assertLessEqual(f.tell(), 64)
+
+    def test_not_array(self):
+        self.assertEqual(self.read('{"a": 1, "b": 2}', chunk_size=2), ["a", "b"])
+
+    def test_error_position(self):
+        content = "[\n  1,\n  2 3\n]"
+        for chunk_size in [1, 64]:
+            with self.subTest(chunk_size=chunk_size):
+                with self.assertRaises(json.JSONDecodeError) as cm:
+                    self.read(content, chunk_size)
+                self.assertEqual((cm.exception.lineno, cm.exception.colno, cm.exception.pos), (3, 5, 11))
+
+    def test_extra_data(self):
+        with self.assertRaises(json.JSONDecodeError):
+            self.read("[1] 2", chunk_size=1)
+
 
 class TestJSONLParser(TestParser):
     def test_read(self):
@@ -93,6 +221,133 @@ class TestJSONLParser(TestParser):
         self.assert_record(content, parser, expected)
 
 
+class TestExcelParser(TestParser):
+    def setUp(self):
+        super().setUp()
+        self.test_file = os.path.join(self.test_dir, "test_file.xlsx")
+
+    def test_read_sheets(self):
+        workbook = openpyxl.Workbook()
+        sheet = workbook.active
+        for row in [["text", "label", None], ["exampleA", "positive"], [None, None], ["exampleB", None, 1], [None]]:
+            sheet.append(row)
+        hidden_sheet = workbook.create_sheet("hidden")
+        hidden_sheet.append(["text"])
+        hidden_sheet.append(["hidden"])
+        hidden_sheet.sheet_state = "hidden"
+        very_hidden_sheet = workbook.create_sheet("very hidden")
+        very_hidden_sheet.append(["text"])
+        very_hidden_sheet.append(["very hidden"])
+        very_hidden_sheet.sheet_state = "veryHidden"
+        second_sheet = workbook.create_sheet("second")
+        second_sheet.append(["text"])
+        second_sheet.append(["exampleC"])
+        workbook.save(self.test_file)
+        parser = parsers.ExcelParser()
+        expected = [
+            {"text": "exampleA", "label": "positive", LINE_NUMBER_COLUMN: 1},
+            {"text": "", "label": "", LINE_NUMBER_COLUMN: 2},
+            {"text": "exampleB", "label": "", "": 1, LINE_NUMBER_COLUMN: 3},
+            {"text": "exampleC", LINE_NUMBER_COLUMN: 4},
+        ]
+        self.assertEqual(list(parser.parse(self.test_file)), expected)
+
+    def test_invalid_file(self):
+        self.create_file("text,label")
+        parser = parsers.ExcelParser()
+        self.assertEqual(list(parser.parse(self.test_file)), [])
+        self.assertEqual(len(parser.errors), 1)
+
+
+class TestArrowBatchParserWithoutPyarrow(TestParser):
+    def test_error(self):
+        self.create_file("")
+        parser = parsers.ParquetParser()
+        with patch.object(parsers, "pyarrow", None):
+            self.assertEqual(list(parser.parse(self.test_file)), [])
+        self.assertEqual(len(parser.errors), 1)
+        self.assertIn("doccano[parquet]", parser.errors[0].message)
+
+
+@unittest.skipUnless(parsers.pyarrow, "pyarrow is not installed")
+class TestArrowBatchParser(TestParser):
+    def setUp(self):
+        super().setUp()
+        self.table = pyarrow.table(
+            {
+                "text": ["exampleA", "exampleB", "exampleC"],
+                "label": [[{"start_offset": 0, "end_offset": 1, "label": "LOC"}], [], None],
+            }
+        )
+        self.expected = [
+            {"text": "exampleA", "label": [{"start_offset": 0, "end_offset": 1, "label": "LOC"}]},
+            {"text": "exampleB", "label": []},
+            {"text": "exampleC", "label": None},
+        ]
+
+    def assert_columns(self, parser):
+        batches = list(parser.parse_columns(self.test_file, batch_size=2))
+        self.assertEqual([batch[LINE_NUMBER_COLUMN] for batch in batches], [[1, 2], [3]])
+        rows = [row for batch in batches for row in Records(batch).rows([LINE_NUMBER_COLUMN])]
+        self.assertEqual(rows, self.expected)
+        self.assertEqual(parser.errors, [])
+
+    def test_parquet(self):
+        pyarrow.parquet.write_table(self.table, self.test_file, row_group_size=2)
+        self.assert_columns(parsers.ParquetParser())
+
+    def test_arrow_file(self):
+        with pyarrow.ipc.new_file(self.test_file, self.table.schema) as writer:
+            writer.write(self.table)
+        self.assert_columns(parsers.ArrowParser())
+
+    def test_arrow_stream(self):
+        with pyarrow.ipc.new_stream(self.test_file, self.table.schema) as writer:
+            writer.write(self.table)
+        self.assert_columns(parsers.ArrowParser())
+
+    def test_parse_rows(self):
+        pyarrow.parquet.write_table(self.table, self.test_file)
+        parser = parsers.ParquetParser()
+        rows = list(parser.parse(self.test_file))
+        self.assertEqual([row.pop(LINE_NUMBER_COLUMN) for row in rows], [1, 2, 3])
+        self.assertEqual(rows, self.expected)
+
+    def test_non_json_values_are_converted(self):
+        table = pyarrow.table(
+            {
+                "created_at": pyarrow.array([datetime.datetime(2023, 1, 2, 3, 4, 5), None], pyarrow.timestamp("us")),
+                "date": pyarrow.array([datetime.date(2023, 1, 2), None]),
+                "price": pyarrow.array([decimal.Decimal("1.50"), None], pyarrow.decimal128(5, 2)),
+                "data": pyarrow.array([b"text", b"\xff"]),
+                "times": pyarrow.array([[datetime.datetime(2023, 1, 2)], []], pyarrow.list_(pyarrow.timestamp("s"))),
+            }
+        )
+        pyarrow.parquet.write_table(table, self.test_file)
+        rows = list(parsers.ParquetParser().parse(self.test_file))
+        for row in rows:
+            row.pop(LINE_NUMBER_COLUMN)
+        expected = [
+            {
+                "created_at": "2023-01-02T03:04:05",
+                "date": "2023-01-02",
+                "price": "1.50",
+                "data": "text",
+                "times": ["2023-01-02T00:00:00"],
+            },
+            {"created_at": None, "date": None, "price": None, "data": "/w==", "times": []},
+        ]
+        self.assertEqual(rows, expected)
+        json.dumps(rows)
+
+    def test_invalid_file(self):
+        self.create_file("text,label")
+        for parser in [parsers.ParquetParser(), parsers.ArrowParser()]:
+            with self.subTest(parser=parser):
+                self.assertEqual(list(parser.parse_columns(self.test_file, batch_size=2)), [])
+                self.assertEqual(len(parser.errors), 1)
+
+
 class TestFastTextParser(TestParser):
     def test_read(self):
         content = "__label__sauce __label__cheese Text"
@@ -126,3 +381,113 @@ Blackburn\tI-PER
             {"text": "Peter Blackburn", "label": [(0, 15, "PER")]},
         ]
         self.assert_record(content, parser, expected)
+
+    @patch("data_import.pipeline.parsers.CONLL_BATCH_SIZE", 2)
+    def test_sentences_in_several_batches(self):
+        content = "Peter\tS-PER\n\nEU\tB-ORG\nnews\tE-ORG\n\nrejects\tO\n\nBritish\tS-MISC\n"
+        parser = parsers.CoNLLParser(scheme="IOBES")
+        expected = [
+            {"text": "Peter", "label": [(0, 5, "PER")]},
+            {"text": "EU news", "label": [(0, 7, "ORG")]},
+            {"text": "rejects", "label": []},
+            {"text": "British", "label": [(0, 7, "MISC")]},
+        ]
+        self.assert_record(content, parser, expected)
+
+    def test_invalid_line_keeps_previous_sentences(self):
+        content = "Peter\tB-PER\n\nEU\tB-ORG\tO\n"
+        parser = parsers.CoNLLParser()
+        self.assert_record(content, parser, [{"text": "Peter", "label": [(0, 5, "PER")]}])
+        self.assertEqual(parser.errors[0].line_num, 3)
+
+    def test_unsupported_scheme(self):
+        parser = parsers.CoNLLParser(scheme="IOB1")
+        self.assert_record("Peter\tI-PER\n", parser, [])
+        self.assertEqual(len(parser.errors), 1)
+
+
+class TestSplitParsing(TestParser):
+    def assert_segments(self, content, parser_class):
+        self.create_file(content)
+        parser = parser_class()
+        expected = list(parser.parse(self.test_file))
+        expected_errors = [(error.line_num, error.message) for error in parser.errors]
+        parser = parser_class()
+        segments = parser.split(self.test_file, segment_size=1)
+        self.assertGreater(len(segments), 1)
+        rows = [row for segment in segments for row in parser.parse_segment(self.test_file, segment)]
+        self.assertEqual(rows, expected)
+        self.assertEqual([(error.line_num, error.message) for error in parser.errors], expected_errors)
+
+    def test_jsonl(self):
+        content = '{"text": "line1"}\n{"text": }\n\n{"text": "line4"}\n'
+        self.assert_segments(content, parsers.JSONLParser)
+
+    def test_line(self):
+        self.assert_segments("Hello\nWorld\nこんにちは", parsers.LineParser)
+
+    def test_fasttext(self):
+        self.assert_segments("__label__a Hello\n__label__b World\n", parsers.FastTextParser)
+
+    def test_csv(self):
+        self.assert_segments('text,label\n"multi\nline",A\n\nText,B\n', parsers.CSVParser)
+
+    def test_csv_with_quotes_inside_fields(self):
+        self.assert_segments('text,label\n5" screen,A\nfoo,B\n"multi\nline",C\nbar,D\n', parsers.CSVParser)
+        self.assert_segments('text,label\n"say ""hi""\nthere",A\n"a"b\nc,B\n"x",C\n', parsers.CSVParser)
+
+    def test_csv_with_delimiter(self):
+        parser_class = functools.partial(parsers.CSVParser, delimiter="\t")
+        self.assert_segments('text\tlabel\n5" a\tA\n"b\nc"\tB\nd\tC\n', parser_class)
+
+    def test_not_splittable(self):
+        self.create_file('[{"text": "line1"}]')
+        self.assertEqual(parsers.JSONParser().split(self.test_file, segment_size=1), [])
+
+    def test_compressed_file_is_not_split(self):
+        with gzip.open(self.test_file, "wt") as f:
+            f.write("Hello\nWorld\n")
+        self.assertEqual(parsers.LineParser().split(self.test_file, segment_size=1), [])
+
+
+class TestCompressedFile(TestParser):
+    def create_compressed_file(self, content, compress):
+        with open(self.test_file, "wb") as f:
+            f.write(compress(content.encode("utf-8")))
+
+    def assert_compressed_jsonl(self, compress):
+        content = '{"text": "Hello"}\n{"text": "こんにちは"}\n'
+        self.create_compressed_file(content, compress)
+        rows = list(parsers.JSONLParser().parse(self.test_file))
+        self.assertEqual([row["text"] for row in rows], ["Hello", "こんにちは"])
+
+    def test_read_compressed_jsonl(self):
+        for compress in [gzip.compress, bz2.compress, lzma.compress]:
+            with self.subTest(compress=compress.__module__):
+                self.assert_compressed_jsonl(compress)
+
+    @unittest.skipUnless(compression.zstandard, "zstandard is not installed")
+    def test_read_zstd_jsonl(self):
+        self.assert_compressed_jsonl(compression.zstandard.compress)
+
+    def test_read_whole_file_larger_than_max_size(self):
+        self.create_compressed_file("Hello, World!\n" * 100, gzip.compress)
+        with override_settings(MAX_DECOMPRESSED_SIZE=100):
+            with self.assertRaises(compression.DecompressedSizeError):
+                list(parsers.TextFileParser().parse(self.test_file))
+
+    def test_read_compressed_csv(self):
+        self.create_compressed_file("label,text\nLabel,Text", gzip.compress)
+        row = next(parsers.CSVParser().parse(self.test_file))
+        self.assertEqual(row["text"], "Text")
+
+    def test_detect_encoding_of_compressed_file(self):
+        with open(self.test_file, "wb") as f:
+            f.write(gzip.compress("こんにちは、世界。日本語の文章です。".encode("shift_jis")))
+        self.assertEqual(parsers.detect_encoding(self.test_file).lower(), "shift_jis")
+
+    def test_read_compressed_file_larger_than_encoding_sample(self):
+        lines = ['{"text": "Hello"}\n'] * (parsers.ENCODING_SAMPLE_SIZE // 10)
+        self.create_compressed_file("".join(lines), gzip.compress)
+        rows = list(parsers.JSONLParser(encoding=parsers.DEFAULT_ENCODING).parse(self.test_file))
+        self.assertEqual(len(rows), len(lines))
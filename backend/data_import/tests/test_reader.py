@@ -1,14 +1,15 @@
 import unittest
 from unittest.mock import MagicMock, patch
 
-import pandas as pd
-from pandas.testing import assert_frame_equal
-
 from data_import.pipeline.readers import (
     FILE_NAME_COLUMN,
+    LINE_NUMBER_COLUMN,
     UPLOAD_NAME_COLUMN,
     UUID_COLUMN,
+    ColumnarParser,
+    FileName,
     Reader,
+    Records,
 )
 
 
@@ -19,6 +20,7 @@ class TestReader(unittest.TestCase):
         filename = MagicMock()
         filename.generated_name = "filename"
         filename.upload_name = "upload_name"
+        filename.segment = None
         self.filenames = MagicMock()
         self.filenames.__iter__.return_value = [filename]
         self.rows = [
@@ -47,5 +49,55 @@ class TestReader(unittest.TestCase):
         mock.return_value = "uuid"
         reader = Reader(self.filenames, self.parser)
         batch = next(reader.batch(2))
-        expected_df = pd.DataFrame(self.rows)
-        assert_frame_equal(batch, expected_df)
+        self.assertEqual(list(batch.rows()), self.rows)
+
+    def test_truncated_compressed_file(self):
+        def parse(filename):
+            yield {"a": 1, LINE_NUMBER_COLUMN: 1}
+            raise EOFError("Compressed file ended before the end-of-stream marker was reached")
+
+        self.parser.parse = parse
+        self.parser.errors = []
+        reader = Reader(self.filenames, self.parser)
+        self.assertEqual(len(list(reader)), 1)
+        self.assertEqual(len(reader.errors), 1)
+        self.assertEqual(reader.errors[0].dict()["line"], 1)
+
+
+class TestRecords(unittest.TestCase):
+    def test_from_rows_fills_missing_values(self):
+        records = Records.from_rows([{"a": 1}, {"b": 2}, {"a": 3, "b": 4}])
+        self.assertEqual(len(records), 3)
+        self.assertEqual(records["a"], [1, None, 3])
+        self.assertEqual(records["b"], [None, 2, 4])
+
+    def test_rows_with_exclude_columns(self):
+        records = Records.from_rows([{"a": 1, "b": 2}, {"a": 3, "b": 4}])
+        self.assertEqual(list(records.rows(exclude_columns=["b"])), [{"a": 1}, {"a": 3}])
+
+    def test_contains(self):
+        records = Records.from_rows([{"a": 1}])
+        self.assertIn("a", records)
+        self.assertNotIn("b", records)
+
+
+class TestColumnarReader(unittest.TestCase):
+    def setUp(self):
+        self.parser = MagicMock(spec=ColumnarParser)
+        self.parser.parse_columns.side_effect = lambda filename, batch_size: iter(
+            [{"a": [1, 2]}, {"a": [3]}] if filename == "file1" else [{"a": [4, 5]}]
+        )
+        self.filenames = [FileName("file1", "generated1", "upload1"), FileName("file2", "generated2", "upload2")]
+
+    def test_batch_columns(self):
+        reader = Reader(self.filenames, self.parser)
+        batches = list(reader.batch(2))
+        self.assertEqual([batch["a"] for batch in batches], [[1, 2], [3], [4, 5]])
+        self.assertEqual(batches[2][FILE_NAME_COLUMN], ["generated2", "generated2"])
+        self.assertEqual(batches[2][UPLOAD_NAME_COLUMN], ["upload2", "upload2"])
+        self.assertEqual(len(set(batches[0][UUID_COLUMN])), 2)
+
+    def test_batch_columns_with_skip(self):
+        reader = Reader(self.filenames, self.parser)
+        batches = list(reader.batch(2, skip=4))
+        self.assertEqual([batch["a"] for batch in batches], [[5]])
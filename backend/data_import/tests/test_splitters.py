@@ -0,0 +1,79 @@
+import io
+import os
+import shutil
+import tempfile
+import unittest
+
+from data_import.pipeline.splitters import (
+    Segment,
+    is_splittable,
+    open_segment,
+    split_csv,
+    split_lines,
+)
+
+
+class TestSplitLines(unittest.TestCase):
+    def test_split_after_newlines(self):
+        segments = split_lines(io.BytesIO(b"a\nbb\nccc\ndddd\n"), segment_size=3)
+        expected = [
+            Segment(index=0, start=0, end=5, records_before=0),
+            Segment(index=1, start=5, end=9, records_before=2),
+            Segment(index=2, start=9, end=14, records_before=3),
+        ]
+        self.assertEqual(segments, expected)
+
+    def test_last_line_without_newline(self):
+        segments = split_lines(io.BytesIO(b"a\nbb\nccc"), segment_size=3)
+        self.assertEqual(segments[-1], Segment(index=1, start=5, end=8, records_before=2))
+
+    def test_empty_file(self):
+        self.assertEqual(split_lines(io.BytesIO(b""), segment_size=3), [Segment(0, 0, 0, 0)])
+
+    def test_segment_larger_than_file(self):
+        self.assertEqual(split_lines(io.BytesIO(b"a\nb\n"), segment_size=100), [Segment(0, 0, 4, 0)])
+
+
+class TestSplitCSV(unittest.TestCase):
+    def test_split_at_the_end_of_records(self):
+        content = b'text,label\n"a\nb",1\n\nc,2\nd,3\n'
+        segments = split_csv(io.BytesIO(content), segment_size=5)
+        expected = [
+            Segment(index=0, start=0, end=11, records_before=0),
+            Segment(index=1, start=11, end=19, records_before=1),
+            Segment(index=2, start=19, end=24, records_before=2),
+            Segment(index=3, start=24, end=28, records_before=3),
+        ]
+        self.assertEqual(segments, expected)
+
+    def test_escaped_quotes(self):
+        content = b'text\n"say ""hi""\nthere"\nb\n'
+        segments = split_csv(io.BytesIO(content), segment_size=1)
+        self.assertEqual([segment.start for segment in segments], [0, 5, 24])
+
+    def test_quote_inside_unquoted_field_is_literal(self):
+        content = b'text,label\n5" screen,A\nfoo,B\n"multi\nline",C\n'
+        segments = split_csv(io.BytesIO(content), segment_size=1)
+        self.assertEqual([segment.start for segment in segments], [0, 11, 23, 29])
+        self.assertEqual([segment.records_before for segment in segments], [0, 1, 2, 3])
+
+
+class TestSegment(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.test_file = os.path.join(self.test_dir, "test_file.txt")
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def test_open_segment(self):
+        with open(self.test_file, "w", encoding="utf-8") as f:
+            f.write("あ\nい\nう\n")
+        with open_segment(self.test_file, Segment(index=1, start=4, end=8, records_before=1), "utf-8") as f:
+            self.assertEqual(f.read(), "い\n")
+
+    def test_is_splittable(self):
+        for encoding in ["utf-8", "utf-8-sig", "ascii", "latin-1", "shift_jis", "cp1252"]:
+            self.assertTrue(is_splittable(encoding), encoding)
+        for encoding in ["utf-16", "utf-32", "unknown"]:
+            self.assertFalse(is_splittable(encoding), encoding)
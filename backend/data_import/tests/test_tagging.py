@@ -0,0 +1,40 @@
+import itertools
+import unittest
+
+from seqeval.scheme import BILOU, IOB2, IOBES, IOE2, Tokens
+
+from data_import.pipeline.tagging import SCHEMES, TagDecoder, align_spans
+
+
+class TestTagDecoder(unittest.TestCase):
+    def test_decode(self):
+        decoder = TagDecoder("IOB2")
+        entities = decoder.decode(["B-PER", "I-PER", "O", "B-LOC", "B-LOC", "I-ORG"])
+        self.assertEqual(entities, [(0, 2, "PER"), (3, 4, "LOC"), (4, 5, "LOC")])
+
+    def test_decode_batch(self):
+        decoder = TagDecoder("IOBES")
+        batch = decoder.decode_batch([["B-PER", "E-PER"], [], ["O", "S-LOC"], ["B-ORG"]])
+        self.assertEqual(batch, [[(0, 2, "PER")], [], [(1, 2, "LOC")], []])
+
+    def test_invalid_prefix(self):
+        decoder = TagDecoder("IOB2")
+        with self.assertRaises(ValueError):
+            decoder.decode(["B-PER", "E-PER"])
+
+    def test_same_entities_as_seqeval(self):
+        schemes = {"IOB2": IOB2, "IOE2": IOE2, "IOBES": IOBES, "BILOU": BILOU}
+        for name, scheme in schemes.items():
+            decoder = TagDecoder(name)
+            tags = [prefix + suffix for prefix in SCHEMES[name].allowed for suffix in ["-A", "-B"]]
+            sequences = [list(sequence) for sequence in itertools.product(tags, repeat=3)]
+            expected = [[(e.start, e.end, e.tag) for e in Tokens(tags, scheme).entities] for tags in sequences]
+            with self.subTest(scheme=name):
+                self.assertEqual(decoder.decode_batch(sequences), expected)
+
+
+class TestAlignSpans(unittest.TestCase):
+    def test_align_spans(self):
+        words = ["EU", "rejects", "German", "call", ""]
+        spans = align_spans(words, [(0, 1, "ORG"), (2, 4, "MISC"), (4, 5, "EMPTY")], " ")
+        self.assertEqual(spans, [(0, 2, "ORG"), (11, 22, "MISC"), (23, 23, "EMPTY")])
@@ -1,14 +1,20 @@
+import itertools
 import os
 import pathlib
 import shutil
+import unittest
+from unittest.mock import patch
 
 from django.core.files import File
 from django.test import TestCase, override_settings
 from django_drf_filepond.models import StoredUpload, TemporaryUpload
 from django_drf_filepond.utils import _get_file_id
 
+from data_import import parallel
 from data_import.celery_tasks import import_dataset
-from data_import.pipeline.catalog import RELATION_EXTRACTION
+from data_import.models import ImportCheckpoint
+from data_import.pipeline.catalog import HAS_PYARROW, RELATION_EXTRACTION
+from data_import.pipeline.exceptions import FileParseException
 from examples.models import Example
 from label_types.models import SpanType
 from labels.models import Category, Span
@@ -97,6 +103,22 @@ class TestImportClassificationData(TestImportData):
         self.import_dataset(filename, file_format, self.task, kwargs)
         self.assert_examples(dataset)
 
+    def test_compressed_jsonl(self):
+        filename = "text_classification/example.jsonl.gz"
+        file_format = "JSONL"
+        kwargs = {"column_label": "labels"}
+        dataset = [("exampleA", ["positive"]), ("exampleB", ["positive", "negative"]), ("exampleC", [])]
+        self.import_dataset(filename, file_format, self.task, kwargs)
+        self.assert_examples(dataset)
+
+    @override_settings(MAX_DECOMPRESSED_SIZE=10)
+    def test_decompressed_file_larger_than_max_size(self):
+        filename = "text_classification/example.jsonl.gz"
+        file_format = "JSONL"
+        kwargs = {"column_label": "labels"}
+        response = self.import_dataset(filename, file_format, self.task, kwargs)
+        self.assert_parse_error(response)
+
     def test_csv(self):
         filename = "text_classification/example.csv"
         file_format = "CSV"
@@ -118,6 +140,36 @@ class TestImportClassificationData(TestImportData):
         self.import_dataset(filename, file_format, self.task)
         self.assert_examples(dataset)
 
+    @unittest.skipUnless(HAS_PYARROW, "pyarrow is not installed")
+    def test_parquet(self):
+        filename = "text_classification/example.parquet"
+        file_format = "Parquet"
+        kwargs = {"column_label": "labels"}
+        dataset = [("exampleA", ["positive"]), ("exampleB", ["positive", "negative"]), ("exampleC", [])]
+        self.import_dataset(filename, file_format, self.task, kwargs)
+        self.assert_examples(dataset)
+        self.assertEqual(Example.objects.get(text="exampleB").meta, {"wikiPageID": 2})
+
+    @unittest.skipUnless(HAS_PYARROW, "pyarrow is not installed")
+    def test_parquet_with_timestamp(self):
+        filename = "text_classification/example_timestamp.parquet"
+        file_format = "Parquet"
+        kwargs = {"column_label": "labels"}
+        dataset = [("exampleA", ["positive"]), ("exampleB", [])]
+        self.import_dataset(filename, file_format, self.task, kwargs)
+        self.assert_examples(dataset)
+        self.assertEqual(
+            Example.objects.get(text="exampleA").meta, {"created_at": "2023-01-02T03:04:05", "price": "1.50"}
+        )
+        self.assertEqual(Example.objects.get(text="exampleB").meta, {"created_at": None, "price": "2.00"})
+
+    @unittest.skipUnless(HAS_PYARROW, "pyarrow is not installed")
+    def test_wrong_parquet(self):
+        filename = "text_classification/example.jsonl"
+        file_format = "Parquet"
+        response = self.import_dataset(filename, file_format, self.task)
+        self.assert_parse_error(response)
+
     def test_excel(self):
         filename = "text_classification/example.xlsx"
         file_format = "Excel"
@@ -203,6 +255,22 @@ class TestImportSequenceLabelingData(TestImportData):
         self.import_dataset(filename, file_format, self.task)
         self.assert_examples(dataset)
 
+    @unittest.skipUnless(HAS_PYARROW, "pyarrow is not installed")
+    def test_parquet(self):
+        filename = "sequence_labeling/example.parquet"
+        file_format = "Parquet"
+        dataset = [("exampleA", [[0, 1, "LOC"]]), ("exampleB", [])]
+        self.import_dataset(filename, file_format, self.task)
+        self.assert_examples(dataset)
+
+    @unittest.skipUnless(HAS_PYARROW, "pyarrow is not installed")
+    def test_arrow(self):
+        filename = "sequence_labeling/example.arrow"
+        file_format = "Arrow"
+        dataset = [("exampleA", [[0, 1, "LOC"]]), ("exampleB", [])]
+        self.import_dataset(filename, file_format, self.task)
+        self.assert_examples(dataset)
+
     def test_wrong_conll(self):
         filename = "sequence_labeling/example.jsonl"
         file_format = "CoNLL"
@@ -329,3 +397,147 @@ class TestFileTypeChecking(TestImportData):
         response = self.import_dataset(filename, file_format, self.task)
         self.assertEqual(len(response["error"]), 1)
         self.assertIn("unexpected", response["error"][0]["message"])
+
+
+@override_settings(IMPORT_WORKERS=2)
+class TestImportClassificationDataInParallel(TestImportClassificationData):
+    def test_multiple_files(self):
+        filenames = ["text_classification/example.jsonl", "text_classification/example_fasttext.txt"]
+        upload_ids = []
+        for filename in filenames:
+            upload_id = _get_file_id()
+            TemporaryUpload.objects.create(
+                upload_id=upload_id,
+                file_id="1",
+                file=File(open(self.data_path / filename, mode="rb"), filename.split("/")[-1]),
+                upload_name=filename,
+                upload_type="F",
+            )
+            upload_ids.append(upload_id)
+        response = import_dataset(self.user.id, self.project.item.id, "fastText", upload_ids, self.task)
+        self.assertEqual(response["error"][0]["filename"], filenames[1])
+        upload_names = list(Example.objects.order_by("id").values_list("upload_name", flat=True))
+        # the examples of each file are saved together
+        groups = [name for name, _ in itertools.groupby(upload_names)]
+        self.assertEqual(groups, sorted(filenames, key=upload_names.index))
+        for upload_id in upload_ids:
+            su = StoredUpload.objects.get(upload_id=upload_id)
+            shutil.rmtree(pathlib.Path(su.get_absolute_file_path()).parent)
+
+
+@override_settings(IMPORT_WORKERS=2, IMPORT_SEGMENT_SIZE=1)
+class TestImportClassificationDataInParallelSegments(TestImportClassificationData):
+    pass
+
+
+@override_settings(IMPORT_WORKERS=2)
+class TestImportRelationExtractionDataInParallel(TestImportRelationExtractionData):
+    pass
+
+
+@override_settings(IMPORT_WORKERS=2)
+class TestImportIntentDetectionAndSlotFillingDataInParallel(TestImportIntentDetectionAndSlotFillingData):
+    pass
+
+
+@override_settings(IMPORT_WORKERS=2)
+class TestImportImageClassificationDataInParallel(TestImportImageClassificationData):
+    pass
+
+
+@override_settings(IMPORT_WORKERS=2, IMPORT_SEGMENT_SIZE=1, IMPORT_BATCH_SIZE=1)
+class TestImportInParallelWithCelery(TestImportData):
+    task = ProjectType.DOCUMENT_CLASSIFICATION
+
+    def test_close_connections_before_starting_workers(self):
+        filename = "text_classification/example.jsonl"
+        TemporaryUpload.objects.create(
+            upload_id=self.upload_id,
+            file_id="1",
+            file=File(open(self.data_path / filename, mode="rb"), filename.split("/")[-1]),
+            upload_name=filename,
+            upload_type="F",
+        )
+        calls = []
+        close_connections = parallel.close_connections
+        start_worker = parallel.Worker.__init__
+
+        def close():
+            calls.append("close")
+            close_connections()
+
+        def start(worker, *args, **kwargs):
+            calls.append("start")
+            start_worker(worker, *args, **kwargs)
+
+        args = (self.user.id, self.project.item.id, "JSONL", [self.upload_id], self.task)
+        with patch.object(parallel, "close_connections", close), patch.object(parallel.Worker, "__init__", start):
+            result = import_dataset.apply(args=args, kwargs={"column_label": "labels"}).get()
+        self.assertEqual(result, {"error": []})
+        self.assertEqual(
+            list(Example.objects.order_by("id").values_list("text", flat=True)), ["exampleA", "exampleB", "exampleC"]
+        )
+        self.assertGreater(len(calls), 2)
+        self.assertEqual(calls, ["close", "start"] * (len(calls) // 2))
+
+
+@override_settings(IMPORT_BATCH_SIZE=1)
+class TestResumeImport(TestImportData):
+    task = ProjectType.DOCUMENT_CLASSIFICATION
+    task_id = "import-task"
+
+    def import_dataset_with_checkpoint(self, records=0, completed=False, **options):
+        filename = "text_classification/example.jsonl"
+        TemporaryUpload.objects.create(
+            upload_id=self.upload_id,
+            file_id="1",
+            file=File(open(self.data_path / filename, mode="rb"), filename.split("/")[-1]),
+            upload_name=filename,
+            upload_type="F",
+        )
+        ImportCheckpoint.objects.create(
+            task_id=self.task_id, upload_id=self.upload_id, records=records, completed=completed
+        )
+        args = (self.user.id, self.project.item.id, "JSONL", [self.upload_id], self.task)
+        kwargs = {"column_label": "labels"}
+        return import_dataset.apply(args=args, kwargs=kwargs, task_id=self.task_id, **options)
+
+    def test_skip_saved_records(self):
+        self.import_dataset_with_checkpoint(records=2).get()
+        self.assertEqual(list(Example.objects.values_list("text", flat=True)), ["exampleC"])
+        self.assertFalse(ImportCheckpoint.objects.exists())
+
+    def test_skip_completed_file(self):
+        self.import_dataset_with_checkpoint(records=3, completed=True).get()
+        self.assertEqual(Example.objects.count(), 0)
+        self.assertTrue(StoredUpload.objects.filter(upload_id=self.upload_id).exists())
+
+    def test_advance_checkpoint_after_each_batch(self):
+        advanced = []
+        original = ImportCheckpoint.advance
+
+        def advance(checkpoint, records):
+            advanced.append(Example.objects.count())
+            original(checkpoint, records)
+
+        with patch.object(ImportCheckpoint, "advance", advance):
+            self.import_dataset_with_checkpoint().get()
+        self.assertEqual(advanced, [1, 2, 3])
+
+    def test_delete_checkpoints_on_file_import_exception(self):
+        error = FileParseException("example.jsonl", 1, "error")
+        with patch("data_import.celery_tasks.load_dataset", side_effect=error):
+            result = self.import_dataset_with_checkpoint(records=2).get()
+        self.assertEqual(result, {"error": [error.dict()]})
+        self.assertFalse(ImportCheckpoint.objects.exists())
+
+    def test_delete_checkpoints_after_last_attempt(self):
+        with patch("data_import.celery_tasks.load_dataset", side_effect=RuntimeError):
+            result = self.import_dataset_with_checkpoint(records=2, retries=import_dataset.max_retries)
+        self.assertTrue(result.failed())
+        self.assertFalse(ImportCheckpoint.objects.exists())
+
+
+@override_settings(IMPORT_WORKERS=2)
+class TestResumeImportInParallel(TestResumeImport):
+    pass
@@ -1,6 +1,12 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_migrate
 
 
 class ExamplesConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "examples"
+
+    def ready(self):
+        from .search import clear_availability_cache
+
+        post_migrate.connect(clear_availability_cache, sender=self)
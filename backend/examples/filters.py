@@ -1,60 +1,161 @@
-from django.db.models import Count, Q, QuerySet
-from django_filters.rest_framework import BooleanFilter, CharFilter, FilterSet
+from functools import reduce
+from operator import or_
+from typing import Dict, List, Optional, Tuple, Type
 
-from .models import Example
+from django import forms
+from django.db.models import Exists, Model, OuterRef, QuerySet
+from django.utils.functional import cached_property
+from django_filters.rest_framework import (
+    BooleanFilter,
+    CharFilter,
+    ChoiceFilter,
+    Filter,
+    FilterSet,
+)
+from rest_framework.filters import SearchFilter
+
+from .models import Example, ExampleState
+from .search import get_search_backend
+from labels.models import BoundingBox, Category, Relation, Segmentation, Span
+from projects.models import Project, ProjectType
+
+ANY = "any"
+ALL = "all"
+LABEL_MATCHES = ((ANY, "Any of the labels"), (ALL, "All of the labels"))
+
+
+def select_label_models(project: Optional[Project]) -> List[Tuple[Type[Model], str]]:
+    """Returns the label models of the project type, and the name of their field of the label type."""
+    if project is None:
+        return [
+            (Category, "label"),
+            (Span, "label"),
+            (Relation, "type"),
+            (BoundingBox, "label"),
+            (Segmentation, "label"),
+        ]
+    mapping = {
+        ProjectType.DOCUMENT_CLASSIFICATION: [(Category, "label")],
+        ProjectType.IMAGE_CLASSIFICATION: [(Category, "label")],
+        ProjectType.SEQUENCE_LABELING: [(Span, "label")],
+        ProjectType.INTENT_DETECTION_AND_SLOT_FILLING: [(Category, "label"), (Span, "label")],
+        ProjectType.BOUNDING_BOX: [(BoundingBox, "label")],
+        ProjectType.SEGMENTATION: [(Segmentation, "label")],
+    }
+    label_models = mapping.get(project.project_type, [])
+    if getattr(project, "use_relation", False):
+        label_models = [*label_models, (Relation, "type")]
+    return label_models
+
+
+class MultipleValueInput(forms.TextInput):
+    """Reads every value of the parameter. Unlike `QueryArrayWidget`, a comma is kept in a label."""
+
+    def value_from_datadict(self, data, files, name):
+        if hasattr(data, "getlist"):
+            values = data.getlist(name)
+        else:
+            values = data.get(name)
+            values = values if isinstance(values, (list, tuple)) else [values]
+        values = [value for value in values if value not in (None, "")]
+        return values or None
+
+
+class MultipleValueField(forms.Field):
+    widget = MultipleValueInput
+
+    def to_python(self, value):
+        return sorted(value or [])
+
+
+class LabelFilter(Filter):
+    """Takes a label as `?label=a`, or several labels as `?label=a&label=b`."""
+
+    field_class = MultipleValueField
 
 
 class ExampleFilter(FilterSet):
     confirmed = BooleanFilter(field_name="states", method="filter_by_state")
-    label = CharFilter(method="filter_by_label")
+    label = LabelFilter(method="filter_by_label")
+    label_match = ChoiceFilter(choices=LABEL_MATCHES, method="filter_by_label_match")
     assignee = CharFilter(method="filter_by_assignee")
 
     def filter_by_state(self, queryset, field_name, is_confirmed: bool):
-        queryset = queryset.annotate(
-            num_confirm=Count(
-                expression=field_name,
-                filter=Q(**{f"{field_name}__confirmed_by": self.request.user})
-                | Q(project__collaborative_annotation=True),
-            )
-        )
-        if is_confirmed:
-            queryset = queryset.filter(num_confirm__gte=1)
-        else:
-            queryset = queryset.filter(num_confirm__lte=0)
-        return queryset
+        confirmed = ExampleState.objects.is_confirmed(self.request.user, self.project)
+        return queryset.filter(confirmed if is_confirmed else ~confirmed)
 
-    def filter_by_label(self, queryset: QuerySet, field_name: str, label: str) -> QuerySet:
-        """Filter examples by a given label name.
+    def filter_by_label(self, queryset: QuerySet, field_name: str, labels: List[str]) -> QuerySet:
+        """Filter examples by the given label names.
 
-        This performs filtering on all of the following labels at once:
-        - categories
-        - spans
-        - relations
-        - bboxes
-        - segmentations
-
-        Todo: Consider project type to make filtering more efficient.
+        Only the labels of the project type are looked up, e.g. the categories and the spans
+        in intent detection. Each label is tested with an `EXISTS` subquery on the index of
+        `(example_id, label_id)`, so the examples aren't duplicated by the joins.
 
         Args:
             queryset (QuerySet): QuerySet to filter.
             field_name (str): This equals to `label`.
-            label (str): The label name to filter.
+            labels (List[str]): The label names to filter. With `label_match=all`, the examples
+                must have all of them. Otherwise, they must have any of them.
 
         Returns:
             QuerySet: Filtered examples.
         """
-        queryset = queryset.filter(
-            Q(categories__label__text=label)
-            | Q(spans__label__text=label)
-            | Q(relations__type__text=label)
-            | Q(bboxes__label__text=label)
-            | Q(segmentations__label__text=label)
-        )
+        label_models = select_label_models(self.project)
+        if not label_models:
+            return queryset.none()
+        if self.form.cleaned_data.get("label_match") == ALL:
+            groups = [[label] for label in labels]
+        else:
+            groups = [labels]
+        # The ids of the label types are looked up once, so the subqueries only read the index.
+        label_type_ids = {model: self.find_label_type_ids(model, field, labels) for model, field in label_models}
+        for group in groups:
+            conditions = []
+            for model, field in label_models:
+                labels_of_example = model.objects.filter(example=OuterRef("pk"))
+                if self.project is None:
+                    labels_of_example = labels_of_example.filter(**{f"{field}__text__in": group})
+                else:
+                    ids = [label_type_ids[model][label] for label in group if label in label_type_ids[model]]
+                    labels_of_example = labels_of_example.filter(**{f"{field}__in": ids})
+                conditions.append(Exists(labels_of_example))
+            queryset = queryset.filter(reduce(or_, conditions))
+        return queryset
+
+    def find_label_type_ids(self, model: Type[Model], field: str, labels: List[str]) -> Dict[str, int]:
+        if self.project is None:
+            return {}
+        label_type = model._meta.get_field(field).related_model
+        label_types = label_type.objects.filter(project=self.project, text__in=labels)
+        return dict(label_types.values_list("text", "id"))
+
+    def filter_by_label_match(self, queryset: QuerySet, field_name: str, value: str) -> QuerySet:
+        # This is read by filter_by_label.
         return queryset
 
+    @cached_property
+    def project(self) -> Optional[Project]:
+        parser_context = getattr(self.request, "parser_context", None) or {}
+        project_id = parser_context.get("kwargs", {}).get("project_id")
+        if project_id is None:
+            return None
+        return Project.objects.filter(pk=project_id).first()
+
     def filter_by_assignee(self, queryset: QuerySet, field_name: str, assignee: str) -> QuerySet:
         return queryset.filter(assignments__assignee__username=assignee)
 
     class Meta:
         model = Example
-        fields = ("project", "text", "created_at", "updated_at", "label", "assignee")
+        fields = ("project", "text", "created_at", "updated_at", "label", "label_match", "assignee")
+
+
+class ExampleSearchFilter(SearchFilter):
+    """Searches the examples with the backend of the `SEARCH_BACKEND` setting, which can use an index."""
+
+    def filter_queryset(self, request, queryset, view):
+        search_fields = self.get_search_fields(view, request)
+        search_terms = self.get_search_terms(request)
+        if not search_fields or not search_terms:
+            return queryset
+        backend = get_search_backend(using=queryset.db)
+        return backend.search(queryset, search_fields, search_terms)
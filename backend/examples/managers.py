@@ -1,15 +1,45 @@
-from django.db.models import Count, Manager
+from django.db import connections
+from django.db.models import Count, Exists, Manager, OuterRef, Q
 
 
 class ExampleManager(Manager):
     def bulk_create(self, objs, batch_size=None, ignore_conflicts=False):
-        super().bulk_create(objs, batch_size=batch_size, ignore_conflicts=ignore_conflicts)
-        uuids = [data.uuid for data in objs]
-        examples = self.in_bulk(uuids, field_name="uuid")
+        objs = list(objs)
+        objs = super().bulk_create(objs, batch_size=batch_size, ignore_conflicts=ignore_conflicts)
+        connection = connections[self.db]
+        # The primary keys are set by `RETURNING` on PostgreSQL, SQLite and MariaDB.
+        if not ignore_conflicts and connection.features.can_return_rows_from_bulk_insert:
+            return objs
+        return self.find_by_uuids([data.uuid for data in objs])
+
+    def find_by_uuids(self, uuids):
+        """Returns the examples in the order of the uuids, looking them up in chunks."""
+        connection = connections[self.db]
+        field = self.model._meta.get_field("uuid")
+        chunk_size = max(connection.ops.bulk_batch_size([field], uuids), 1)
+        examples = {}
+        for i in range(0, len(uuids), chunk_size):
+            examples.update(self.in_bulk(uuids[i : i + chunk_size], field_name="uuid"))
         return [examples[uid] for uid in uuids]
 
 
 class ExampleStateManager(Manager):
+    def is_confirmed(self, user, project=None) -> Exists:
+        """Returns the expression that tells whether each example is confirmed by the user.
+
+        The states are looked up on the index of `(project, confirmed_by, example)`, so
+        the unconfirmed examples are found without counting the states of every example.
+        In collaborative annotation, the state of any member confirms the example.
+        """
+        states = self.filter(example=OuterRef("pk"))
+        if project is None:
+            states = states.filter(Q(confirmed_by=user) | Q(project__collaborative_annotation=True))
+        elif project.collaborative_annotation:
+            states = states.filter(project=project)
+        else:
+            states = states.filter(project=project, confirmed_by=user)
+        return Exists(states)
+
     def count_done(self, examples, user=None):
         if user:
             queryset = self.filter(example_id__in=examples, confirmed_by=user)
@@ -0,0 +1,69 @@
+from django.db import DatabaseError, migrations, transaction
+
+# SQLite: an FTS5 table with the trigram tokenizer, which reads the text from the examples.
+# The triggers keep it up to date when the examples are created, edited and deleted.
+SQLITE_FORWARD = [
+    "CREATE VIRTUAL TABLE examples_example_fts USING fts5("
+    "text, filename, content='examples_example', content_rowid='id', tokenize='trigram')",
+    "CREATE TRIGGER examples_example_fts_insert AFTER INSERT ON examples_example BEGIN "
+    "INSERT INTO examples_example_fts(rowid, text, filename) VALUES (new.id, new.text, new.filename); END",
+    "CREATE TRIGGER examples_example_fts_delete AFTER DELETE ON examples_example BEGIN "
+    "INSERT INTO examples_example_fts(examples_example_fts, rowid, text, filename) "
+    "VALUES ('delete', old.id, old.text, old.filename); END",
+    "CREATE TRIGGER examples_example_fts_update AFTER UPDATE OF text, filename ON examples_example BEGIN "
+    "INSERT INTO examples_example_fts(examples_example_fts, rowid, text, filename) "
+    "VALUES ('delete', old.id, old.text, old.filename); "
+    "INSERT INTO examples_example_fts(rowid, text, filename) VALUES (new.id, new.text, new.filename); END",
+    "INSERT INTO examples_example_fts(examples_example_fts) VALUES ('rebuild')",
+]
+SQLITE_BACKWARD = [
+    "DROP TRIGGER IF EXISTS examples_example_fts_insert",
+    "DROP TRIGGER IF EXISTS examples_example_fts_delete",
+    "DROP TRIGGER IF EXISTS examples_example_fts_update",
+    "DROP TABLE IF EXISTS examples_example_fts",
+]
+# PostgreSQL: trigram indexes, which serve ILIKE '%q%' on the columns.
+POSTGRES_FORWARD = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX IF NOT EXISTS examples_example_text_trgm ON examples_example USING gin (text gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS examples_example_filename_trgm ON examples_example USING gin (filename gin_trgm_ops)",
+]
+POSTGRES_BACKWARD = [
+    "DROP INDEX IF EXISTS examples_example_text_trgm",
+    "DROP INDEX IF EXISTS examples_example_filename_trgm",
+]
+
+
+def execute(schema_editor, statements):
+    # The search falls back to LIKE if SQLite is built without FTS5 or the user can't create the extension.
+    try:
+        with transaction.atomic(using=schema_editor.connection.alias):
+            for statement in statements:
+                schema_editor.execute(statement, params=None)
+    except DatabaseError:
+        pass
+
+
+def create_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "sqlite":
+        execute(schema_editor, SQLITE_FORWARD)
+    elif vendor == "postgresql":
+        execute(schema_editor, POSTGRES_FORWARD)
+
+
+def drop_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "sqlite":
+        execute(schema_editor, SQLITE_BACKWARD)
+    elif vendor == "postgresql":
+        execute(schema_editor, POSTGRES_BACKWARD)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("examples", "0008_assignment"),
+    ]
+
+    operations = [migrations.RunPython(code=create_search_index, reverse_code=drop_search_index)]
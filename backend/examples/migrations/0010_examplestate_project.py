@@ -0,0 +1,45 @@
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def copy_project(apps, schema_editor):
+    Example = apps.get_model("examples", "Example")
+    ExampleState = apps.get_model("examples", "ExampleState")
+    projects = Example.objects.filter(pk=OuterRef("example_id")).values("project_id")
+    ExampleState.objects.update(project_id=Subquery(projects[:1]))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("projects", "0012_perspective_description_1_perspective_description_2_and_more"),
+        ("examples", "0009_example_search_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="examplestate",
+            name="project",
+            field=models.ForeignKey(
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="example_states",
+                to="projects.project",
+            ),
+        ),
+        migrations.RunPython(copy_project, reverse_code=migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name="examplestate",
+            name="project",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="example_states",
+                to="projects.project",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="examplestate",
+            index=models.Index(fields=["project", "confirmed_by", "example"], name="examples_ex_project_5c5fdc_idx"),
+        ),
+    ]
@@ -64,11 +64,18 @@ class Assignment(models.Model):
 class ExampleState(models.Model):
     objects = ExampleStateManager()
     example = models.ForeignKey(to=Example, on_delete=models.CASCADE, related_name="states")
+    # Copied from the example, so the examples confirmed by a user in a project are read from one index range.
+    project = models.ForeignKey(to=Project, on_delete=models.CASCADE, related_name="example_states")
     confirmed_by = models.ForeignKey(to=User, on_delete=models.CASCADE)
     confirmed_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         unique_together = (("example", "confirmed_by"),)
+        indexes = [models.Index(fields=["project", "confirmed_by", "example"])]
+
+    def save(self, *args, **kwargs):
+        self.project_id = self.example.project_id
+        super().save(*args, **kwargs)
 
 
 class Comment(models.Model):
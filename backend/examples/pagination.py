@@ -0,0 +1,187 @@
+import json
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db import connections
+from django.db.models import Q, QuerySet
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import (
+    Cursor,
+    CursorPagination,
+    LimitOffsetPagination,
+    _reverse_ordering,
+)
+from rest_framework.response import Response
+
+# Below this number of rows, an estimate is replaced with the exact count, which is cheap enough.
+APPROXIMATE_COUNT_THRESHOLD = 10000
+
+
+def approximate_count(queryset: QuerySet) -> int:
+    """Returns the number of rows estimated by the query planner of PostgreSQL.
+
+    The other databases don't estimate the number of rows, so the rows are counted.
+    """
+    if connections[queryset.db].vendor == "postgresql":
+        plan = json.loads(queryset.explain(format="json"))
+        estimate = plan[0]["Plan"]["Plan Rows"]
+        if estimate >= APPROXIMATE_COUNT_THRESHOLD:
+            return estimate
+    return queryset.count()
+
+
+class KeysetPagination(CursorPagination):
+    """Paginates by the values of the ordering fields of the last item, instead of an offset.
+
+    The primary key is appended to the ordering, so the position of an item is unique, and
+    the next page is selected with `WHERE (created_at, id) > (last created_at, last id)`.
+    Any page costs the same as the first one.
+    """
+
+    ordering = ("created_at",)
+    page_size_query_param = "limit"
+
+    def get_ordering(self, request, queryset, view):
+        # The ordering of the request is already applied to the queryset by OrderingFilter.
+        ordering = list(queryset.query.order_by or queryset.model._meta.ordering or self.ordering)
+        if not any(field.lstrip("-") in ("pk", "id") for field in ordering):
+            ordering.append("-pk" if ordering[0].startswith("-") else "pk")
+        return ordering
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.cursor = self.decode_cursor(request)
+        if self.cursor is None:
+            reverse, current_position = False, None
+        else:
+            _, reverse, current_position = self.cursor
+
+        if reverse:
+            queryset = queryset.order_by(*_reverse_ordering(self.ordering))
+        else:
+            queryset = queryset.order_by(*self.ordering)
+        if current_position is not None:
+            queryset = queryset.filter(self.follow(current_position, reverse))
+
+        # An extra item tells whether there is a following page.
+        results = list(queryset[: self.page_size + 1])
+        has_following_page = len(results) > self.page_size
+        self.page = results[: self.page_size]
+        if reverse:
+            self.page.reverse()
+            self.has_next = current_position is not None
+            self.has_previous = has_following_page
+        else:
+            self.has_next = has_following_page
+            self.has_previous = current_position is not None
+        if self.page:
+            self.next_position = self._get_position_from_instance(self.page[-1], self.ordering)
+            self.previous_position = self._get_position_from_instance(self.page[0], self.ordering)
+        else:
+            self.next_position = self.previous_position = current_position
+
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+        return self.page
+
+    def follow(self, position: str, reverse: bool) -> Q:
+        """Returns the condition of the items that follow the position in the ordering."""
+        try:
+            values = json.loads(position)
+        except ValueError:
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(values, list) or len(values) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+        condition = Q()
+        for i, order in enumerate(self.ordering):
+            attr = order.lstrip("-")
+            lookup = "lt" if order.startswith("-") != reverse else "gt"
+            equals = {field.lstrip("-"): value for field, value in zip(self.ordering[:i], values)}
+            condition |= Q(**equals, **{f"{attr}__{lookup}": values[i]})
+        return condition
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        return self.encode_cursor(Cursor(offset=0, reverse=False, position=self.next_position))
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        return self.encode_cursor(Cursor(offset=0, reverse=True, position=self.previous_position))
+
+    def _get_position_from_instance(self, instance, ordering):
+        values = []
+        for order in ordering:
+            attr = order.lstrip("-")
+            try:
+                # A foreign key is compared by its value, e.g. `example_id` for `example`.
+                attr = getattr(instance._meta.get_field(attr), "attname", attr)
+            except FieldDoesNotExist:
+                pass
+            values.append(instance.pk if attr == "pk" else getattr(instance, attr))
+        # str() keeps the microseconds of a datetime, which the JSON encoder of Django drops.
+        return json.dumps(values, default=str)
+
+
+class OptionalCursorPagination(LimitOffsetPagination):
+    """Paginates with `limit` and `offset` by default, or with `KeysetPagination` if `cursor` is given.
+
+    An empty `cursor` requests the first page. `count=approximate` replaces `COUNT(*)` with
+    the estimate of the database. In the cursor mode, the count is only returned if `count` is given.
+    """
+
+    cursor_query_param = "cursor"
+    count_query_param = "count"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.keyset = None
+        self.count_mode = request.query_params.get(self.count_query_param)
+        if self.cursor_query_param not in request.query_params:
+            return super().paginate_queryset(queryset, request, view)
+        self.keyset = KeysetPagination()
+        if self.count_mode:
+            self.count = self.get_count(queryset)
+        return self.keyset.paginate_queryset(queryset, request, view)
+
+    def get_count(self, queryset):
+        if self.count_mode == "approximate":
+            return approximate_count(queryset)
+        return super().get_count(queryset)
+
+    def get_paginated_response(self, data):
+        if self.keyset is None:
+            return super().get_paginated_response(data)
+        response = {"next": self.keyset.get_next_link(), "previous": self.keyset.get_previous_link(), "results": data}
+        if self.count_mode:
+            response = {"count": self.count, **response}
+        return Response(response)
+
+    def get_html_context(self):
+        if self.keyset is None:
+            return super().get_html_context()
+        return self.keyset.get_html_context()
+
+    def get_schema_operation_parameters(self, view):
+        parameters = super().get_schema_operation_parameters(view)
+        parameters += [
+            {
+                "name": self.cursor_query_param,
+                "required": False,
+                "in": "query",
+                "description": "The pagination cursor value. Give an empty value for the first page.",
+                "schema": {"type": "string"},
+            },
+            {
+                "name": self.count_query_param,
+                "required": False,
+                "in": "query",
+                "description": "`exact` or `approximate`.",
+                "schema": {"type": "string"},
+            },
+        ]
+        return parameters
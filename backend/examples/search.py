@@ -0,0 +1,140 @@
+"""
+Search the text and the file name of the examples with an index of the database.
+
+The `q` parameter of the example list finds the examples that contain every term
+in any of the search fields, in the same way as `SearchFilter`. The backends keep
+the substring semantics, so a search returns the same examples with or without an index:
+
+- `fts5` uses an FTS5 table with the trigram tokenizer on SQLite.
+- `trigram` uses the GIN indexes of `pg_trgm` on PostgreSQL with `ILIKE '%q%'`.
+- `like` uses `LIKE` without an index on any database.
+
+The indexes are created by the migration `0009_example_search_index`, and the database
+keeps them up to date, so the imported and edited examples are found at once.
+The backend can be chosen with the `SEARCH_BACKEND` setting. Whether the FTS5 table is
+available is checked once per database, and checked again after the migrations.
+"""
+from functools import reduce
+from operator import or_
+from typing import Dict, Sequence, Type
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.models import F, Lookup, Q, QuerySet, Value
+from django.db.models.expressions import RawSQL
+
+AUTO = "auto"
+FTS_TABLE = "examples_example_fts"
+FTS_COLUMNS = ("text", "filename")
+FTS_TRIGGERS = ["examples_example_fts_insert", "examples_example_fts_delete", "examples_example_fts_update"]
+# A term shorter than a trigram can't be looked up in the trigram indexes.
+MIN_TRIGRAM_LENGTH = 3
+# Whether the FTS5 table and its triggers exist, keyed by the alias of the database.
+fts5_availability: Dict[str, bool] = {}
+
+
+def clear_availability_cache(**kwargs):
+    """Forgets whether the FTS5 table is available, e.g. after a migration rebuilt the table of the examples."""
+    fts5_availability.clear()
+
+
+class LikeSearchBackend:
+    name = "like"
+
+    @staticmethod
+    def is_available(using: str = DEFAULT_DB_ALIAS) -> bool:
+        return True
+
+    @staticmethod
+    def search(queryset: QuerySet, fields: Sequence[str], terms: Sequence[str]) -> QuerySet:
+        for term in terms:
+            queryset = queryset.filter(reduce(or_, (Q(**{f"{field}__icontains": term}) for field in fields)))
+        return queryset
+
+
+class ILike(Lookup):
+    """`ILIKE` on the column as it is, which the trigram index of the column can answer.
+    `icontains` compares `UPPER(column)` instead, so PostgreSQL can't use the index for it.
+    """
+
+    lookup_name = "ilike"
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return f"{lhs} ILIKE {rhs}", [*lhs_params, *rhs_params]
+
+
+class TrigramSearchBackend(LikeSearchBackend):
+    """Looks up the terms with `ILIKE`, which PostgreSQL answers with the trigram indexes of `text` and `filename`."""
+
+    name = "trigram"
+
+    @staticmethod
+    def is_available(using: str = DEFAULT_DB_ALIAS) -> bool:
+        return connections[using].vendor == "postgresql"
+
+    @staticmethod
+    def search(queryset: QuerySet, fields: Sequence[str], terms: Sequence[str]) -> QuerySet:
+        connection = connections[queryset.db]
+        for term in terms:
+            pattern = Value(f"%{connection.ops.prep_for_like_query(term)}%")
+            queryset = queryset.filter(reduce(or_, (Q(ILike(F(field), pattern)) for field in fields)))
+        return queryset
+
+
+class FTS5SearchBackend(LikeSearchBackend):
+    """Looks up the terms in the FTS5 table, which indexes `text` and `filename`."""
+
+    name = "fts5"
+
+    @staticmethod
+    def is_available(using: str = DEFAULT_DB_ALIAS) -> bool:
+        if using not in fts5_availability:
+            fts5_availability[using] = FTS5SearchBackend.find_index(using)
+        return fts5_availability[using]
+
+    @staticmethod
+    def find_index(using: str) -> bool:
+        connection = connections[using]
+        if connection.vendor != "sqlite":
+            return False
+        # Rebuilding the table of the examples in a migration drops the triggers, and the index gets stale.
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT name FROM sqlite_master WHERE name = %s OR (type = 'trigger' AND tbl_name = %s)",
+                [FTS_TABLE, "examples_example"],
+            )
+            names = {row[0] for row in cursor.fetchall()}
+        return FTS_TABLE in names and names.issuperset(FTS_TRIGGERS)
+
+    @staticmethod
+    def search(queryset: QuerySet, fields: Sequence[str], terms: Sequence[str]) -> QuerySet:
+        if set(fields) != set(FTS_COLUMNS):
+            return LikeSearchBackend.search(queryset, fields, terms)
+        trigram_terms = [term for term in terms if len(term) >= MIN_TRIGRAM_LENGTH]
+        if trigram_terms:
+            # Each term is a phrase, which matches any substring of the text or the file name.
+            query = " AND ".join('"{}"'.format(term.replace('"', '""')) for term in trigram_terms)
+            sql = f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s"
+            queryset = queryset.filter(pk__in=RawSQL(sql, [query]))
+        short_terms = [term for term in terms if len(term) < MIN_TRIGRAM_LENGTH]
+        return LikeSearchBackend.search(queryset, fields, short_terms)
+
+
+BACKENDS: Dict[str, Type[LikeSearchBackend]] = {
+    backend.name: backend for backend in [FTS5SearchBackend, TrigramSearchBackend, LikeSearchBackend]
+}
+
+
+def get_search_backend(name: str = "", using: str = DEFAULT_DB_ALIAS) -> Type[LikeSearchBackend]:
+    """Returns the backend of the name, or the first one available on the database if the name is `auto`."""
+    name = name or settings.SEARCH_BACKEND
+    if name == AUTO:
+        return next(backend for backend in BACKENDS.values() if backend.is_available(using))
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown search backend: {name}. Choose from {', '.join([AUTO, *BACKENDS])}.")
+    backend = BACKENDS[name]
+    if not backend.is_available(using):
+        raise ValueError(f"The search backend {name} is not available on the database.")
+    return backend
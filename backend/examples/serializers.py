@@ -26,6 +26,7 @@ class AssignmentSerializer(serializers.ModelSerializer):
 
 class ExampleSerializer(serializers.ModelSerializer):
     annotation_approver = serializers.SerializerMethodField()
+    comment_count = serializers.SerializerMethodField()
     is_confirmed = serializers.SerializerMethodField()
     assignments = serializers.SerializerMethodField()
 
@@ -34,13 +35,22 @@ class ExampleSerializer(serializers.ModelSerializer):
         approver = instance.annotations_approved_by
         return approver.username if approver else None
 
+    @classmethod
+    def get_comment_count(cls, instance):
+        # The list view annotates the count to avoid a query per example.
+        num_comments = getattr(instance, "num_comments", None)
+        return instance.comment_count if num_comments is None else num_comments
+
     def get_is_confirmed(self, instance):
+        # The list view annotates the state to avoid a query per example.
+        confirmed = getattr(instance, "confirmed", None)
+        if confirmed is not None:
+            return confirmed
         user = self.context.get("request").user
-        if instance.project.collaborative_annotation:
-            states = instance.states.all()
-        else:
-            states = instance.states.filter(confirmed_by_id=user.id)
-        return states.count() > 0
+        states = instance.states.all()
+        if not instance.project.collaborative_annotation:
+            states = states.filter(confirmed_by=user)
+        return states.exists()
 
     def get_assignments(self, instance):
         return [
@@ -66,7 +76,7 @@ class ExampleSerializer(serializers.ModelSerializer):
             "score",
             "assignments",
         ]
-        read_only_fields = ["filename", "is_confirmed", "upload_name", "assignments"]
+        read_only_fields = ["filename", "comment_count", "is_confirmed", "upload_name", "assignments"]
 
 
 class ExampleStateSerializer(serializers.ModelSerializer):
@@ -1,8 +1,10 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.utils.http import urlencode
 from rest_framework import status
 from rest_framework.reverse import reverse
 
-from .utils import make_assignment, make_doc, make_example_state
+from .utils import make_assignment, make_comment, make_doc, make_example_state
 from api.tests.utils import CRUDMixin
 from projects.models import ProjectType
 from projects.tests.utils import prepare_project
@@ -107,6 +109,43 @@ class TestExampleListFilter(CRUDMixin):
         self.assert_filter(data={"confirmed": "True"}, user=user, expected=0)
 
 
+class TestExampleListQueries(CRUDMixin):
+    def setUp(self):
+        self.project = prepare_project(task=ProjectType.DOCUMENT_CLASSIFICATION)
+        self.url = reverse(viewname="example_list", args=[self.project.item.id])
+
+    def add_examples(self, size):
+        for _ in range(size):
+            example = make_doc(self.project.item)
+            example.annotations_approved_by = self.project.approver
+            example.save()
+            for member in self.project.members:
+                make_assignment(self.project.item, example, member)
+                make_comment(example, member)
+                make_example_state(example, member)
+
+    def count_queries(self, user):
+        self.client.force_login(user)
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return len(context.captured_queries), response.data["results"]
+
+    def test_number_of_queries_does_not_depend_on_page_size(self):
+        for user in [self.project.admin, self.project.annotator]:
+            self.add_examples(1)
+            expected, _ = self.count_queries(user)
+            self.add_examples(5)
+            num_queries, results = self.count_queries(user)
+            with self.subTest(user=user.username):
+                self.assertEqual(num_queries, expected)
+                self.assertTrue(all(example["comment_count"] == 3 for example in results))
+                self.assertTrue(all(example["is_confirmed"] for example in results))
+                self.assertTrue(all(len(example["assignments"]) == 3 for example in results))
+                approvers = {example["annotation_approver"] for example in results}
+                self.assertEqual(approvers, {self.project.approver.username})
+
+
 class TestExampleDetail(CRUDMixin):
     def setUp(self):
         self.project = prepare_project(task=ProjectType.DOCUMENT_CLASSIFICATION)
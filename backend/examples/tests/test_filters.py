@@ -1,5 +1,6 @@
 from unittest.mock import MagicMock
 
+from django.http import QueryDict
 from django.test import TestCase
 from model_mommy import mommy
 
@@ -17,6 +18,7 @@ class TestFilterMixin(TestCase):
         self.queryset = Example.objects.all()
         make_example_state(self.example, project.admin)
         self.request.user = project.admin
+        self.request.parser_context = {"kwargs": {"project_id": project.item.id}}
 
     def assert_filter(self, data, expected):
         f = ExampleFilter(data=data, queryset=self.queryset, request=self.request)
@@ -61,6 +63,48 @@ class TestLabelFilter(TestFilterMixin):
         self.assert_filter(data={"label": self.label_type.text}, expected=1)
 
 
+class TestMultipleLabelFilter(TestFilterMixin):
+    def setUp(self):
+        self.project = prepare_project(task=ProjectType.INTENT_DETECTION_AND_SLOT_FILLING)
+        self.prepare(project=self.project)
+        self.other = make_doc(self.project.item)
+        self.category_type = mommy.make("CategoryType", project=self.project.item, text="greeting")
+        self.span_type = mommy.make("SpanType", project=self.project.item, text="person, name")
+        mommy.make("Category", example=self.example, label=self.category_type, user=self.project.admin)
+        mommy.make("Category", example=self.example, label=self.category_type, user=self.project.approver)
+        mommy.make("Span", example=self.example, label=self.span_type, start_offset=0, end_offset=1)
+        mommy.make("Category", example=self.other, label=self.category_type)
+
+    def test_matches_categories_and_spans(self):
+        self.assert_filter(data={"label": "greeting"}, expected=2)
+        self.assert_filter(data={"label": "person, name"}, expected=1)
+
+    def test_matches_any_of_the_labels(self):
+        data = QueryDict(mutable=True)
+        data.setlist("label", ["greeting", "person, name"])
+        self.assert_filter(data=data, expected=2)
+
+    def test_matches_all_of_the_labels(self):
+        data = QueryDict(mutable=True)
+        data.setlist("label", ["greeting", "person, name"])
+        data["label_match"] = "all"
+        self.assert_filter(data=data, expected=1)
+
+    def test_unknown_label(self):
+        self.assert_filter(data={"label": "unknown"}, expected=0)
+
+
+class TestLabelFilterOfProjectType(TestFilterMixin):
+    def setUp(self):
+        self.project = prepare_project(task=ProjectType.DOCUMENT_CLASSIFICATION)
+        self.prepare(project=self.project)
+        span_type = mommy.make("SpanType", project=self.project.item, text="person")
+        mommy.make("Span", example=self.example, label=span_type, start_offset=0, end_offset=1)
+
+    def test_ignores_the_labels_of_the_other_project_types(self):
+        self.assert_filter(data={"label": "person"}, expected=0)
+
+
 class TestExampleFilterOnCollaborative(TestFilterMixin):
     def setUp(self):
         self.project = prepare_project(task="DocumentClassification", collaborative_annotation=True)
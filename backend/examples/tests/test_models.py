@@ -1,7 +1,10 @@
+from unittest.mock import patch
+
+from django.db import connection
 from django.test import TestCase
 from model_mommy import mommy
 
-from examples.models import ExampleState
+from examples.models import Example, ExampleState
 from projects.models import ProjectType
 from projects.tests.utils import prepare_project
 
@@ -58,6 +61,29 @@ class TestExampleState(TestCase):
         self.assertEqual(progress["total"], 2)
         self.assertCountEqual(progress["progress"], expected_progress)
 
+    def test_state_has_project_of_example(self):
+        state = mommy.make("ExampleState", example=self.example, confirmed_by=self.project.admin)
+        self.assertEqual(state.project, self.project.item)
+
+    def test_is_confirmed_by_user(self):
+        mommy.make("ExampleState", example=self.example, confirmed_by=self.project.admin)
+        for project in [self.project.item, None]:
+            confirmed = ExampleState.objects.is_confirmed(self.project.admin, project)
+            examples = self.examples.annotate(confirmed=confirmed)
+            self.assertEqual(
+                {example.id: example.confirmed for example in examples}, {self.example.id: True, self.other.id: False}
+            )
+            confirmed = ExampleState.objects.is_confirmed(self.project.approver, project)
+            self.assertFalse(self.examples.filter(confirmed).exists())
+
+    def test_is_confirmed_by_any_member_in_collaborative_annotation(self):
+        self.project.item.collaborative_annotation = True
+        self.project.item.save()
+        mommy.make("ExampleState", example=self.example, confirmed_by=self.project.admin)
+        for project in [self.project.item, None]:
+            confirmed = ExampleState.objects.is_confirmed(self.project.approver, project)
+            self.assertEqual(list(self.examples.filter(confirmed)), [self.example])
+
 
 class TestExample(TestCase):
     def test_text_project_returns_text_as_data_property(self):
@@ -69,3 +95,27 @@ class TestExample(TestCase):
         project = prepare_project(ProjectType.IMAGE_CLASSIFICATION)
         example = mommy.make("Example", project=project.item)
         self.assertEqual(str(example.filename), example.data)
+
+
+class TestExampleManager(TestCase):
+    def setUp(self):
+        self.project = prepare_project(ProjectType.SEQUENCE_LABELING)
+        self.examples = [Example(project=self.project.item, text=f"example{i}") for i in range(5)]
+
+    def test_bulk_create_returns_examples_with_primary_keys(self):
+        with self.assertNumQueries(1):
+            examples = Example.objects.bulk_create(self.examples)
+        self.assertEqual([example.text for example in examples], [f"example{i}" for i in range(5)])
+        self.assertEqual(
+            [example.pk for example in examples], list(Example.objects.order_by("pk").values_list("pk", flat=True))
+        )
+
+    def test_bulk_create_looks_up_primary_keys_in_chunks(self):
+        with patch.object(type(connection.features), "can_return_rows_from_bulk_insert", False), patch.object(
+            connection.ops, "bulk_batch_size", return_value=2
+        ):
+            # three inserts and three lookups of at most two examples
+            with self.assertNumQueries(6):
+                examples = Example.objects.bulk_create(self.examples)
+        self.assertEqual([example.text for example in examples], [f"example{i}" for i in range(5)])
+        self.assertTrue(all(example.pk for example in examples))
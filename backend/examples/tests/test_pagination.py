@@ -0,0 +1,90 @@
+from django.utils.http import urlencode
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APITestCase
+
+from .utils import make_assignment, make_comment, make_doc
+from projects.models import ProjectType
+from projects.tests.utils import prepare_project
+
+
+class TestCursorPagination(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.project = prepare_project(task=ProjectType.DOCUMENT_CLASSIFICATION)
+        cls.examples = [make_doc(cls.project.item) for _ in range(7)]
+        for example in cls.examples:
+            make_assignment(cls.project.item, example, cls.project.admin)
+            make_comment(example, cls.project.admin)
+
+    def setUp(self):
+        self.client.force_login(self.project.admin)
+
+    def fetch(self, viewname, **params):
+        url = reverse(viewname=viewname, args=[self.project.item.id])
+        response = self.client.get(f"{url}?{urlencode(params)}")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data
+
+    def fetch_all(self, viewname, **params):
+        """Follows the next links from the first page, and returns the ids of each page."""
+        pages = []
+        data = self.fetch(viewname, cursor="", limit=3, **params)
+        pages.append([item["id"] for item in data["results"]])
+        while data["next"]:
+            response = self.client.get(data["next"])
+            data = response.data
+            pages.append([item["id"] for item in data["results"]])
+        return pages, data
+
+    def test_cursor_returns_the_same_examples_as_offset(self):
+        for ordering in ["", "-created_at", "score"]:
+            with self.subTest(ordering=ordering):
+                pages, _ = self.fetch_all("example_list", ordering=ordering)
+                self.assertEqual([len(page) for page in pages], [3, 3, 1])
+                data = self.fetch("example_list", limit=10, offset=0, ordering=ordering)
+                self.assertEqual(sum(pages, []), [item["id"] for item in data["results"]])
+
+    def test_previous_link_returns_the_previous_page(self):
+        first = self.fetch("example_list", cursor="", limit=3)
+        self.assertIsNone(first["previous"])
+        second = self.client.get(first["next"]).data
+        third = self.client.get(second["next"]).data
+        previous = self.client.get(third["previous"]).data
+        self.assertEqual(previous["results"], second["results"])
+        previous = self.client.get(previous["previous"]).data
+        self.assertEqual(previous["results"], first["results"])
+        self.assertIsNone(previous["previous"])
+
+    def test_count_is_returned_on_request(self):
+        data = self.fetch("example_list", cursor="", limit=3)
+        self.assertNotIn("count", data)
+        for count in ["exact", "approximate"]:
+            with self.subTest(count=count):
+                data = self.fetch("example_list", cursor="", limit=3, count=count)
+                self.assertEqual(data["count"], 7)
+                data = self.fetch("example_list", limit=3, count=count)
+                self.assertEqual(data["count"], 7)
+
+    def test_invalid_cursor(self):
+        url = reverse(viewname="example_list", args=[self.project.item.id])
+        response = self.client.get(f"{url}?cursor=invalid")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_comment_and_assignment_lists(self):
+        for viewname in ["comment_list", "assignment_list"]:
+            with self.subTest(viewname=viewname):
+                pages, _ = self.fetch_all(viewname)
+                self.assertEqual([len(page) for page in pages], [3, 3, 1])
+                self.assertEqual(len(set(sum(pages, []))), 7)
+
+    def test_random_order_for_annotator(self):
+        project = self.project.item
+        project.random_order = True
+        project.save()
+        for example in self.examples:
+            make_assignment(project, example, self.project.annotator)
+        self.client.force_login(self.project.annotator)
+        pages, _ = self.fetch_all("example_list")
+        data = self.fetch("example_list", limit=10, offset=0)
+        self.assertEqual(sum(pages, []), [item["id"] for item in data["results"]])
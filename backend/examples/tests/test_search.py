@@ -0,0 +1,122 @@
+import unittest
+
+from django.db import connection
+from django.test import TestCase, override_settings
+from model_mommy import mommy
+from rest_framework import status
+from rest_framework.reverse import reverse
+
+from api.tests.utils import CRUDMixin
+from examples.models import Example
+from examples.search import (
+    BACKENDS,
+    FTS_TRIGGERS,
+    FTS5SearchBackend,
+    TrigramSearchBackend,
+    clear_availability_cache,
+    get_search_backend,
+)
+from projects.models import ProjectType
+from projects.tests.utils import prepare_project
+
+
+class TestSearchBackend(TestCase):
+    fields = ("text", "filename")
+
+    def setUp(self):
+        self.project = prepare_project(task=ProjectType.DOCUMENT_CLASSIFICATION)
+        self.backends = [backend for backend in BACKENDS.values() if backend.is_available()]
+        self.examples = [
+            mommy.make("Example", project=self.project.item, text="EU rejects German call to boycott British lamb"),
+            mommy.make("Example", project=self.project.item, text="Peter Blackburn", filename="lamb.txt"),
+            mommy.make("Example", project=self.project.item, text=None, filename="image.png"),
+        ]
+
+    def assert_search(self, terms, expected):
+        queryset = Example.objects.filter(project=self.project.item)
+        for backend in self.backends:
+            with self.subTest(backend=backend.name, terms=terms):
+                examples = backend.search(queryset, self.fields, terms)
+                self.assertEqual(set(examples), {self.examples[i] for i in expected})
+
+    def test_search_substring_in_any_field(self):
+        self.assert_search(["lamb"], [0, 1])
+        self.assert_search(["ject"], [0])
+        self.assert_search(["png"], [2])
+
+    def test_search_is_case_insensitive(self):
+        self.assert_search(["GERMAN"], [0])
+
+    def test_every_term_must_match(self):
+        self.assert_search(["lamb", "Peter"], [1])
+        self.assert_search(["lamb", "eu"], [0])
+
+    def test_search_quotes(self):
+        self.assert_search(['"lamb'], [])
+
+    def test_search_wildcards_literally(self):
+        self.assert_search(["%"], [])
+        self.assert_search(["l_mb"], [])
+
+    @unittest.skipUnless(connection.vendor == "postgresql", "The trigram indexes only exist on PostgreSQL.")
+    def test_trigram_search_uses_index(self):
+        with connection.cursor() as cursor:
+            cursor.execute("SET enable_seqscan = off")
+        self.addCleanup(lambda: connection.cursor().execute("RESET enable_seqscan"))
+        queryset = TrigramSearchBackend.search(Example.objects.all(), self.fields, ["German"])
+        plan = queryset.explain()
+        self.assertIn("examples_example_text_trgm", plan)
+        self.assertIn("examples_example_filename_trgm", plan)
+
+    def test_index_is_updated_on_edit_and_delete(self):
+        example = self.examples[0]
+        example.text = "Peter Blackburn"
+        example.save()
+        self.assert_search(["German"], [])
+        self.assert_search(["Blackburn"], [0, 1])
+        self.examples[1].delete()
+        self.assert_search(["Blackburn"], [0])
+
+    def test_index_is_updated_on_bulk_create(self):
+        examples = Example.objects.bulk_create([Example(project=self.project.item, text="Bulk created example")])
+        self.examples.extend(examples)
+        self.assert_search(["created"], [3])
+
+    def test_sqlite_uses_fts5(self):
+        if connection.vendor == "sqlite":
+            self.assertEqual(get_search_backend("auto").name, "fts5")
+
+    def test_availability_is_checked_once(self):
+        clear_availability_cache()
+        available = FTS5SearchBackend.is_available()
+        with self.assertNumQueries(0):
+            self.assertEqual(FTS5SearchBackend.is_available(), available)
+
+    def test_auto_falls_back_to_like_without_triggers(self):
+        if connection.vendor != "sqlite":
+            return
+        self.addCleanup(clear_availability_cache)
+        with connection.cursor() as cursor:
+            cursor.execute(f"DROP TRIGGER {FTS_TRIGGERS[0]}")
+        clear_availability_cache()
+        self.assertEqual(get_search_backend("auto").name, "like")
+
+    def test_unknown_backend(self):
+        with self.assertRaises(ValueError):
+            get_search_backend("unknown")
+
+
+class TestExampleSearchAPI(CRUDMixin):
+    def setUp(self):
+        self.project = prepare_project(task=ProjectType.DOCUMENT_CLASSIFICATION)
+        mommy.make("Example", project=self.project.item, text="EU rejects German call")
+        mommy.make("Example", project=self.project.item, text="Peter Blackburn")
+        self.url = reverse(viewname="example_list", args=[self.project.item.id])
+
+    def test_search_examples(self):
+        self.client.force_login(self.project.admin)
+        for name in ["auto", "like"]:
+            with self.subTest(backend=name), override_settings(SEARCH_BACKEND=name):
+                response = self.client.get(self.url + "?q=german")
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+                self.assertEqual([example["text"] for example in response.data["results"]], ["EU rejects German call"])
@@ -9,6 +9,7 @@ from examples.assignment.strategies import StrategyName
 from examples.assignment.usecase import bulk_assign
 from examples.assignment.workload import WorkloadAllocation
 from examples.models import Assignment
+from examples.pagination import OptionalCursorPagination
 from examples.serializers import AssignmentSerializer
 from projects.models import Project
 from projects.permissions import IsProjectAdmin, IsProjectStaffAndReadOnly
@@ -19,6 +20,7 @@ class AssignmentList(generics.ListCreateAPIView):
     permission_classes = [IsAuthenticated & (IsProjectAdmin | IsProjectStaffAndReadOnly)]
     filter_backends = (DjangoFilterBackend, filters.OrderingFilter)
     ordering_fields = ("created_at", "updated_at")
+    pagination_class = OptionalCursorPagination
     model = Assignment
 
     @property
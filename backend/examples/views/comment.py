@@ -4,6 +4,7 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
 from examples.models import Comment
+from examples.pagination import OptionalCursorPagination
 from examples.permissions import IsOwnComment
 from examples.serializers import CommentSerializer
 from projects.permissions import IsProjectMember
@@ -16,6 +17,7 @@ class CommentList(generics.ListCreateAPIView):
     filterset_fields = ["example"]
     search_fields = ("text",)
     ordering_fields = ("created_at", "example")
+    pagination_class = OptionalCursorPagination
 
     def get_queryset(self):
         queryset = Comment.objects.filter(example__project_id=self.kwargs["project_id"])
@@ -1,11 +1,14 @@
+from django.db.models import Count, F, IntegerField, OuterRef, Prefetch, Subquery
+from django.db.models.functions import Coalesce
 from django.shortcuts import get_object_or_404
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import filters, generics, status
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
-from examples.filters import ExampleFilter
-from examples.models import Example
+from examples.filters import ExampleFilter, ExampleSearchFilter
+from examples.models import Assignment, Comment, Example, ExampleState
+from examples.pagination import OptionalCursorPagination
 from examples.serializers import ExampleSerializer
 from projects.models import Member, Project
 from projects.permissions import IsProjectAdmin, IsProjectStaffAndReadOnly
@@ -14,9 +17,10 @@ from projects.permissions import IsProjectAdmin, IsProjectStaffAndReadOnly
 class ExampleList(generics.ListCreateAPIView):
     serializer_class = ExampleSerializer
     permission_classes = [IsAuthenticated & (IsProjectAdmin | IsProjectStaffAndReadOnly)]
-    filter_backends = (DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter)
+    filter_backends = (DjangoFilterBackend, ExampleSearchFilter, filters.OrderingFilter)
     ordering_fields = ("created_at", "updated_at", "score")
     search_fields = ("text", "filename")
+    pagination_class = OptionalCursorPagination
     model = Example
     filterset_class = ExampleFilter
 
@@ -25,14 +29,35 @@ class ExampleList(generics.ListCreateAPIView):
         return get_object_or_404(Project, pk=self.kwargs["project_id"])
 
     def get_queryset(self):
-        member = get_object_or_404(Member, project=self.project, user=self.request.user)
+        project = self.project
+        member = get_object_or_404(Member, project=project, user=self.request.user)
         if member.is_admin():
-            return self.model.objects.filter(project=self.project)
+            queryset = self.model.objects.filter(project=project)
+        else:
+            queryset = self.model.objects.filter(project=project, assignments__assignee=self.request.user)
+            if project.random_order:
+                # The ordering is annotated, so the cursor pagination can read it from the examples.
+                queryset = queryset.annotate(assignment_order=F("assignments__id")).order_by("assignment_order")
+        return self.prefetch_related_objects(queryset, project)
 
-        queryset = self.model.objects.filter(project=self.project, assignments__assignee=self.request.user)
-        if self.project.random_order:
-            queryset = queryset.order_by("assignments__id")
-        return queryset
+    def prefetch_related_objects(self, queryset, project):
+        """Loads what the serializer shows for each example in a constant number of queries."""
+        # A subquery doesn't count the rows duplicated by the joins of the filters.
+        num_comments = (
+            Comment.objects.filter(example=OuterRef("pk"))
+            .order_by()
+            .values("example")
+            .annotate(count=Count("*"))
+            .values("count")
+        )
+        return (
+            queryset.select_related("project", "annotations_approved_by")
+            .prefetch_related(Prefetch("assignments", queryset=Assignment.objects.select_related("assignee")))
+            .annotate(
+                num_comments=Coalesce(Subquery(num_comments, output_field=IntegerField()), 0),
+                confirmed=ExampleState.objects.is_confirmed(self.request.user, project),
+            )
+        )
 
     def perform_create(self, serializer):
         serializer.save(project=self.project)
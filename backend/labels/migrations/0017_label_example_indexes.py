@@ -0,0 +1,33 @@
+# Generated by Django 4.1.13 on 2026-10-18 19:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("labels", "0016_segmentation"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="boundingbox",
+            index=models.Index(fields=["example", "label"], name="labels_boun_example_3f3ed9_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="category",
+            index=models.Index(fields=["example", "label"], name="labels_cate_example_2d11b1_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="relation",
+            index=models.Index(fields=["example", "type"], name="labels_rela_example_ef6c16_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="segmentation",
+            index=models.Index(fields=["example", "label"], name="labels_segm_example_6c72e5_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="span",
+            index=models.Index(fields=["example", "label"], name="labels_span_example_caac17_idx"),
+        ),
+    ]
@@ -38,6 +38,7 @@ class Category(Label):
 
     class Meta:
         unique_together = ("example", "user", "label")
+        indexes = [models.Index(fields=["example", "label"])]
 
 
 class Span(Label):
@@ -91,6 +92,7 @@ class Span(Label):
             models.CheckConstraint(check=models.Q(end_offset__gte=0), name="endOffset >= 0"),
             models.CheckConstraint(check=models.Q(start_offset__lt=models.F("end_offset")), name="start < end"),
         ]
+        indexes = [models.Index(fields=["example", "label"])]
 
 
 class TextLabel(Label):
@@ -112,6 +114,9 @@ class Relation(Label):
     type = models.ForeignKey(RelationType, on_delete=models.CASCADE)
     example = models.ForeignKey(to=Example, on_delete=models.CASCADE, related_name="relations")
 
+    class Meta:
+        indexes = [models.Index(fields=["example", "type"])]
+
     def __str__(self):
         text = self.example.text
         from_span = text[self.from_id.start_offset : self.from_id.end_offset]
@@ -146,6 +151,7 @@ class BoundingBox(Label):
             models.CheckConstraint(check=models.Q(width__gte=0), name="width >= 0"),
             models.CheckConstraint(check=models.Q(height__gte=0), name="height >= 0"),
         ]
+        indexes = [models.Index(fields=["example", "label"])]
 
 
 class Segmentation(Label):
@@ -153,3 +159,6 @@ class Segmentation(Label):
     points = models.JSONField(default=list)
     label = models.ForeignKey(to=CategoryType, on_delete=models.CASCADE)
     example = models.ForeignKey(to=Example, on_delete=models.CASCADE, related_name="segmentations")
+
+    class Meta:
+        indexes = [models.Index(fields=["example", "label"])]